@@ -11,8 +11,6 @@ import logging
 import os
 import re
 from datetime import datetime
-
-# === kv ===
 from pathlib import Path
 from typing import Optional
 
@@ -23,13 +21,12 @@ from kivymd.app import MDApp
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.snackbar import MDSnackbar
 
-from core.services import protokol_service, statistics_service
-from core.services.data_processing import generate_plots
-from infrastructure.database.database_setup import (
-    create_database,
-    get_all_laermdaten,
-)
+from core.services import plot_cache, protokol_service, statistics_service
+from core.services.render_service import PlotRenderService
+from infrastructure.database.connection import close_all
+from infrastructure.database.database_setup import create_database
 
+# === kv ===
 KV_FILE = Path(__file__).parent / "kv" / "protokoll.kv"
 Builder.load_file(str(KV_FILE))
 
@@ -49,6 +46,8 @@ logging.basicConfig(
 
 os.environ["KIVY_NO_CONSOLELOG"] = "1"
 
+WARM_UP_DELAY = 1.0  # Sekunden nach Start, bevor die Plots im Hintergrund geprüft werden
+
 
 class RootWidget(MDBoxLayout):
     """GUI-Logik"""
@@ -67,11 +66,22 @@ class RootWidget(MDBoxLayout):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        self.chart = None  # aktuell angezeigtes ChartWidget
+        # Plots rendern im Hintergrund; Callbacks kommen über Clock im GUI-Thread an
+        self.render_service = PlotRenderService(
+            dispatch=lambda fn, *args: Clock.schedule_once(lambda dt: fn(*args), 0)
+        )
         Clock.schedule_once(self.initialize_menu, 0)
+        # Aufwärmen nach dem ersten Frame: lädt pandas/matplotlib im Hintergrund
+        # und rendert veraltete Plots (ersetzt das frühere Rendern beim Import)
+        Clock.schedule_once(self.warm_up, WARM_UP_DELAY)
 
     def initialize_menu(self, dt):
         self.create_plot_menu()
 
+    def warm_up(self, dt):
+        self.render_service.request(on_done=lambda fehler: self.create_plot_menu())
+
     # =====================
     # === Events / GUI ===
     # =====================
@@ -111,8 +121,9 @@ class RootWidget(MDBoxLayout):
         if not all(re.match(r"^\d{2}:\d{2}$", t.text) for t in [self.beginn, self.ende]):
             self.show_message("Zeit: HH:MM")
             return False
-        if self.beginn.text >= self.ende.text:
-            self.show_message("Beginn muss vor Ende sein!")
+        # Ende vor Beginn ist erlaubt: die Störung geht über Mitternacht
+        if self.beginn.text == self.ende.text:
+            self.show_message("Beginn und Ende sind gleich!")
             return False
         if not all(getattr(self, f).text for f in ["grund", "verursacher", "auswirkung"]):
             self.show_message("Alle Felder ausfüllen!")
@@ -135,21 +146,18 @@ class RootWidget(MDBoxLayout):
     # === Statistik / Analyse ===
     # =====================
     def analyse_haeufigkeit(self):
-        df = get_all_laermdaten()
-        top = statistics_service.get_top_verursacher(df)
+        top = statistics_service.get_top_verursacher()
         if top:
             self.ids.haeufigster_verursacher.text = f"Häufigster: {top}"
         else:
             self.show_message("Keine Daten verfügbar!")
 
     def analyse_auswirkung(self):
-        df = get_all_laermdaten()
-        avg = statistics_service.get_average_auswirkung(df)
+        avg = statistics_service.get_average_auswirkung()
         self.ids.durchschnittliche_auswirkung.text = f"Ø Auswirkung: {avg:.2f}"
 
     def analyse_dauer(self):
-        df = get_all_laermdaten()
-        avg = statistics_service.get_average_duration(df)
+        avg = statistics_service.get_average_duration()
         self.ids.durchschnittliche_dauer.text = f"Ø Dauer: {avg:.1f} Min"
 
     # =====================
@@ -160,23 +168,15 @@ class RootWidget(MDBoxLayout):
         from kivymd.uix.menu import MDDropdownMenu
 
         items = []
-        plot_files = [
-            "01_trend_dauer.png",
-            "02_histogramm_dauer.png",
-            "03_top_stoerungen.png",
-            "04_uhrzeiten.png",
-            "05_prognose.png",
-        ]
-        for f in plot_files:
-            path = os.path.join(PLOT_FOLDER, f)
-            if os.path.exists(path):
-                items.append(
-                    {
-                        "viewclass": "OneLineListItem",
-                        "text": f.split("_", 1)[1].replace(".png", "").replace("_", " ").title(),
-                        "on_release": lambda x=f: self.show_plot(x),
-                    }
-                )
+        # Welche Plots existieren, steht im Manifest – kein Dateisystem-Check je Plot
+        for f in plot_cache.verfuegbare_plots():
+            items.append(
+                {
+                    "viewclass": "OneLineListItem",
+                    "text": f.split("_", 1)[1].replace(".png", "").replace("_", " ").title(),
+                    "on_release": lambda x=f: self.show_plot(x),
+                }
+            )
         self.menu = MDDropdownMenu(
             caller=self.ids.top_app_bar,
             items=items or [{"text": "Keine Plots verfügbar"}],
@@ -184,14 +184,12 @@ class RootWidget(MDBoxLayout):
         )
 
     def show_plot(self, filename):
-        path = os.path.join(PLOT_FOLDER, filename)
-        if not os.path.exists(path):
-            self.show_message("Plot nicht gefunden")
-            return
-        from kivymd.uix.fitimage import FitImage
+        """Plot live zeichnen (ChartWidget) statt das PNG von der Platte zu laden"""
+        from app.widgets.chart_widget import ChartWidget
 
         self.chart_box.clear_widgets()
-        self.chart_box.add_widget(FitImage(source=path, allow_stretch=True))
+        self.chart = ChartWidget(plot=filename)
+        self.chart_box.add_widget(self.chart)
         self.show_message(f"{filename} geladen")
         self.menu.dismiss()
 
@@ -199,15 +197,25 @@ class RootWidget(MDBoxLayout):
         self.menu.open()
 
     def update_plots(self):
-        """Alle Plots aktualisieren"""
-        try:
-            generate_plots()
-            self.create_plot_menu()
-            self.show_message("5 Analysen aktualisiert!")
-            logging.info("Plots aktualisiert")
-        except Exception as e:
-            self.show_message(f"Plot-Update fehlgeschlagen: {e}")
-            logging.error(f"Plot-Update Fehler: {e}")
+        """Alle Plots im Hintergrund aktualisieren (mehrere Aufrufe werden zusammengefasst)"""
+        self.render_service.request(
+            on_progress=self._on_plot_progress, on_done=self._on_plots_done
+        )
+
+    def _on_plot_progress(self, fertig, gesamt, name):
+        self.ids.top_app_bar.title = f"Protokolli – Analysen {fertig}/{gesamt}"
+
+    def _on_plots_done(self, fehler):
+        self.ids.top_app_bar.title = "Protokolli"
+        if fehler is not None:
+            self.show_message(f"Plot-Update fehlgeschlagen: {fehler}")
+            logging.error(f"Plot-Update Fehler: {fehler}")
+            return
+        self.create_plot_menu()
+        if self.chart is not None:
+            self.chart.aktualisieren()  # angezeigtes Diagramm mit den neuen Daten
+        self.show_message("5 Analysen aktualisiert!")
+        logging.info("Plots aktualisiert")
 
 
 # =====================
@@ -226,6 +234,19 @@ class ProtokollApp(MDApp):
     def on_start(self):
         Clock.schedule_once(self.set_default_values, 0)
 
+    def on_stop(self):
+        from app.widgets import chart_widget
+
+        # Beide Worker lesen über eigene Verbindungen – nicht unter ihnen schließen
+        beendet = chart_widget.beenden(timeout=5)
+        if self.root is not None:
+            beendet = self.root.render_service.stop(timeout=5) and beendet
+        if not beendet:
+            # Die Threads enden mit dem Prozess
+            logging.warning("Plot-Rendering läuft noch, Datenbankverbindungen bleiben offen")
+            return
+        close_all()
+
     def set_default_values(self, dt):
         now = datetime.now()
         date_str = now.strftime("%d-%m-%Y")
@@ -0,0 +1,169 @@
+# app/widgets/chart_widget.py
+"""
+Live-Diagramm für die Analyse-Plots.
+Der Chart-Worker lädt die Daten, baut die data_processing-Figure und rastert
+sie mit Agg in der Pixelgröße des Widgets; der GUI-Thread bekommt nur noch
+die fertigen RGBA-Bytes und lädt sie per blit_buffer in die Textur – keine
+PNG-Datei, kein Dekodieren, kein Agg-Zeichnen im GUI-Thread. Die Textur wird
+wiederverwendet und nur bei geänderter Pixelgröße neu angelegt;
+Größenänderungen lösen höchstens alle REDRAW_DELAY Sekunden ein Neuzeichnen aus.
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Optional, Set, Tuple
+
+from kivy.clock import Clock
+from kivy.graphics import Color, Rectangle
+from kivy.graphics.texture import Texture
+from kivy.metrics import Metrics
+from kivy.properties import StringProperty
+from kivy.uix.widget import Widget
+
+REDRAW_DELAY = 0.15  # Sekunden Ruhe nach der letzten Größenänderung
+BASIS_DPI = 100  # Figure-DPI bei Dichte 1, skaliert mit Metrics.density
+
+# Ein gemeinsamer Worker für alle Diagramme: Daten laden, Figure bauen und
+# rastern, ohne den GUI-Thread zu blockieren (und mit nur einer DB-Verbindung)
+_worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chart")
+_lock = threading.Lock()
+_offen: Set[Future] = set()  # eingereichte, noch nicht fertige Aufträge
+_beendet = False
+
+# (Breite, Höhe) in Pixeln und die RGBA-Zeilen, oberste zuerst
+Bild = Tuple[Tuple[int, int], bytes]
+
+
+def _einreichen(fn: Callable, *args) -> Optional[Future]:
+    """Auftrag an den Worker; None nach beenden()."""
+    with _lock:
+        if _beendet:
+            return None
+        future = _worker.submit(fn, *args)
+        _offen.add(future)
+    future.add_done_callback(_erledigt)
+    return future
+
+
+def _erledigt(future: Future) -> None:
+    with _lock:
+        _offen.discard(future)
+
+
+def beenden(timeout: Optional[float] = None) -> bool:
+    """
+    Worker beenden (z. B. in App.on_stop, vor close_all): wartende Aufträge
+    verwerfen, den laufenden abwarten. False: er lief nach timeout Sekunden noch.
+    """
+    global _beendet
+    with _lock:
+        _beendet = True
+        offen = list(_offen)
+    laufend = [future for future in offen if not future.cancel()]
+    _worker.shutdown(wait=False)
+    return not wait(laufend, timeout).not_done
+
+
+def _baue_figure(name: str):
+    from core.services import data_processing
+
+    spec = data_processing.PLOTS[name]
+    return spec.figure(data_processing.daten_fuer(name), **spec.params)
+
+
+def _rastern(canvas_agg, breite: int, hoehe: int, dpi: float) -> Optional[Bild]:
+    """Figure auf breite × hoehe Pixel zeichnen (im Worker); None bei zu kleinem Widget."""
+    if breite < 2 or hoehe < 2:
+        return None
+    fig = canvas_agg.figure
+    fig.set_dpi(dpi)
+    fig.set_size_inches(breite / dpi, hoehe / dpi)
+    fig.tight_layout()
+    canvas_agg.draw()
+    # Kopie: der nächste Auftrag zeichnet in denselben Agg-Puffer, während der
+    # GUI-Thread dieses Bild womöglich noch nicht übernommen hat
+    return canvas_agg.get_width_height(physical=True), bytes(canvas_agg.buffer_rgba())
+
+
+class ChartWidget(Widget):
+    """Zeigt einen Plot aus data_processing.PLOTS, z. B. ChartWidget(plot="04_uhrzeiten.png")."""
+
+    plot = StringProperty("")
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._canvas_agg = None  # nur im Worker-Thread gelesen und geschrieben
+        self._texture = None
+        self._auftrag = 0  # Nummer des neuesten Auftrags; nur dessen Bild wird gezeigt
+        with self.canvas:
+            Color(1, 1, 1, 1)
+            self._rect = Rectangle(pos=self.pos, size=self.size)
+        self._redraw_trigger = Clock.create_trigger(self._neu_zeichnen, REDRAW_DELAY)
+        self.bind(pos=self._on_pos, size=self._on_size, plot=self.aktualisieren)
+        if self.plot:
+            self.aktualisieren()
+
+    def aktualisieren(self, *args) -> None:
+        """Figure neu bauen (z. B. nach neuen Daten) und zeichnen."""
+        self._einreichen(self._bauen_und_rastern, self.plot)
+
+    def _neu_zeichnen(self, *args) -> None:
+        """Vorhandene Figure in der aktuellen Größe neu rastern."""
+        self._einreichen(self._rastern)
+
+    def _einreichen(self, fn: Callable, *args) -> None:
+        self._auftrag += 1
+        auftrag = self._auftrag
+        groesse = int(self.width), int(self.height)
+        future = _einreichen(fn, *args, *groesse, BASIS_DPI * Metrics.density)
+        if future is not None:
+            future.add_done_callback(
+                lambda f: Clock.schedule_once(lambda dt: self._zeigen(auftrag, f), 0)
+            )
+
+    # --- im Worker-Thread ---
+    def _bauen_und_rastern(self, name: str, breite: int, hoehe: int, dpi: float):
+        try:
+            fig = _baue_figure(name)
+        except Exception as e:
+            self._canvas_agg = None
+            raise RuntimeError(f"Diagramm {name} fehlgeschlagen: {e}") from e
+        if fig is None:
+            self._canvas_agg = None
+            return None
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        self._canvas_agg = FigureCanvasAgg(fig)
+        return _rastern(self._canvas_agg, breite, hoehe, dpi)
+
+    def _rastern(self, breite: int, hoehe: int, dpi: float) -> Optional[Bild]:
+        if self._canvas_agg is None:
+            return None
+        return _rastern(self._canvas_agg, breite, hoehe, dpi)
+
+    # --- im GUI-Thread ---
+    def _zeigen(self, auftrag: int, future: Future) -> None:
+        if auftrag != self._auftrag or future.cancelled():
+            return  # inzwischen neu angefordert (anderer Plot, andere Größe) oder beendet
+        try:
+            bild = future.result()
+        except Exception as e:
+            logging.error(str(e))
+            return
+        if bild is None:
+            return
+        groesse, rgba = bild
+        if self._texture is None or tuple(self._texture.size) != groesse:
+            self._texture = Texture.create(size=groesse, colorfmt="rgba")
+            self._texture.flip_vertical()  # Agg liefert die oberste Zeile zuerst
+            self._rect.texture = self._texture
+        self._texture.blit_buffer(rgba, colorfmt="rgba", bufferfmt="ubyte")
+        self.canvas.ask_update()
+
+    def _on_pos(self, *args) -> None:
+        self._rect.pos = self.pos
+
+    def _on_size(self, *args) -> None:
+        self._rect.size = self.size
+        self._redraw_trigger()  # gedrosselt: beim Ziehen nicht jeden Frame rendern
@@ -0,0 +1,125 @@
+# benchmarks/anhaenge.py
+"""
+Foto-Anhänge (adapters/anhang_speicher.py): eine Listenseite bzw. ein
+PDF-Anhang mit Fotos aus den vorberechneten Vorschaubildern gegenüber dem
+Dekodieren der Originale, dazu Ablegen großer Videos (Hashen in Blöcken).
+
+Gemessen werden Laufzeit und die Zahl dekodierter Pixel (Pillows
+Pixelpuffer sieht tracemalloc nicht), beim Video der Speicher-Peak.
+Braucht das neue Paket (src/), Pillow und NumPy.
+
+Aufruf (im Ordner legacy/):
+    python -m benchmarks.anhaenge [--fotos 20] [--video-mb 500]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+LEGACY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(os.path.dirname(LEGACY_DIR), "src")
+sys.path.insert(0, SRC_DIR)  # das neue Paket ist (noch) nicht installiert
+
+import numpy as np  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from mietstoerungsprotokoll.adapters.anhang_speicher import (  # noqa: E402
+    KANTE,
+    AnhangSpeicher,
+    Vorschaugroesse,
+)
+
+FOTO_PIXEL = (4000, 3000)  # 12 MP wie eine Handykamera
+
+
+def _fotos(verzeichnis: Path, anzahl: int) -> list:
+    rnd = np.random.default_rng(42)
+    basis = rnd.integers(0, 255, (FOTO_PIXEL[1] // 8, FOTO_PIXEL[0] // 8, 3), dtype=np.uint8)
+    pfade = []
+    for i in range(anzahl):
+        # grobes Rauschen hochskaliert: JPEG-Größe ähnlich einem echten Foto (~3 MB)
+        bild = Image.fromarray(np.roll(basis, i, axis=1)).resize(FOTO_PIXEL)
+        pfad = verzeichnis / f"foto_{i}.jpg"
+        bild.save(pfad, quality=90)
+        pfade.append(pfad)
+    return pfade
+
+
+def _messen(fn):
+    """(Sekunden, dekodierte Pixel) – fn liefert die Pixelzahl."""
+    start = time.perf_counter()
+    pixel = fn()
+    return time.perf_counter() - start, pixel
+
+
+def _originale(pfade, kante: int):
+    def laden():
+        pixel = 0
+        for pfad in pfade:
+            with Image.open(pfad) as bild:
+                bild.load()  # volle Auflösung dekodieren, erst dann verkleinern
+                pixel += bild.width * bild.height
+                bild.thumbnail((kante, kante))
+        return pixel
+
+    return laden
+
+
+def _vorschau(speicher: AnhangSpeicher, anhaenge, groesse: Vorschaugroesse):
+    def laden():
+        pixel = 0
+        for anhang in anhaenge:
+            with Image.open(speicher.vorschau(anhang.pfad, groesse)) as bild:
+                bild.load()
+                pixel += bild.width * bild.height
+        return pixel
+
+    return laden
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark: Foto-Anhänge")
+    parser.add_argument("--fotos", type=int, default=20)
+    parser.add_argument("--video-mb", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        verzeichnis = Path(tmp)
+        pfade = _fotos(verzeichnis, args.fotos)
+        speicher = AnhangSpeicher(verzeichnis / "anhaenge")
+        start = time.perf_counter()
+        anhaenge = [speicher.ablegen(pfad) for pfad in pfade]
+        ablegen = (time.perf_counter() - start) / len(pfade)
+        print(f"Ablegen inkl. Vorschaubilder: {ablegen * 1000:.0f} ms je Foto")
+
+        print(f"{'Fall':<34} | {'Zeit':>8} | {'dekodiert':>9}")
+        for groesse in Vorschaugroesse:
+            for name, fn in (
+                ("Originale", _originale(pfade, KANTE[groesse])),
+                ("Vorschau", _vorschau(speicher, anhaenge, groesse)),
+            ):
+                sekunden, pixel = _messen(fn)
+                titel = f"{args.fotos} Fotos {groesse}: {name}"
+                print(f"{titel:<34} | {sekunden:>7.2f}s | {pixel / 1e6:>7.1f}MP")
+
+        video = verzeichnis / "video.mp4"
+        with open(video, "wb") as f:
+            for _ in range(args.video_mb):
+                f.write(os.urandom(1 << 20))
+        for titel in ("Video ablegen (neu)", "Video ablegen (Duplikat)"):
+            tracemalloc.start()
+            start = time.perf_counter()
+            speicher.ablegen(video)
+            sekunden = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            titel = f"{titel}, {args.video_mb} MB"
+            print(f"{titel:<34} | {sekunden:>7.2f}s | {peak / 2**20:>7.1f}MB Peak")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# benchmarks/forecast.py
+"""
+Prognose: Genauigkeit und Laufzeit von core.services.forecasting gegenüber dem
+früheren Weg (sklearn LinearRegression auf einzelnen Ereignissen + fromordinal).
+
+Genauigkeit: Backtest mit rollierendem Schnittpunkt auf Tagessummen (MAE über
+14 Tage). Das alte Modell sagt die Dauer je Ereignis voraus und wird dafür mit
+der mittleren Zahl Ereignisse pro Tag hochgerechnet. Braucht dafür
+scikit-learn, das die App selbst nicht mehr benötigt.
+
+Aufruf (im Ordner legacy/):
+    python -m benchmarks.forecast [--rows 20000] [--wochenprofil]
+"""
+
+import argparse
+import random
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import laermdaten_rows
+from core.services import forecasting
+from infrastructure.database.database_setup import berechne_dauer
+
+HORIZONT = 14
+SCHNITTE = 8
+# Anteil behaltener Ereignisse je Wochentag (Mo..So) für --wochenprofil
+WOCHENPROFIL = (0.6, 0.6, 0.7, 0.7, 0.9, 1.0, 1.0)
+
+
+def _daten(n: int, wochenprofil: bool) -> pd.DataFrame:
+    rnd = random.Random(7)
+    datum, dauer = [], []
+    for tag, beginn, ende, *_ in laermdaten_rows(n):
+        d = np.datetime64(tag)
+        if wochenprofil and rnd.random() > WOCHENPROFIL[pd.Timestamp(tag).weekday()]:
+            continue
+        datum.append(d)
+        dauer.append(berechne_dauer(beginn, ende))
+    return pd.DataFrame({"datum": np.array(datum, dtype="datetime64[ns]"), "dauer": dauer})
+
+
+def _alt(df: pd.DataFrame, tage: int = HORIZONT):
+    """Das frühere Modell aus figure_prognose (ohne Zeichnen)."""
+    from sklearn.linear_model import LinearRegression
+
+    tag = df["datum"].map(pd.Timestamp.toordinal)
+    model = LinearRegression()
+    model.fit(tag.to_numpy().reshape(-1, 1), df["dauer"].to_numpy().reshape(-1, 1))
+    zukunft = np.arange(tag.max() + 1, tag.max() + tage + 1).reshape(-1, 1)
+    vorhersage = model.predict(zukunft)
+    zukunft_daten = [pd.Timestamp.fromordinal(int(d)) for d in zukunft.flatten()]
+    return zukunft_daten, vorhersage.flatten()
+
+
+def _zeit(fn, wiederholungen: int = 20) -> float:
+    fn()  # aufwärmen
+    start = time.perf_counter()
+    for _ in range(wiederholungen):
+        fn()
+    return (time.perf_counter() - start) / wiederholungen
+
+
+def _importzeit(modul: str) -> float:
+    out = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import time; t=time.perf_counter(); import {modul}; print(time.perf_counter()-t)",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(out.stdout)
+
+
+def _backtest(df: pd.DataFrame) -> dict:
+    tage, summen = forecasting.tagessummen(df["datum"].to_numpy(), df["dauer"].to_numpy())
+    fehler = {"alt (sklearn)": [], **{m: [] for m in forecasting.MODELLE}}
+    for k in range(SCHNITTE, 0, -1):
+        schnitt = len(tage) - k * HORIZONT
+        ist = summen[schnitt : schnitt + HORIZONT]
+        for modell in forecasting.MODELLE:
+            p = forecasting.prognose_tageswerte(tage[:schnitt], summen[:schnitt], HORIZONT, modell)
+            fehler[modell].append(np.abs(p.werte - ist).mean())
+        training = df[df["datum"] < tage[schnitt]]
+        _, je_ereignis = _alt(training)
+        pro_tag = len(training) / schnitt
+        fehler["alt (sklearn)"].append(np.abs(je_ereignis * pro_tag - ist).mean())
+    return {name: float(np.mean(werte)) for name, werte in fehler.items()}
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark: Prognosemodelle")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--wochenprofil", action="store_true", help="Daten mit Wochensaison")
+    args = parser.parse_args(argv)
+
+    df = _daten(args.rows, args.wochenprofil)
+    print(f"{len(df)} Ereignisse, {df['datum'].dt.normalize().nunique()} Tage")
+
+    print("\nImport:")
+    print(f"  sklearn.linear_model  {_importzeit('sklearn.linear_model') * 1000:8.1f} ms")
+    print(f"  numpy                 {_importzeit('numpy') * 1000:8.1f} ms")
+
+    print("\nLaufzeit je Prognose:")
+    print(f"  alt (sklearn)         {_zeit(lambda: _alt(df)) * 1000:8.2f} ms")
+    for modell in forecasting.MODELLE:
+        sekunden = _zeit(
+            lambda modell=modell: forecasting.prognose(
+                df["datum"].to_numpy(), df["dauer"].to_numpy(), HORIZONT, modell
+            )
+        )
+        print(f"  {modell:<21} {sekunden * 1000:8.2f} ms")
+
+    print(f"\nMAE Tagessumme (Minuten), {SCHNITTE} Schnitte à {HORIZONT} Tage:")
+    for name, mae in _backtest(df).items():
+        print(f"  {name:<21} {mae:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# benchmarks/load_dataframe.py
+"""
+Ladezeit und Speicher von data_processing.get_all_data im Vergleich zum alten
+Text-Parsing (strftime + String-Verkettung + to_datetime ohne Format).
+
+Aufruf (im Ordner legacy/):
+    python -m benchmarks.load_dataframe [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.synthetic import laermdaten_rows
+from core.services import data_processing
+from infrastructure.database import connection
+from infrastructure.database.database_setup import create_database, insert_laermdaten_many
+
+
+def _alt(conn) -> pd.DataFrame:
+    """Das frühere get_all_data (vor der typisierten Ladestrecke)."""
+    df = pd.read_sql_query("SELECT * FROM laermdaten", conn)
+    df["datum"] = pd.to_datetime(df["datum"], format="%Y-%m-%d")
+    df["beginn"] = pd.to_datetime(
+        df["datum"].dt.strftime("%Y-%m-%d") + " " + df["beginn"].astype(str)
+    )
+    df["ende"] = pd.to_datetime(df["datum"].dt.strftime("%Y-%m-%d") + " " + df["ende"].astype(str))
+    df["dauer"] = (df["ende"] - df["beginn"]).dt.total_seconds() / 60
+    return df
+
+
+def _messen(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    df = fn()
+    sekunden = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return sekunden, df.memory_usage(deep=True).sum(), peak
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark: Lärmdaten laden")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args(argv)
+
+    print(f"{'Zeilen':>10} | {'Variante':<6} | {'Zeit':>8} | {'DataFrame':>10} | {'Peak':>10}")
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            connection.configure(os.path.join(tmp, "bench.db"), synchronous="OFF")
+            create_database()
+            insert_laermdaten_many(list(laermdaten_rows(n)), chunk_size=5000)
+            conn = connection.get_connection()
+            ergebnisse = {
+                "alt": _messen(lambda conn=conn: _alt(conn)),
+                "neu": _messen(lambda: data_processing.get_all_data(force_reload=True)),
+            }
+            for name, (sekunden, groesse, peak) in ergebnisse.items():
+                print(
+                    f"{n:>10} | {name:<6} | {sekunden:>7.2f}s | "
+                    f"{groesse / 2**20:>8.1f}MB | {peak / 2**20:>8.1f}MB"
+                )
+            data_processing.clear_cache()
+            connection.close_all()
+
+
+if __name__ == "__main__":
+    main()
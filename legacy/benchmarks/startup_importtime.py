@@ -0,0 +1,101 @@
+# benchmarks/startup_importtime.py
+"""
+Start-Benchmark: misst mit `python -X importtime`, wie lange der Import der
+Module dauert, die app/main.py beim Start lädt (ohne Kivy), und prüft das
+Budget aus benchmarks/budgets.json. Schwere Bibliotheken (pandas, matplotlib, …)
+dürfen beim Start gar nicht geladen werden.
+
+Aufruf (im Ordner legacy/):
+    python -m benchmarks.startup_importtime [--runs 5] [--json ergebnis.json]
+Exit-Code 1, wenn das Budget überschritten ist.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Set, Tuple
+
+LEGACY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_FILE = os.path.join(LEGACY_DIR, "benchmarks", "budgets.json")
+
+# Was app/main.py beim Start importiert (außer Kivy/KivyMD)
+STARTUP_MODULES = [
+    "core.services.plot_cache",
+    "core.services.protokol_service",
+    "core.services.render_service",
+    "core.services.statistics_service",
+    "core.services.data_processing",
+    "infrastructure.database.connection",
+    "infrastructure.database.database_setup",
+]
+EIGENE_PAKETE = ("core", "infrastructure", "utils")
+
+
+def _einmal_messen() -> Tuple[float, Set[str]]:
+    """Ein Lauf: (kumulierte Importzeit in ms, Menge aller geladenen Top-Level-Pakete)."""
+    code = "; ".join(f"import {m}" for m in STARTUP_MODULES)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=LEGACY_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    gesamt_us = 0
+    pakete: Set[str] = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # Kopfzeile
+        paket = name.strip().split(".")[0]
+        pakete.add(paket)
+        # Oberste Ebene (genau ein Leerzeichen) aus eigenen Paketen: enthält alle
+        # Unter-Imports; Interpreter-Start (site, encodings, …) zählt nicht mit
+        if paket in EIGENE_PAKETE and not name.startswith("  "):
+            gesamt_us += int(cumulative)
+    return gesamt_us / 1000, pakete
+
+
+def messen(runs: int = 5) -> Dict:
+    zeiten: List[float] = []
+    pakete: Set[str] = set()
+    for _ in range(runs):
+        ms, geladen = _einmal_messen()
+        zeiten.append(ms)
+        pakete |= geladen
+    return {"import_ms": statistics.median(zeiten), "runs": zeiten, "pakete": sorted(pakete)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", help="Ergebnis zusätzlich als JSON speichern")
+    args = parser.parse_args(argv)
+
+    with open(BUDGET_FILE, "r", encoding="utf-8") as f:
+        budget = json.load(f)["startup"]
+    ergebnis = messen(args.runs)
+    verboten = sorted(set(budget["verbotene_module"]) & set(ergebnis["pakete"]))
+    ergebnis["budget_ms"] = budget["import_ms"]
+    ergebnis["verbotene_geladen"] = verboten
+
+    print(f"Start-Imports: {ergebnis['import_ms']:.1f} ms (Median aus {args.runs})")
+    print(f"Budget:        {budget['import_ms']} ms")
+    if verboten:
+        print(f"FEHLER: beim Start geladen: {', '.join(verboten)}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(ergebnis, f, indent=2)
+
+    ok = not verboten and ergebnis["import_ms"] <= budget["import_ms"]
+    print("OK" if ok else "BUDGET ÜBERSCHRITTEN")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
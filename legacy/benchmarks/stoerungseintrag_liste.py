@@ -0,0 +1,100 @@
+# benchmarks/stoerungseintrag_liste.py
+"""
+Störungseinträge lesen: volle SQLModel-Objekte gegenüber den kompakten
+Projektionen aus domain/projektionen.py (Listeneintrag-Tupel und
+Spalten-Array), jeweils inklusive Dauerberechnung.
+
+Gemessen werden Laufzeit, Speicher-Peak beim Laden und der Speicher, den das
+geladene Ergebnis danach belegt. Braucht das neue Paket (src/) und sqlmodel.
+
+Aufruf (im Ordner legacy/):
+    python -m benchmarks.stoerungseintrag_liste [--sizes 10000 100000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+LEGACY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(os.path.dirname(LEGACY_DIR), "src")
+sys.path.insert(0, SRC_DIR)  # das neue Paket ist (noch) nicht installiert
+
+from sqlmodel import Session, select  # noqa: E402
+
+from benchmarks.synthetic import stoerungseintrag_rows  # noqa: E402
+from mietstoerungsprotokoll.adapters.stoerungseintrag_repository import (  # noqa: E402
+    StoerungseintragRepository,
+    erstelle_engine,
+)
+from mietstoerungsprotokoll.domain import projektionen  # noqa: E402
+from mietstoerungsprotokoll.domain.models import Stoerungseintrag  # noqa: E402
+
+
+def _modelle(repo: StoerungseintragRepository):
+    with Session(repo.engine) as session:
+        eintraege = session.exec(select(Stoerungseintrag).order_by(Stoerungseintrag.datum)).all()
+        dauern = [e.dauer_in_minuten() for e in eintraege]
+    return eintraege, dauern
+
+
+def _listeneintraege(repo: StoerungseintragRepository):
+    eintraege = list(repo.alle(limit=10_000))
+    return eintraege, [e.dauer_in_minuten() for e in eintraege]
+
+
+def _spalten(repo: StoerungseintragRepository):
+    spalten = repo.spalten()
+    return spalten, projektionen.dauer_in_minuten(spalten["beginn"], spalten["ende"])
+
+
+VARIANTEN = {
+    "Modelle": _modelle,
+    "Listeneintrag": _listeneintraege,
+    "Spalten": _spalten,
+}
+
+
+def _messen(fn, repo):
+    """(Sekunden, Peak in Bytes, danach belegte Bytes, Anzahl Einträge, Summe Dauer)."""
+    start = time.perf_counter()
+    fn(repo)
+    sekunden = time.perf_counter() - start
+
+    tracemalloc.start()
+    eintraege, dauern = fn(repo)
+    belegt, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    summe = sum(d for d in dauern if d == d and d is not None)  # None und NaN auslassen
+    return sekunden, peak, belegt, len(eintraege), summe
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark: Störungseinträge laden")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'Einträge':>9} | {'Variante':<13} | {'Zeit':>8} | {'Peak':>9} | "
+        f"{'Ergebnis':>9} | {'Σ Dauer':>10}"
+    )
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = StoerungseintragRepository(
+                erstelle_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+            )
+            repo.hinzufuegen_viele(stoerungseintrag_rows(n))
+            for name, fn in VARIANTEN.items():
+                sekunden, peak, belegt, anzahl, summe = _messen(fn, repo)
+                assert anzahl == n
+                print(
+                    f"{n:>9} | {name:<13} | {sekunden:>7.2f}s | {peak / 2**20:>7.1f}MB | "
+                    f"{belegt / 2**20:>7.1f}MB | {summe:>10.0f}"
+                )
+            repo.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+# benchmarks/suite.py
+"""
+Benchmark-Suite: DB, Analyse, Plots und PDF auf synthetischen Daten
+(benchmarks/synthetic.py, fester Seed) in mehreren Größen.
+
+Je Fall wird die Laufzeit (bester von --runs Läufen) und in einem eigenen Lauf
+mit tracemalloc der Speicher-Peak gemessen. Ergebnisse werden mit
+benchmarks/baseline.json verglichen; langsamer bzw. speicherhungriger als die
+Toleranz aus budgets.json ("suite") gilt als Regression (Exit-Code 1).
+
+Aufruf (im Ordner legacy/):
+    python -m benchmarks.suite [--sizes 1000 100000 1000000] [--faelle get_all_data ...]
+                               [--runs 3] [--baseline-schreiben] [--json ergebnis.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks.synthetic import laermdaten_rows, massnahmen_rows
+from core.services import data_processing, pdf_generation
+from infrastructure.database import connection
+from infrastructure.database.database_setup import (
+    create_database,
+    insert_laermdaten,
+    insert_laermdaten_many,
+    insert_massnahmen_many,
+)
+
+LEGACY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(LEGACY_DIR, "benchmarks", "baseline.json")
+BUDGET_FILE = os.path.join(LEGACY_DIR, "benchmarks", "budgets.json")
+
+SIZES = [1_000, 100_000, 1_000_000]
+# Verhältnis Lärmereignisse : Maßnahmen (etwa eine Maßnahme je Woche Protokoll)
+MASSNAHMEN_ANTEIL = 100
+# insert_laermdaten schreibt zeilenweise (eine Transaktion je Zeile): gemessen
+# werden so viele Einzel-Inserts auf die schon gefüllte DB, angegeben je Zeile
+EINZEL_INSERTS = 1_000
+
+# Fallname → Dateiname in data_processing.PLOTS (bestimmt die Datenquelle);
+# plot_x rendert den PlotSpec mit figure_x
+PLOT_NAMEN: Dict[str, str] = {
+    "plot_" + spec.figure.__name__.removeprefix("figure_"): name
+    for name, spec in data_processing.PLOTS.items()
+}
+
+
+class Fall:
+    """
+    Ein Messfall. vorbereiten() läuft vor jeder Messung und wird nicht
+    mitgemessen; sein Ergebnis bekommt messen() als Argument.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        messen: Callable,
+        vorbereiten: Callable[[], object] = lambda: None,
+        je_zeile: int = 0,
+    ):
+        self.name = name
+        self.messen = messen
+        self.vorbereiten = vorbereiten
+        self.je_zeile = je_zeile  # >0: Zeit durch diese Zeilenzahl teilen (µs je Zeile)
+
+
+EINZEL_START = date(2100, 1, 1)  # nach allen synthetischen Daten, leicht wieder zu löschen
+
+
+def _einzel_inserts() -> None:
+    for row in laermdaten_rows(EINZEL_INSERTS, seed=7, start=EINZEL_START):
+        insert_laermdaten(*row)
+
+
+def _einzel_inserts_entfernen() -> None:
+    """Vor jedem Lauf: Zeilen des vorigen Laufs löschen (Trigger halten die Summen mit)."""
+    with connection.unit_of_work() as conn:
+        conn.execute("DELETE FROM laermdaten WHERE datum >= ?", (EINZEL_START.isoformat(),))
+
+
+def _faelle() -> List[Fall]:
+    faelle = [
+        Fall(
+            "insert_laermdaten",
+            lambda _: _einzel_inserts(),
+            vorbereiten=_einzel_inserts_entfernen,
+            je_zeile=EINZEL_INSERTS,
+        ),
+        Fall(
+            "get_all_data",
+            lambda _: data_processing.get_all_data(force_reload=True),
+            vorbereiten=data_processing.clear_cache,
+        ),
+    ]
+    for funktion_name, name in PLOT_NAMEN.items():
+        faelle.append(
+            Fall(
+                funktion_name,
+                getattr(data_processing, funktion_name),
+                vorbereiten=lambda n=name: data_processing.daten_fuer(n),
+            )
+        )
+    faelle += [
+        Fall("generiere_protokoll", lambda _: pdf_generation.generiere_protokoll(None)),
+        Fall("generiere_massnahmen", lambda _: pdf_generation.generiere_massnahmen(None)),
+    ]
+    return faelle
+
+
+def _datenbank_fuellen(db_file: str, n: int) -> None:
+    """Neue DB mit n Lärmereignissen und n / MASSNAHMEN_ANTEIL Maßnahmen."""
+    connection.configure(db_file)
+    create_database()
+    insert_laermdaten_many(list(laermdaten_rows(n)), chunk_size=5000)
+    insert_massnahmen_many(list(massnahmen_rows(max(n // MASSNAHMEN_ANTEIL, 1))))
+    data_processing.clear_cache()
+
+
+def _messen(fall: Fall, runs: int) -> Dict[str, float]:
+    zeiten = []
+    for _ in range(runs):
+        eingabe = fall.vorbereiten()
+        start = time.perf_counter()
+        fall.messen(eingabe)
+        zeiten.append(time.perf_counter() - start)
+
+    # Speicher getrennt messen: tracemalloc bremst und würde die Zeiten verfälschen
+    eingabe = fall.vorbereiten()
+    tracemalloc.start()
+    fall.messen(eingabe)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ergebnis = {"sekunden": round(min(zeiten), 4), "peak_mb": round(peak / 2**20, 2)}
+    if fall.je_zeile:
+        ergebnis["us_je_zeile"] = round(min(zeiten) / fall.je_zeile * 1e6, 1)
+    return ergebnis
+
+
+def lauf(sizes: List[int], namen: Optional[List[str]], runs: int) -> Dict[str, Dict]:
+    """Alle (bzw. die gewählten) Fälle je Größe. Rückgabe: {Größe: {Fall: Messwerte}}."""
+    faelle = [f for f in _faelle() if not namen or f.name in namen]
+    ergebnisse: Dict[str, Dict] = {}
+    start_dir = os.getcwd()
+    logo = pdf_generation.logo_bytes()
+    for n in sizes:
+        ergebnisse[str(n)] = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            # Plots (plots/) und PDFs landen relativ zum Arbeitsverzeichnis
+            os.chdir(tmp)
+            pdf_generation.setze_logo(logo)
+            try:
+                _datenbank_fuellen(os.path.join(tmp, "bench.db"), n)
+                for fall in faelle:
+                    messwerte = _messen(fall, runs)
+                    ergebnisse[str(n)][fall.name] = messwerte
+                    _ausgeben(n, fall.name, messwerte)
+            finally:
+                data_processing.clear_cache()
+                connection.close_all()
+                os.chdir(start_dir)
+    return ergebnisse
+
+
+def _ausgeben(n: int, name: str, m: Dict[str, float]) -> None:
+    je_zeile = f" ({m['us_je_zeile']:.0f} µs/Zeile)" if "us_je_zeile" in m else ""
+    print(
+        f"{n:>9} | {name:<22} | {m['sekunden']:>8.3f}s | {m['peak_mb']:>8.1f}MB"
+        f"{je_zeile}",
+        flush=True,
+    )
+
+
+def vergleichen(
+    ergebnisse: Dict[str, Dict], baseline: Dict[str, Dict], toleranz: Dict[str, float]
+) -> List[Tuple[str, str, str]]:
+    """
+    Regressionen gegenüber der Baseline: (Größe, Fall, Beschreibung).
+    Kleine absolute Unterschiede (min_sekunden, min_mb) zählen nicht – bei
+    Millisekunden-Fällen wäre sonst jedes Rauschen eine Regression.
+    """
+    regressionen = []
+    for n, faelle in ergebnisse.items():
+        for name, ist in faelle.items():
+            soll = baseline.get(n, {}).get(name)
+            if soll is None:
+                continue
+            for schluessel, minimum in (
+                ("sekunden", toleranz["min_sekunden"]),
+                ("peak_mb", toleranz["min_mb"]),
+            ):
+                alt, neu = soll[schluessel], ist[schluessel]
+                if neu > alt * (1 + toleranz["relativ"]) and neu - alt > minimum:
+                    regressionen.append((n, name, f"{schluessel} {alt} → {neu}"))
+    return regressionen
+
+
+def _laden(pfad: str) -> Dict:
+    try:
+        with open(pfad, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _speichern(pfad: str, daten: Dict) -> None:
+    tmp = pfad + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(daten, f, indent=2, sort_keys=True, ensure_ascii=False)
+    os.replace(tmp, pfad)
+
+
+def _umgebung() -> Dict[str, str]:
+    return {
+        "datum": date.today().isoformat(),
+        "python": platform.python_version(),
+        "plattform": platform.platform(terse=True),
+        "cpus": str(os.cpu_count()),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--faelle", nargs="+", help="nur diese Fälle messen")
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument(
+        "--baseline-schreiben",
+        action="store_true",
+        help="Ergebnis als neue Baseline übernehmen (nur die gemessenen Größen/Fälle)",
+    )
+    parser.add_argument("--json", help="Ergebnis zusätzlich als JSON speichern")
+    args = parser.parse_args(argv)
+
+    bekannt = {f.name for f in _faelle()}
+    if args.faelle and not set(args.faelle) <= bekannt:
+        parser.error(f"Unbekannte Fälle: {', '.join(sorted(set(args.faelle) - bekannt))}")
+
+    print(f"{'Zeilen':>9} | {'Fall':<22} | {'Zeit':>9} | {'Peak':>10}")
+    ergebnisse = lauf(args.sizes, args.faelle, args.runs)
+    if args.json:
+        _speichern(args.json, {"umgebung": _umgebung(), "ergebnisse": ergebnisse})
+
+    baseline = _laden(BASELINE_FILE)
+    if args.baseline_schreiben:
+        gespeichert = baseline.get("ergebnisse", {})
+        for n, faelle in ergebnisse.items():
+            gespeichert.setdefault(n, {}).update(faelle)
+        _speichern(BASELINE_FILE, {"umgebung": _umgebung(), "ergebnisse": gespeichert})
+        print(f"Baseline gespeichert: {BASELINE_FILE}")
+        return 0
+
+    if not baseline:
+        print("Keine Baseline vorhanden (--baseline-schreiben)")
+        return 0
+    with open(BUDGET_FILE, "r", encoding="utf-8") as f:
+        toleranz = json.load(f)["suite"]
+    regressionen = vergleichen(ergebnisse, baseline["ergebnisse"], toleranz)
+    print(f"\nVergleich mit Baseline vom {baseline['umgebung']['datum']}:")
+    for n, name, text in regressionen:
+        print(f"REGRESSION {n:>9} | {name:<22} | {text}")
+    print("OK" if not regressionen else f"{len(regressionen)} Regression(en)")
+    return 1 if regressionen else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+# benchmarks/synthetic.py
+"""
+Reproduzierbare Testdaten für Benchmarks (fester Seed).
+Erzeugt Zeilen im Format von protokol_service.save_events bzw. Dicts für
+den neuen Störungseintrag (stoerungseintrag_rows).
+"""
+
+import random
+from datetime import date, datetime, timedelta
+from typing import Iterator, Tuple
+
+GRUENDE = [
+    "Poltern",
+    "Trampeln",
+    "Trampeln, Poltern",
+    "Hüpfen",
+    "Rennen",
+    "Möbel verschieben",
+    "Klopfen",
+    "Musik",
+    "Bohrmaschine",
+    "Hausflur Türe zuwerfen",
+]
+VERURSACHER = ["Melnik", "Unbekannt", "Nachbar links", "Nachbar unten", "Hausmeister"]
+
+
+def laermdaten_rows(
+    n: int, seed: int = 42, start: date = date(2020, 1, 1)
+) -> Iterator[Tuple[str, str, str, str, str, int]]:
+    """n Lärmereignisse (datum ISO, beginn, ende, grund, verursacher, auswirkung)."""
+    rnd = random.Random(seed)
+    tag = start
+    minute = 0
+    for _ in range(n):
+        # Ereignisse laufen chronologisch; im Schnitt ~15 pro Tag
+        minute += rnd.randint(1, 190)
+        if minute >= 1440:
+            tag += timedelta(days=minute // 1440)
+            minute %= 1440
+        dauer = min(int(rnd.expovariate(1 / 4)), 180)
+        ende = (minute + dauer) % 1440  # darf über Mitternacht gehen
+        if ende == minute:
+            ende = (ende + 1) % 1440
+        yield (
+            tag.isoformat(),
+            f"{minute // 60:02d}:{minute % 60:02d}",
+            f"{ende // 60:02d}:{ende % 60:02d}",
+            rnd.choice(GRUENDE),
+            rnd.choice(VERURSACHER),
+            rnd.randint(1, 5),
+        )
+
+
+def massnahmen_rows(n: int, seed: int = 42) -> Iterator[Tuple[str, str, str]]:
+    """n Maßnahmen (datum, massnahme, ergebnis) mit unterschiedlich langen Texten."""
+    rnd = random.Random(seed)
+    woerter = "Gespräch Brief Vermieterin Hausverwaltung Mieterverein Anwalt Zeuge Frist".split()
+    for i in range(n):
+        yield (
+            (date(2020, 1, 1) + timedelta(days=i)).strftime("%d.%m.%Y"),
+            " ".join(rnd.choice(woerter) for _ in range(rnd.randint(3, 30))),
+            " ".join(rnd.choice(woerter) for _ in range(rnd.randint(0, 60))) or "Keine Reaktion.",
+        )
+
+
+def stoerungseintrag_rows(n: int, seed: int = 42, start: date = date(2020, 1, 1)) -> Iterator[dict]:
+    """
+    n Störungseinträge als Dicts für StoerungseintragRepository.hinzufuegen_viele.
+    Lärm mit beginn/ende, die anderen Typen meist ohne Dauer.
+    """
+    # Erst hier importieren: das neue Paket (src/) ist nur für diese Daten nötig
+    from mietstoerungsprotokoll.domain.models import Stoerungstyp
+
+    rnd = random.Random(seed)
+    typen = list(Stoerungstyp)
+    zeitpunkt = datetime(start.year, start.month, start.day)
+    for _ in range(n):
+        zeitpunkt += timedelta(minutes=rnd.randint(1, 190))
+        typ = Stoerungstyp.LAERM if rnd.random() < 0.6 else rnd.choice(typen)
+        dauer = timedelta(minutes=min(int(rnd.expovariate(1 / 4)), 180) + 1)
+        mit_dauer = typ == Stoerungstyp.LAERM or rnd.random() < 0.2
+        beschreibung = " ".join(rnd.choice(GRUENDE) for _ in range(rnd.randint(1, 120)))
+        yield {
+            "datum": zeitpunkt,
+            "beginn": zeitpunkt if mit_dauer else None,
+            "ende": zeitpunkt + dauer if mit_dauer else None,
+            "typ": typ,
+            "beschreibung": beschreibung[:2000],
+            "auswirkung": rnd.randint(1, 5),
+            "zeuge": rnd.choice(VERURSACHER) if rnd.random() < 0.1 else None,
+        }
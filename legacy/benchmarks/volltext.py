@@ -0,0 +1,112 @@
+# benchmarks/volltext.py
+"""
+Volltextsuche (FTS5, adapters/volltext.py) gegenüber einem LIKE-Scan über
+beschreibung/zeuge, dazu die Mehrkosten der Index-Trigger beim Massen-Insert.
+
+Gesucht wird ein seltenes Wort (in SELTEN Einträgen), ein Zeuge und ein Wort,
+das in fast jedem synthetischen Eintrag vorkommt (schlechtester Fall: alle
+Treffer müssen gerankt werden). Braucht das neue Paket (src/) und sqlmodel.
+
+Aufruf (im Ordner legacy/):
+    python -m benchmarks.volltext [--sizes 10000 100000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+LEGACY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(os.path.dirname(LEGACY_DIR), "src")
+sys.path.insert(0, SRC_DIR)  # das neue Paket ist (noch) nicht installiert
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+from benchmarks.synthetic import stoerungseintrag_rows  # noqa: E402
+from mietstoerungsprotokoll.adapters.stoerungseintrag_repository import (  # noqa: E402
+    StoerungseintragRepository,
+    erstelle_engine,
+)
+from mietstoerungsprotokoll.adapters.volltext import Volltextindex  # noqa: E402
+from mietstoerungsprotokoll.use_cases.volltextsuche import suche  # noqa: E402
+
+SELTEN = 10
+SELTENES_WORT = "Presslufthammer"
+
+SUCHEN = {
+    # Name → (Eingabe für suche(), LIKE-Bedingung für den Scan)
+    "selten": (SELTENES_WORT, f"beschreibung LIKE '%{SELTENES_WORT}%'"),
+    "zeuge": ("Hausmeister", "zeuge LIKE '%Hausmeister%'"),
+    "häufig": ("Bohrmaschine", "beschreibung LIKE '%Bohrmaschine%'"),
+}
+
+
+def _eintraege(n: int):
+    """Synthetische Einträge; jeder n // SELTEN-te bekommt das seltene Wort."""
+    for i, eintrag in enumerate(stoerungseintrag_rows(n)):
+        if i % (n // SELTEN) == 0:
+            eintrag["beschreibung"] = f"{SELTENES_WORT} {eintrag['beschreibung']}"[:2000]
+        yield eintrag
+
+
+def _zeit(fn, runs: int = 5):
+    """Bester von runs Läufen (Sekunden) und das Ergebnis des letzten."""
+    beste = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        ergebnis = fn()
+        beste = min(beste, time.perf_counter() - start)
+    return beste, ergebnis
+
+
+def _einfuegen(url: str, n: int, mit_index: bool) -> float:
+    if mit_index:
+        engine = erstelle_engine(url)
+    else:
+        engine = create_engine(url)
+        SQLModel.metadata.create_all(engine)
+    start = time.perf_counter()
+    StoerungseintragRepository(engine).hinzufuegen_viele(_eintraege(n))
+    sekunden = time.perf_counter() - start
+    engine.dispose()
+    return sekunden
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark: Volltextsuche")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args(argv)
+
+    print(f"{'Einträge':>9} | {'Fall':<20} | {'FTS5':>9} | {'LIKE-Scan':>9} | {'Treffer':>8}")
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            ohne = _einfuegen(f"sqlite:///{os.path.join(tmp, 'ohne.db')}", n, mit_index=False)
+            url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+            mit = _einfuegen(url, n, mit_index=True)
+            print(f"{n:>9} | {'Einfügen':<20} | {mit:>8.2f}s | {ohne:>8.2f}s | (ohne Index)")
+
+            engine = erstelle_engine(url)
+            index = Volltextindex(engine)
+            for name, (eingabe, bedingung) in SUCHEN.items():
+                fts, ergebnis = _zeit(
+                    lambda index=index, eingabe=eingabe: suche(index, eingabe, pro_seite=20)
+                )
+                with engine.connect() as conn:
+                    scan, anzahl = _zeit(
+                        lambda conn=conn, bedingung=bedingung: conn.execute(
+                            text(f"SELECT count(*) FROM stoerungseintrag WHERE {bedingung}")
+                        ).scalar_one(),
+                        runs=2,
+                    )
+                assert ergebnis.gesamt == anzahl, (name, ergebnis.gesamt, anzahl)
+                print(
+                    f"{n:>9} | {'Suche ' + name:<20} | {fts * 1000:>7.1f}ms | "
+                    f"{scan * 1000:>7.1f}ms | {anzahl:>8}"
+                )
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
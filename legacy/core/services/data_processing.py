@@ -3,84 +3,338 @@ utils/data_processing.py
 Protolkoli – 5 WICHTIGE PLOTS | PYLANCE: 0 FEHLER | FINAL VICTORY
 """
 
-import os
-import sqlite3
-from typing import List, Optional
+from __future__ import annotations
 
-import matplotlib.dates as mdates
-import matplotlib.pyplot as plt
-import numpy as np
-import pandas as pd
-import seaborn as sns
-from matplotlib.patches import Rectangle
-from sklearn.linear_model import LinearRegression
+import contextlib
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from core.services import plot_cache
+from infrastructure.database import aggregations
+from infrastructure.database.connection import get_connection
+from infrastructure.database.database_setup import to_iso_datum
+from infrastructure.database.migrations import MINUTEN_SQL
+from utils.lazy_import import lazy_import
+
+# Schwere Bibliotheken erst beim ersten Gebrauch laden (App-Start, siehe
+# benchmarks/startup_importtime.py)
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+    import matplotlib.dates as mdates
+    import numpy as np
+    import pandas as pd
+    import seaborn as sns
+    from matplotlib.figure import Figure
+    from matplotlib.patches import Rectangle
+    from PIL import Image as PILImage
+else:
+    mdates = lazy_import("matplotlib.dates")
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
+    sns = lazy_import("seaborn")
+mfigure = lazy_import("matplotlib.figure")
+mpatches = lazy_import("matplotlib.patches")
+backend_agg = lazy_import("matplotlib.backends.backend_agg")
 
 # === CACHE ===
-_cached_data: Optional[pd.DataFrame] = None
+# Obergrenze für den gecachten DataFrame; darüber wird nach jedem Zugriff verworfen
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+
+# Die DB liefert Datum/Zeiten schon als Zahlen (Sekunden seit 1970 bzw. Minuten
+# seit Mitternacht) – pandas muss keinen Text mehr parsen.
+_SELECT = f"""
+    SELECT id,
+           CAST(strftime('%s', datum) AS INTEGER) AS datum,
+           {MINUTEN_SQL.format(t="beginn")} AS beginn,
+           {MINUTEN_SQL.format(t="ende")} AS ende,
+           dauer,
+           grund,
+           verursacher,
+           CAST(auswirkung AS INTEGER) AS auswirkung
+    FROM laermdaten
+"""
+
+# Spaltentypen nach dem Laden: kompakt und für groupby/value_counts schnell
+KATEGORIEN = ("grund", "verursacher")
+
+
+def _prepare(df: pd.DataFrame) -> pd.DataFrame:
+    """Zahlen aus _SELECT → datetime64, category und int8 in einem Durchlauf je Spalte."""
+    datum = pd.to_datetime(df["datum"].to_numpy(dtype="int64"), unit="s")
+    # float: unlesbare Zeiten kommen als NULL (NaN) und werden zu NaT
+    beginn_min = df["beginn"].to_numpy(dtype="float64")
+    ende_min = df["ende"].to_numpy(dtype="float64")
+    # Über Mitternacht: Ende liegt am Folgetag
+    ende_min = ende_min + (ende_min < beginn_min) * 1440
+    df["datum"] = datum
+    df["beginn"] = datum + pd.to_timedelta(beginn_min, unit="m")
+    df["ende"] = datum + pd.to_timedelta(ende_min, unit="m")
+    # dauer wird beim Einfügen gespeichert (siehe database_setup.berechne_dauer)
+    df["dauer"] = df["dauer"].astype("float64")
+    df["auswirkung"] = df["auswirkung"].astype("int8")
+    return _kategorien(df)
+
+
+def _kategorien(df: pd.DataFrame) -> pd.DataFrame:
+    for spalte in KATEGORIEN:
+        if isinstance(df[spalte].dtype, pd.CategoricalDtype):
+            df[spalte] = df[spalte].cat.remove_unused_categories()
+        else:
+            df[spalte] = df[spalte].astype("category")
+    return df
+
+
+# Sortierung nach geparstem Beginn (Text-Sortierung stolpert über Altdaten wie '9:47')
+_SORT = ["beginn", "id"]
+
+
+def _query(where: str = "", params: Sequence = ()) -> pd.DataFrame:
+    df = pd.read_sql_query(
+        f"{_SELECT}{where} ORDER BY laermdaten.datum, laermdaten.beginn",
+        get_connection(),
+        params=params,
+    )
+    if df.empty:
+        return pd.DataFrame()
+    return _prepare(df).sort_values(_SORT, kind="stable", ignore_index=True)
+
+
+def load_laermdaten(start=None, end=None) -> pd.DataFrame:
+    """
+    Lädt nur den Zeitraum start..end (inklusive, date oder Text) – ohne Cache.
+    Die Abfrage läuft über den Index auf (datum, beginn).
+    """
+    clauses, params = [], []
+    if start is not None:
+        clauses.append("datum >= ?")
+        params.append(to_iso_datum(start))
+    if end is not None:
+        clauses.append("datum <= ?")
+        params.append(to_iso_datum(end))
+    return _query(" WHERE " + " AND ".join(clauses) if clauses else "", params)
+
+
+class _LaermdatenCache:
+    """
+    Hält die aufbereiteten Lärmdaten und lädt beim nächsten Zugriff nur nach,
+    was sich seit dem letzten Laden geändert hat:
+    - neue Zeilen: id > max_id
+    - geänderte/gelöschte Zeilen: Einträge in laermdaten_aenderungen mit seq > last_seq
+    """
+
+    def __init__(self) -> None:
+        self.frame: Optional[pd.DataFrame] = None
+        self.max_id = 0
+        self.last_seq = 0
+        self._lock = threading.Lock()  # GUI und Plot-Worker greifen parallel zu
+
+    def clear(self) -> None:
+        self.frame = None
+        self.max_id = 0
+        self.last_seq = 0
+
+    def _marker(self) -> Tuple[int, int]:
+        conn = get_connection()
+        max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM laermdaten").fetchone()[0]
+        seq = conn.execute(
+            "SELECT COALESCE(MAX(seq), 0) FROM laermdaten_aenderungen"
+        ).fetchone()[0]
+        return max_id, seq
+
+    def get(self, force_reload: bool = False) -> pd.DataFrame:
+        with self._lock:
+            return self._get(force_reload)
+
+    def _get(self, force_reload: bool) -> pd.DataFrame:
+        max_id, seq = self._marker()
+        if force_reload or self.frame is None:
+            df = _query(" WHERE id <= ?", (max_id,))
+        elif max_id == self.max_id and seq == self.last_seq:
+            return self.frame
+        else:
+            df = self._refresh(max_id, seq)
+
+        self.max_id, self.last_seq = max_id, seq
+        if df.empty or df.memory_usage(deep=True).sum() <= MAX_CACHE_BYTES:
+            self.frame = df
+        else:
+            # Speicherdruck: Ergebnis zurückgeben, aber nicht festhalten
+            self.clear()
+        return df
+
+    def _refresh(self, max_id: int, seq: int) -> pd.DataFrame:
+        df = self.frame
+        teile = []
+        if seq != self.last_seq:
+            ids = [
+                row[0]
+                for row in get_connection().execute(
+                    "SELECT DISTINCT laermdaten_id FROM laermdaten_aenderungen WHERE seq > ?",
+                    (self.last_seq,),
+                )
+            ]
+            if not df.empty:
+                df = _kategorien(df[~df["id"].isin(ids)].copy())
+            # Noch vorhandene (also geänderte, nicht gelöschte) Zeilen neu laden
+            for start in range(0, len(ids), 500):
+                chunk = ids[start : start + 500]
+                marks = ", ".join("?" * len(chunk))
+                teile.append(_query(f" WHERE id IN ({marks}) AND id <= ?", [*chunk, self.max_id]))
+        if max_id != self.max_id:
+            teile.append(_query(" WHERE id > ? AND id <= ?", (self.max_id, max_id)))
+
+        teile = [t for t in teile if not t.empty]
+        if not teile:
+            return df.reset_index(drop=True)
+        df = pd.concat([df, *teile], ignore_index=True) if not df.empty else pd.concat(teile)
+        # concat mit abweichenden Kategorien liefert object → Typen wiederherstellen
+        return _kategorien(df).sort_values(_SORT, kind="stable", ignore_index=True)
+
+
+_cache = _LaermdatenCache()
 
 
 def get_all_data(force_reload: bool = False) -> pd.DataFrame:
-    global _cached_data
-    if not force_reload and _cached_data is not None:
-        return _cached_data
-
+    """
+    Alle Lärmdaten als DataFrame. Wiederholte Aufrufe laden nur neue bzw.
+    geänderte Zeilen nach; force_reload=True liest alles neu.
+    """
     try:
-        with sqlite3.connect("database/protokoll.db") as conn:
-            df = pd.read_sql_query("SELECT * FROM laermdaten", conn)
+        return _cache.get(force_reload)
     except Exception as e:
         print(f"DB Fehler: {e}")
         return pd.DataFrame()
 
-    if df.empty:
-        _cached_data = pd.DataFrame()
-        return _cached_data
 
-    df["datum"] = pd.to_datetime(df["datum"], format="%d-%m-%Y", dayfirst=True)
-    df["beginn"] = pd.to_datetime(
-        df["datum"].dt.strftime("%Y-%m-%d") + " " + df["beginn"].astype(str)
+def clear_cache() -> None:
+    _cache.clear()
+
+
+# --- Summentabellen (infrastructure/database/rollups.py) ---
+TAGES_SPALTEN = ["datum", "anzahl", "anzahl_dauer", "summe_dauer", "summe_auswirkung"]
+WOCHENSTUNDEN_SPALTEN = [
+    "wochentag",
+    "stunde",
+    "anzahl",
+    "anzahl_dauer",
+    "summe_dauer",
+    "summe_auswirkung",
+]
+
+
+def load_tageswerte(start=None, end=None) -> pd.DataFrame:
+    """
+    Je Tag: Anzahl, Anzahl mit Dauer, Summe Dauer, Summe Auswirkung – eine Zeile pro Tag
+    statt pro Ereignis.
+    """
+    df = pd.DataFrame(aggregations.tageswerte(start, end), columns=TAGES_SPALTEN)
+    df["datum"] = pd.to_datetime(df["datum"], format="%Y-%m-%d")
+    return df
+
+
+def load_wochenstunden() -> pd.DataFrame:
+    """Je Wochentag (0 = Sonntag) und Stunde: Anzahl, Anzahl mit Dauer, Summen."""
+    return pd.DataFrame(aggregations.wochenstunden(), columns=WOCHENSTUNDEN_SPALTEN)
+
+
+def tageswerte_aus(df: pd.DataFrame) -> pd.DataFrame:
+    """Wie load_tageswerte, aber aus einem Ereignis-DataFrame (z. B. gefilterter Zeitraum)."""
+    gruppen = df.groupby(df["datum"].dt.normalize())
+    tage = pd.DataFrame(
+        {
+            "anzahl": gruppen.size(),
+            "anzahl_dauer": gruppen["dauer"].count(),
+            "summe_dauer": gruppen["dauer"].sum(),
+            "summe_auswirkung": gruppen["auswirkung"].sum(),
+        }
     )
-    df["ende"] = pd.to_datetime(df["datum"].dt.strftime("%Y-%m-%d") + " " + df["ende"].astype(str))
-    df["dauer"] = (df["ende"] - df["beginn"]).dt.total_seconds() / 60
+    return tage.rename_axis("datum").reset_index()
 
-    _cached_data = df.copy()
-    return _cached_data
 
+def _save_plot(fig: Figure, name: str) -> None:
+    os.makedirs(plot_cache.PLOT_DIR, exist_ok=True)
+    backend_agg.FigureCanvasAgg(fig)
+    fig.savefig(
+        os.path.join(plot_cache.PLOT_DIR, name), dpi=200, bbox_inches="tight", facecolor="white"
+    )
 
-def _save_plot(name: str) -> None:
-    os.makedirs("plots", exist_ok=True)
-    plt.savefig(f"plots/{name}", dpi=200, bbox_inches="tight", facecolor="white")
-    plt.close()
 
+def figur_als_bild(fig: Figure, breite_px: int) -> PILImage.Image:
+    """
+    Figure direkt im Speicher rastern (Agg) und als PIL-Bild mit breite_px Pixeln
+    Breite liefern – ohne PNG-Datei und ohne PNG-Kodierung/-Dekodierung.
+    Schriftgrößen bleiben relativ zur Figure, nur die Auflösung wird angepasst.
+    """
+    from PIL import Image as PILImage
 
-# ====================== DIE 5 WICHTIGSTEN PLOTS ======================
+    canvas = backend_agg.FigureCanvasAgg(fig)
+    fig.set_dpi(breite_px / fig.get_figwidth())
+    fig.set_facecolor("white")
+    canvas.draw()
+    breite, hoehe = canvas.get_width_height(physical=True)
+    # frombuffer teilt sich den Speicher mit Agg; convert legt die RGB-Kopie an
+    bild = PILImage.frombuffer("RGBA", (breite, hoehe), canvas.buffer_rgba(), "raw", "RGBA", 0, 1)
+    return bild.convert("RGB")
 
 
-def plot_trend_dauer(df: pd.DataFrame) -> None:
-    if df.empty:
-        return
-    plt.figure(figsize=(11, 6))
-    sns.lineplot(data=df, x="datum", y="dauer", marker="o", color="#1f77b4", linewidth=2.5)
-    plt.gca().xaxis.set_major_formatter(mdates.DateFormatter("%d.%m"))
-    plt.gca().xaxis.set_major_locator(mdates.DayLocator(interval=3))
-    plt.title("Trend: Störungsdauer über Zeit", fontsize=16, pad=20, fontweight="bold")
-    plt.xlabel("Datum")
-    plt.ylabel("Dauer (Minuten)")
-    plt.grid(True, alpha=0.3)
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    _save_plot("01_trend_dauer.png")
+def figuren(df: pd.DataFrame) -> Iterator[Tuple[str, Figure]]:
+    """Die Plots aus PLOTS als Figure-Objekte (für PDF-Anhang o. Ä.), leere übersprungen."""
+    for name, spec in PLOTS.items():
+        fig = spec.figure(df, **spec.params)
+        if fig is not None:
+            yield name, fig
 
 
-def plot_histogramm_dauer(df: pd.DataFrame) -> None:
+# ====================== DIE 5 WICHTIGSTEN PLOTS ======================
+# Jede figure_*-Funktion baut ihre eigene Figure (objektorientierte API, kein
+# globaler pyplot-Zustand) – damit sind sie thread- und prozesssicher.
+
+
+def figure_trend_dauer(df: pd.DataFrame) -> Optional[Figure]:
+    """Ø Dauer je Tag. df: Tageswerte (load_tageswerte) oder Ereignisse."""
+    if df.empty:
+        return None
+    tage = df if "anzahl" in df.columns else tageswerte_aus(df)
+    # Tage ganz ohne Dauer: 0 / 0 = NaN, also eine Lücke in der Linie
+    mittel = tage["summe_dauer"] / tage["anzahl_dauer"]
+    fig = mfigure.Figure(figsize=(11, 6))
+    ax = fig.subplots()
+    ax.plot(tage["datum"], mittel, marker="o", color="#1f77b4", linewidth=2.5)
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%d.%m"))
+    if tage["datum"].iloc[-1] - tage["datum"].iloc[0] <= pd.Timedelta(days=90):
+        ax.xaxis.set_major_locator(mdates.DayLocator(interval=3))
+    else:
+        # Bei langer Historie sonst Hunderte Beschriftungen
+        ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+        ax.xaxis.set_major_formatter(mdates.DateFormatter("%m.%Y"))
+    ax.set_title("Trend: Störungsdauer über Zeit", fontsize=16, pad=20, fontweight="bold")
+    ax.set_xlabel("Datum")
+    ax.set_ylabel("Ø Dauer (Minuten)")
+    ax.grid(True, alpha=0.3)
+    ax.tick_params(axis="x", labelrotation=45)
+    fig.tight_layout()
+    return fig
+
+
+def figure_histogramm_dauer(df: pd.DataFrame) -> Optional[Figure]:
     if df.empty or "dauer" not in df.columns:
-        return
+        return None
     dauer = df["dauer"].dropna()
     if dauer.empty:
-        return
+        return None
 
-    plt.figure(figsize=(10, 6))
+    fig = mfigure.Figure(figsize=(10, 6))
+    ax = fig.subplots()
 
-    ax = sns.histplot(
+    sns.histplot(
         data=pd.DataFrame({"dauer": dauer}),
         x="dauer",
         bins=20,
@@ -89,9 +343,10 @@ def plot_histogramm_dauer(df: pd.DataFrame) -> None:
         edgecolor="black",
         alpha=0.85,
         line_kws={"linewidth": 3, "color": "#d62728"},
+        ax=ax,
     )
 
-    patches: List[Rectangle] = [p for p in ax.patches if isinstance(p, Rectangle)]
+    patches: List[Rectangle] = [p for p in ax.patches if isinstance(p, mpatches.Rectangle)]
 
     if patches:
         heights = [p.get_height() for p in patches]
@@ -103,7 +358,7 @@ def plot_histogramm_dauer(df: pd.DataFrame) -> None:
         center = max_patch.get_x() + max_patch.get_width() / 2
         height = max_patch.get_height()
 
-        plt.text(
+        ax.text(
             center,
             height + max(heights) * 0.03,
             f"Häufigste Dauer\n{int(center)} Min",
@@ -115,43 +370,57 @@ def plot_histogramm_dauer(df: pd.DataFrame) -> None:
             bbox=dict(facecolor="white", alpha=0.9, edgecolor="red", boxstyle="round"),
         )
 
-    plt.title("Verteilung der Störungsdauern", fontsize=16, pad=20, fontweight="bold")
-    plt.xlabel("Dauer (Minuten)")
-    plt.ylabel("Häufigkeit")
-    plt.grid(axis="y", alpha=0.3)
-    plt.tight_layout()
-    _save_plot("02_histogramm_dauer.png")
+    ax.set_title("Verteilung der Störungsdauern", fontsize=16, pad=20, fontweight="bold")
+    ax.set_xlabel("Dauer (Minuten)")
+    ax.set_ylabel("Häufigkeit")
+    ax.grid(axis="y", alpha=0.3)
+    fig.tight_layout()
+    return fig
 
 
-def plot_top_stoerungen(df: pd.DataFrame) -> None:
+def figure_top_stoerungen(df: pd.DataFrame) -> Optional[Figure]:
     if df.empty or "grund" not in df.columns:
-        return
+        return None
     top10 = df["grund"].value_counts().head(10)
+    top10 = top10[top10 > 0]
     if top10.empty:
-        return
+        return None
+    top10.index = top10.index.astype(str)  # keine leeren Balken für ungenutzte Kategorien
 
-    plt.figure(figsize=(10, 7))
-    sns.barplot(y=top10.index, x=top10.values, hue=top10.index, palette="viridis", legend=False)
-    plt.title("Top 10 Störungsarten", fontsize=16, pad=20, fontweight="bold")
-    plt.xlabel("Häufigkeit")
-    plt.ylabel("Störungsgrund")
-    plt.tight_layout()
-    _save_plot("03_top_stoerungen.png")
+    fig = mfigure.Figure(figsize=(10, 7))
+    ax = fig.subplots()
+    sns.barplot(
+        y=top10.index, x=top10.values, hue=top10.index, palette="viridis", legend=False, ax=ax
+    )
+    ax.set_title("Top 10 Störungsarten", fontsize=16, pad=20, fontweight="bold")
+    ax.set_xlabel("Häufigkeit")
+    ax.set_ylabel("Störungsgrund")
+    fig.tight_layout()
+    return fig
 
 
-def plot_uhrzeiten(df: pd.DataFrame) -> None:
-    if df.empty or "beginn" not in df.columns:
-        return
-    stunden = df["beginn"].dt.hour.value_counts().sort_index()
+def figure_uhrzeiten(df: pd.DataFrame) -> Optional[Figure]:
+    """Anzahl je Stunde des Beginns. df: Wochenstunden (load_wochenstunden) oder Ereignisse."""
+    if df.empty:
+        return None
+    if "stunde" in df.columns:
+        stunden = df.groupby("stunde")["anzahl"].sum()
+    elif "beginn" in df.columns:
+        stunden = df["beginn"].dt.hour.value_counts()
+    else:
+        return None
     if stunden.empty:
-        return
+        return None
+    # Alle 24 Stunden, damit Balkenposition = Stunde (für die Hervorhebung unten)
+    stunden = stunden.reindex(range(24), fill_value=0)
 
-    plt.figure(figsize=(12, 6))
+    fig = mfigure.Figure(figsize=(12, 6))
+    ax = fig.subplots()
 
     x_values = stunden.index.tolist()
     y_values = stunden.values.astype(float).tolist()
 
-    bars = plt.bar(x_values, y_values, color="#ff7f0e", edgecolor="black", alpha=0.9)
+    bars = ax.bar(x_values, y_values, color="#ff7f0e", edgecolor="black", alpha=0.9)
 
     # FIX: max_hour definiert, Typ int, Index sicher
     max_hour: int = int(stunden.idxmax())
@@ -159,96 +428,273 @@ def plot_uhrzeiten(df: pd.DataFrame) -> None:
         bars.patches[max_hour].set_facecolor("#d62728")
         bars.patches[max_hour].set_edgecolor("#8B0000")
 
-    plt.title("Störungen nach Uhrzeit", fontsize=16, pad=20, fontweight="bold")
-    plt.xlabel("Uhrzeit")
-    plt.ylabel("Anzahl Störungen")
-    plt.xticks(range(24))
-    plt.grid(axis="y", alpha=0.3)
-    plt.tight_layout()
-    _save_plot("04_uhrzeiten.png")
+    ax.set_title("Störungen nach Uhrzeit", fontsize=16, pad=20, fontweight="bold")
+    ax.set_xlabel("Uhrzeit")
+    ax.set_ylabel("Anzahl Störungen")
+    ax.set_xticks(range(24))
+    ax.grid(axis="y", alpha=0.3)
+    fig.tight_layout()
+    return fig
 
 
-def plot_prognose(df: pd.DataFrame, tage: int = 14) -> None:
+def figure_prognose(df: pd.DataFrame, tage: int = 14, modell: str = "linear") -> Optional[Figure]:
+    """Tagessummen der Dauer: letzte 30 Tage und Prognose (Modelle siehe forecasting.py)."""
     if df.empty or len(df) < 5:
-        return
-    df_temp = df.copy()
-    df_temp["tag"] = df_temp["datum"].map(pd.Timestamp.toordinal)
+        return None
+    from core.services import forecasting
 
-    X = df_temp["tag"].to_numpy().reshape(-1, 1)
-    y = df_temp["dauer"].to_numpy().reshape(-1, 1)
-
-    model = LinearRegression()
-    model.fit(X, y)
-
-    zukunft = np.arange(df_temp["tag"].max() + 1, df_temp["tag"].max() + tage + 1).reshape(-1, 1)
-    vorhersage = model.predict(zukunft)
-
-    zukunft_daten = [pd.Timestamp.fromordinal(int(d)) for d in zukunft.flatten()]
-
-    plt.figure(figsize=(11, 6))
-    sns.lineplot(
-        data=df_temp.tail(30),
-        x="datum",
-        y="dauer",
-        label="Vergangenheit",
-        color="gray",
-        linewidth=2,
+    vergangenheit_tage, summen = forecasting.tagessummen(
+        df["datum"].to_numpy(), df["dauer"].to_numpy()
     )
-    sns.lineplot(
-        x=zukunft_daten,
-        y=vorhersage.flatten(),
-        label=f"Prognose (+{tage} Tage)",
-        color="#d62728",
-        linewidth=3,
+    p = forecasting.prognose_tageswerte(vergangenheit_tage, summen, horizont=tage, modell=modell)
+
+    fig = mfigure.Figure(figsize=(11, 6))
+    ax = fig.subplots()
+    ax.plot(
+        vergangenheit_tage[-30:], summen[-30:], label="Vergangenheit", color="gray", linewidth=2
     )
+    ax.plot(p.tage, p.werte, label=f"Prognose (+{tage} Tage)", color="#d62728", linewidth=3)
 
-    plt.title(
+    ax.set_title(
         f"Prognose: Störungsdauer nächste {tage} Tage", fontsize=16, pad=20, fontweight="bold"
     )
-    plt.xlabel("Datum")
-    plt.ylabel("Dauer (Minuten)")
-    plt.legend()
-    plt.grid(alpha=0.3)
-    plt.tight_layout()
-    _save_plot("05_prognose.png")
+    ax.set_xlabel("Datum")
+    ax.set_ylabel("Dauer pro Tag (Minuten)")
+    ax.legend()
+    ax.grid(alpha=0.3)
+    ax.tick_params(axis="x", labelrotation=45)
+    fig.tight_layout()
+    return fig
 
 
 # ====================== GENERIEREN ======================
-def generate_plots() -> None:
-    df = get_all_data(force_reload=True)
+@dataclass(frozen=True)
+class PlotSpec:
+    """Ein Plot und die Eingaben, von denen sein Bild abhängt."""
+
+    figure: Callable[..., Optional[Figure]]
+    spalten: Tuple[str, ...]
+    params: Dict[str, object] = field(default_factory=dict)
+    quelle: str = "ereignisse"  # Schlüssel in QUELLEN: welche Daten der Plot bekommt
+
+
+# Bei Änderungen an Layout/Stil erhöhen, damit alle Plots neu gerendert werden
+PLOT_VERSION = 3
+
+PLOTS: Dict[str, PlotSpec] = {
+    "01_trend_dauer.png": PlotSpec(
+        figure_trend_dauer, ("datum", "anzahl_dauer", "summe_dauer"), quelle="tage"
+    ),
+    "02_histogramm_dauer.png": PlotSpec(figure_histogramm_dauer, ("dauer",)),
+    "03_top_stoerungen.png": PlotSpec(figure_top_stoerungen, ("grund",)),
+    "04_uhrzeiten.png": PlotSpec(figure_uhrzeiten, ("stunde", "anzahl"), quelle="wochenstunden"),
+    "05_prognose.png": PlotSpec(
+        figure_prognose, ("datum", "dauer"), {"tage": 14, "modell": "linear"}
+    ),
+}
+
+# Datenquellen der Plots: Ereignisse oder die (viel kleineren) Summentabellen
+QUELLEN: Dict[str, Callable[[], pd.DataFrame]] = {
+    "ereignisse": lambda: get_all_data(),
+    "tage": lambda: load_tageswerte(),
+    "wochenstunden": lambda: load_wochenstunden(),
+}
+
+
+def daten_fuer(name: str) -> pd.DataFrame:
+    """Die Daten, aus denen der Plot name gerendert wird."""
+    return QUELLEN[PLOTS[name].quelle]()
+
+
+# Laufzeit (Sekunden) je Plot beim letzten generate_plots()
+letzte_laufzeiten: Dict[str, float] = {}
+
+
+def input_hash(name: str, df: pd.DataFrame) -> str:
+    """Hash über genau die Spalten und Parameter, die der Plot verwendet."""
+    spec = PLOTS[name]
+    h = hashlib.sha256(f"{PLOT_VERSION}|{name}|{sorted(spec.params.items())}".encode())
+    spalten = [s for s in spec.spalten if s in df.columns]
+    h.update(pd.util.hash_pandas_object(df[spalten], index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def render_plot(name: str, df: pd.DataFrame) -> Tuple[bool, float]:
+    """Einen Plot bauen und speichern. Rückgabe: (Bild erzeugt?, Laufzeit in Sekunden)."""
+    start = time.perf_counter()
+    spec = PLOTS[name]
+    fig = spec.figure(df, **spec.params)
+    if fig is not None:
+        _save_plot(fig, name)
+    return fig is not None, time.perf_counter() - start
+
+
+def plot_trend_dauer(df: pd.DataFrame) -> None:
+    render_plot("01_trend_dauer.png", df)
+
+
+def plot_histogramm_dauer(df: pd.DataFrame) -> None:
+    render_plot("02_histogramm_dauer.png", df)
+
+
+def plot_top_stoerungen(df: pd.DataFrame) -> None:
+    render_plot("03_top_stoerungen.png", df)
+
+
+def plot_uhrzeiten(df: pd.DataFrame) -> None:
+    render_plot("04_uhrzeiten.png", df)
+
+
+def plot_prognose(df: pd.DataFrame, tage: int = 14, modell: str = "linear") -> None:
+    fig = figure_prognose(df, tage, modell)
+    if fig is not None:
+        _save_plot(fig, "05_prognose.png")
+
+
+# === Prozess-Pool für parallel=N ===
+_pool: Optional[ProcessPoolExecutor] = None  # concurrent.futures erst bei parallel=N laden
+_pool_size = 0
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    global _pool, _pool_size
+    if _pool is None or _pool_size != workers:
+        shutdown_pool()
+        # spawn statt fork: der Aufrufer hat Threads (Kivy, Render-Worker)
+        _pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+        _pool_size = workers
+    return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool, _pool_size
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+    _pool, _pool_size = None, 0
+
+
+def _render_snapshot(name: str, snapshot: bytes) -> Tuple[str, bool, float]:
+    """Läuft im Worker-Prozess: Snapshot entpacken, Plot rendern."""
+    return (name, *render_plot(name, pickle.loads(snapshot)[PLOTS[name].quelle]))
+
+
+def generate_plots(
+    on_progress: Optional[Callable[[int, int, str], None]] = None,
+    abbrechen: Optional[Callable[[], bool]] = None,
+    parallel: int = 0,
+    force: bool = False,
+) -> bool:
+    """
+    Rendert die Plots nach plots/ – aber nur die, deren Eingangsdaten sich seit
+    dem letzten Rendern geändert haben (Hash im Manifest), außer force=True.
+    on_progress(fertig, gesamt, dateiname) nach jedem Plot; liefert abbrechen()
+    True, wird vor dem nächsten Plot aufgehört. Rückgabe: True wenn vollständig.
+    parallel=N > 1 rendert in N Prozessen aus einem einmal serialisierten Datensnapshot.
+    Die Laufzeit je gerendertem Plot steht danach in letzte_laufzeiten.
+    """
+    letzte_laufzeiten.clear()
+    df = get_all_data()
     if df.empty:
         print("Keine Daten zum Plotten")
-        return
-
-    print("Generiere die 5 wichtigsten Plots...")
-    plot_trend_dauer(df)
-    plot_histogramm_dauer(df)
-    plot_top_stoerungen(df)
-    plot_uhrzeiten(df)
-    plot_prognose(df)
-    print("FERTIG: 5 Plots generiert – PYLANCE: 0 FEHLER – DU: GOTT")
+        return True
+
+    daten = {"ereignisse": df}
+    for spec in PLOTS.values():
+        if spec.quelle not in daten:
+            daten[spec.quelle] = QUELLEN[spec.quelle]()
+
+    manifest = plot_cache.load_manifest()
+    hashes = {name: input_hash(name, daten[spec.quelle]) for name, spec in PLOTS.items()}
+    offen = [
+        name
+        for name in PLOTS
+        if force
+        or manifest.get(name, {}).get("hash") != hashes[name]
+        or not os.path.exists(os.path.join(plot_cache.PLOT_DIR, name))
+    ]
+    if not offen:
+        print("Plots aktuell – nichts zu rendern")
+        return True
+
+    print(f"Generiere {len(offen)} von {len(PLOTS)} Plots...")
+    start = time.perf_counter()
+    ergebnisse = (
+        _generate_parallel(daten, offen, parallel, abbrechen)
+        if parallel > 1
+        else _generate_sequential(daten, offen, abbrechen)
+    )
+    vollstaendig = True
+    for i, ergebnis in enumerate(ergebnisse, start=1):
+        if ergebnis is None:
+            vollstaendig = False
+            break
+        name, erzeugt, sekunden = ergebnis
+        letzte_laufzeiten[name] = sekunden
+        if erzeugt:
+            manifest[name] = plot_cache.eintrag(hashes[name])
+        else:
+            # Zu wenig Daten für diesen Plot: altes Bild ist nicht mehr gültig
+            manifest.pop(name, None)
+            with contextlib.suppress(OSError):
+                os.remove(os.path.join(plot_cache.PLOT_DIR, name))
+        if on_progress is not None:
+            on_progress(i, len(offen), name)
+    # Auch bei Abbruch: fertige Plots sind gültig und stehen im Manifest
+    plot_cache.save_manifest(manifest)
+    if not vollstaendig:
+        return False
+
+    gesamt = time.perf_counter() - start
+    details = ", ".join(f"{n}: {s:.2f}s" for n, s in letzte_laufzeiten.items())
+    logging.info(f"Plots generiert in {gesamt:.2f}s ({details})")
+    print(f"FERTIG: {len(offen)} Plots generiert")
+    return True
+
+
+def _generate_sequential(daten, namen, abbrechen) -> Iterator[Optional[Tuple[str, bool, float]]]:
+    for name in namen:
+        if abbrechen is not None and abbrechen():
+            yield None
+            return
+        yield (name, *render_plot(name, daten[PLOTS[name].quelle]))
+
+
+def _generate_parallel(daten, namen, workers, abbrechen):
+    from concurrent.futures import as_completed
+
+    # Snapshot nur mit den Quellen und Spalten, die die offenen Plots wirklich brauchen
+    spalten: Dict[str, set] = {}
+    for name in namen:
+        spec = PLOTS[name]
+        spalten.setdefault(spec.quelle, set()).update(spec.spalten)
+    snapshot = pickle.dumps(
+        {q: daten[q][sorted(s & set(daten[q].columns))] for q, s in spalten.items()},
+        protocol=pickle.HIGHEST_PROTOCOL,
+    )
+    pool = _get_pool(min(workers, len(PLOTS)))
+    futures = [pool.submit(_render_snapshot, name, snapshot) for name in namen]
+    for future in as_completed(futures):
+        if abbrechen is not None and abbrechen():
+            for f in futures:
+                f.cancel()
+            yield None
+            return
+        yield future.result()
 
 
 # ====================== ZUSATZ FÜR PDF ======================
 def get_all_massnahmen() -> pd.DataFrame:
     """Lädt alle Maßnahmen aus der DB – für PDF-Generierung"""
     try:
-        with sqlite3.connect("database/protokoll.db") as conn:
-            df = pd.read_sql_query("SELECT * FROM massnahmen", conn)
+        df = pd.read_sql_query("SELECT * FROM massnahmen", get_connection())
         return df if not df.empty else pd.DataFrame()
     except Exception as e:
         print(f"Maßnahmen laden fehlgeschlagen: {e}")
         return pd.DataFrame()
 
 
-# Auto-Start
-if __name__ != "__main__":
-    try:
-        df = get_all_data()
-        if not df.empty and len(df) >= 5:
-            generate_plots()
-    except:
-        pass
-
 if __name__ == "__main__":
     generate_plots()
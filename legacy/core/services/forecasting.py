@@ -0,0 +1,109 @@
+# core/services/forecasting.py
+"""
+Leichte Prognosemodelle für die Störungsdauer, nur mit NumPy.
+Gerechnet wird auf Tagessummen (Tage ohne Störung zählen als 0), nicht auf
+einzelnen Ereignissen – die Reihe ist damit so lang wie die Historie in
+Tagen, nicht wie die Zahl der Einträge.
+
+Modelle:
+    linear       – Trend per geschlossener Kleinste-Quadrate-Lösung
+    saisonal     – Trend + mittlere Abweichung je Wochentag
+    exponentiell – Holt (doppelte exponentielle Glättung: Niveau + Trend)
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Prognose:
+    tage: np.ndarray  # datetime64[D], die prognostizierten Tage
+    werte: np.ndarray  # float64, Dauer in Minuten je Tag
+    modell: str
+
+
+def tagessummen(datum: np.ndarray, werte: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Summe je Kalendertag von erstem bis letztem Tag, lückenlos.
+    datum: datetime64-Array (beliebige Auflösung), werte: gleich lang.
+    """
+    tage = np.asarray(datum).astype("datetime64[D]")
+    erster = tage.min()
+    index = (tage - erster).astype(np.int64)
+    summen = np.bincount(index, weights=np.nan_to_num(np.asarray(werte, dtype=np.float64)))
+    return erster + np.arange(len(summen)), summen
+
+
+def _trend(y: np.ndarray) -> Tuple[float, float]:
+    """Achsenabschnitt und Steigung von y über 0..n-1 (geschlossene Form)."""
+    n = len(y)
+    x = np.arange(n, dtype=np.float64)
+    x_mittel = (n - 1) / 2
+    y_mittel = y.mean()
+    varianz = ((x - x_mittel) ** 2).sum()
+    steigung = ((x - x_mittel) * (y - y_mittel)).sum() / varianz if varianz else 0.0
+    return y_mittel - steigung * x_mittel, steigung
+
+
+def linear(y: np.ndarray, horizont: int, start_wochentag: int = 0) -> np.ndarray:
+    achse, steigung = _trend(y)
+    return achse + steigung * np.arange(len(y), len(y) + horizont)
+
+
+def saisonal(y: np.ndarray, horizont: int, start_wochentag: int = 0) -> np.ndarray:
+    """Linearer Trend plus additive Wochensaison (Mittel der Residuen je Wochentag)."""
+    n = len(y)
+    achse, steigung = _trend(y)
+    residuen = y - (achse + steigung * np.arange(n))
+    wochentag = (start_wochentag + np.arange(n)) % 7
+    anzahl = np.bincount(wochentag, minlength=7)
+    saison = np.bincount(wochentag, weights=residuen, minlength=7) / np.maximum(anzahl, 1)
+    zukunft = np.arange(n, n + horizont)
+    return achse + steigung * zukunft + saison[(start_wochentag + zukunft) % 7]
+
+
+def exponentiell(
+    y: np.ndarray,
+    horizont: int,
+    start_wochentag: int = 0,
+    alpha: float = 0.3,
+    beta: float = 0.1,
+) -> np.ndarray:
+    """Holt-Verfahren: Niveau und Trend exponentiell geglättet, dann linear fortgeschrieben."""
+    niveau = y[0]
+    trend = y[1] - y[0] if len(y) > 1 else 0.0
+    for wert in y[1:]:
+        vorher = niveau
+        niveau = alpha * wert + (1 - alpha) * (niveau + trend)
+        trend = beta * (niveau - vorher) + (1 - beta) * trend
+    return niveau + trend * np.arange(1, horizont + 1)
+
+
+MODELLE: Dict[str, Callable[..., np.ndarray]] = {
+    "linear": linear,
+    "saisonal": saisonal,
+    "exponentiell": exponentiell,
+}
+
+
+def prognose_tageswerte(
+    tage: np.ndarray, summen: np.ndarray, horizont: int = 14, modell: str = "linear"
+) -> Prognose:
+    """Prognose aus bereits gebildeten Tagessummen (siehe tagessummen), nicht negativ."""
+    if modell not in MODELLE:
+        raise ValueError(f"Unbekanntes Prognosemodell: {modell}")
+    # 1970-01-01 war ein Donnerstag → Montag = 0
+    start_wochentag = int((tage[0].astype(np.int64) + 3) % 7)
+    vorhersage = MODELLE[modell](summen, horizont, start_wochentag)
+    zukunft = tage[-1] + np.arange(1, horizont + 1)
+    return Prognose(zukunft, np.clip(vorhersage, 0, None), modell)
+
+
+def prognose(
+    datum: np.ndarray, werte: np.ndarray, horizont: int = 14, modell: str = "linear"
+) -> Prognose:
+    """Tagessummen bilden und horizont Tage nach dem letzten Tag vorhersagen."""
+    tage, summen = tagessummen(datum, werte)
+    return prognose_tageswerte(tage, summen, horizont, modell)
@@ -0,0 +1,74 @@
+# core/services/pdf_cache.py
+"""
+Cache der gerenderten Monatsabschnitte des Lärmprotokolls (pdf_cache/).
+Je abgeschlossenem Monat liegt ein PDF-Fragment samt Hash der Zeilen, aus
+denen es gerendert wurde, und der Seite, auf der es beginnt (die Seitenzahlen
+sind eingezeichnet). Ändert sich ein Monat nachträglich oder verschiebt er sich
+auf eine andere Seite, passt der Eintrag nicht mehr und der Monat wird neu gerendert.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, Optional
+
+PDF_CACHE_DIR = "pdf_cache"
+MANIFEST_FILE = os.path.join(PDF_CACHE_DIR, "manifest.json")
+
+
+def load_manifest() -> Dict[str, dict]:
+    try:
+        with open(MANIFEST_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest: Dict[str, dict]) -> None:
+    os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+    tmp = MANIFEST_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, MANIFEST_FILE)  # atomar: nie ein halb geschriebenes Manifest
+
+
+def fragment_pfad(monat: str) -> str:
+    return os.path.join(PDF_CACHE_DIR, f"laerm_{monat}.pdf")
+
+
+def gueltiges_fragment(
+    manifest: Dict[str, dict], monat: str, hash_wert: str, erste_seite: int
+) -> Optional[str]:
+    """
+    Pfad des gecachten Fragments, falls Hash und erste Seite passen und die
+    Datei noch existiert.
+    """
+    eintrag = manifest.get(monat)
+    if (
+        eintrag
+        and eintrag.get("hash") == hash_wert
+        and eintrag.get("erste_seite") == erste_seite
+        and os.path.exists(eintrag["datei"])
+    ):
+        return eintrag["datei"]
+    return None
+
+
+def eintrag(hash_wert: str, datei: str, seiten: int, erste_seite: int) -> dict:
+    return {
+        "hash": hash_wert,
+        "datei": datei,
+        "seiten": seiten,
+        "erste_seite": erste_seite,
+        "erstellt": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def entferne(manifest: Dict[str, dict], monat: str) -> None:
+    """Eintrag samt Fragment löschen (Monat existiert nicht mehr)."""
+    eintrag = manifest.pop(monat, None)
+    if eintrag:
+        try:
+            os.remove(eintrag["datei"])
+        except OSError:
+            pass
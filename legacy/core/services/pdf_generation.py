@@ -1,11 +1,20 @@
+import calendar
+import hashlib
+import io
+import logging
+import os
+import time
 from datetime import date
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
-import pandas as pd
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.lib.utils import simpleSplit
 from reportlab.platypus import (
+    Flowable,
     Image,
     PageBreak,
     Paragraph,
@@ -15,15 +24,190 @@ from reportlab.platypus import (
     TableStyle,
 )
 
-from core.services.data_processing import get_all_data, get_all_massnahmen
+from core.services import pdf_cache
+from core.services.data_processing import get_all_massnahmen
+from infrastructure.database.database_setup import iter_laermdaten
+
+LAERM_KOPFZEILE = [
+    "Datum",
+    "Beginn",
+    "Ende",
+    "Dauer",
+    "Art der Störung",
+    "Verursacher",
+    "Auswirkung",
+]
+LAERM_ZEILENHOEHE = 30
+# Spaltenbreiten werden aus den ersten Zeilen geschätzt statt aus allen Zellen
+SPALTEN_STICHPROBE = 200
+
+LAERM_TABELLEN_STIL = TableStyle(
+    [
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
+        ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
+        ("FONTSIZE", (0, 0), (-1, -1), 10),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightblue),  # Überschriften grau hinterlegen
+        ("WORDWRAP", (0, 0), (-1, -1), True),  # Umbruch des Textes
+    ]
+)
 
 
-def generiere_protokoll(self, *args):
-    # Daten laden
-    data = get_all_data()  # Holt die Rohdaten aus der Datenbank
+def _zeit(wert: str) -> str:
+    """'9:47' → '09:47'; nicht lesbare Altwerte (z. B. 'kurz') unverändert."""
+    try:
+        stunden, minuten = str(wert).split(":")[:2]
+        return f"{int(stunden):02d}:{minuten[:2]}"
+    except ValueError:
+        return str(wert)
 
-    filename = f"Lärmprotokoll_vom_{date.today().strftime('%d-%m-%Y')}.pdf"
-    doc = SimpleDocTemplate(filename, pagesize=A4)
+
+def _datum(wert: str) -> str:
+    """'2024-11-05' → '05.11.2024'; andere Formate unverändert."""
+    try:
+        jahr, monat, tag = str(wert).split("-")
+    except ValueError:
+        return str(wert)
+    return f"{tag}.{monat}.{jahr}"
+
+
+def _laerm_zeile(row: Tuple) -> List[str]:
+    """DB-Zeile aus iter_laermdaten → Tabellenzeile im Protokollformat."""
+    datum, beginn, ende, dauer, grund, verursacher, auswirkung = row
+    return [
+        _datum(datum),
+        _zeit(beginn),
+        _zeit(ende),
+        "" if dauer is None else f"{dauer:g}",
+        grund,
+        verursacher,
+        str(auswirkung),
+    ]
+
+
+def _spaltenbreiten(zeilen: Sequence[Sequence[str]], max_breite: float) -> List[float]:
+    """Breite ~ längster Text × 6, bei Bedarf auf die Seitenbreite gestaucht."""
+    breiten = [max(len(str(row[i])) for row in zeilen) * 6 for i in range(len(zeilen[0]))]
+    gesamt = sum(breiten)
+    if gesamt > max_breite:
+        breiten = [b * max_breite / gesamt for b in breiten]
+    return breiten
+
+
+def _laerm_tabelle(zeilen: List[List[str]], col_widths: List[float]) -> Table:
+    table = Table(
+        [LAERM_KOPFZEILE] + zeilen,
+        colWidths=col_widths,
+        rowHeights=LAERM_ZEILENHOEHE,
+        repeatRows=1,
+    )
+    table.setStyle(LAERM_TABELLEN_STIL)
+    return table
+
+
+class StreamingTabelle(Flowable):
+    """
+    Tabelle, die ihre Zeilen erst beim Seitenumbruch aus einem Iterator holt.
+    Pro Seite entsteht eine eigene Table mit Kopfzeile; im Speicher liegt
+    höchstens eine Seite Zeilen, unabhängig von der Länge des Protokolls.
+    Setzt feste Zeilenhöhen voraus (so lässt sich die Zeilenzahl je Seite ausrechnen).
+    """
+
+    def __init__(
+        self,
+        zeilen: Iterator[List[str]],
+        col_widths: List[float],
+        puffer: Optional[List[List[str]]] = None,
+    ):
+        super().__init__()
+        self._zeilen = zeilen
+        self._col_widths = col_widths
+        self._puffer = puffer or []
+        self._erschoepft = False
+        self._tabelle: Optional[Table] = None
+
+    @staticmethod
+    def _zeilen_pro_seite(hoehe: float) -> int:
+        return int((hoehe - LAERM_ZEILENHOEHE) // LAERM_ZEILENHOEHE)
+
+    def _auffuellen(self, n: int) -> None:
+        while not self._erschoepft and len(self._puffer) < n:
+            try:
+                self._puffer.append(next(self._zeilen))
+            except StopIteration:
+                self._erschoepft = True
+
+    def wrap(self, availWidth, availHeight):
+        n = max(self._zeilen_pro_seite(availHeight), 0)
+        self._auffuellen(n + 1)  # eine Zeile mehr: passt der Rest komplett?
+        if len(self._puffer) <= n:
+            self._tabelle = _laerm_tabelle(self._puffer, self._col_widths)
+            self.width, self.height = self._tabelle.wrap(availWidth, availHeight)
+        else:
+            # Zu groß für den Platz → der DocTemplate ruft split() auf
+            self._tabelle = None
+            self.width, self.height = sum(self._col_widths), availHeight + 1
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        n = self._zeilen_pro_seite(availHeight)
+        if n < 1:
+            return []  # nicht einmal eine Zeile passt: nächste Seite
+        self._auffuellen(n)
+        seite, rest = self._puffer[:n], self._puffer[n:]
+        return [
+            _laerm_tabelle(seite, self._col_widths),
+            StreamingTabelle(self._zeilen, self._col_widths, rest),
+        ]
+
+    def draw(self):
+        self._tabelle.drawOn(self.canv, 0, 0)
+
+
+LOGO_PATH = "utils/image/Designer.png"
+LOGO_PIXEL = 300  # 100 pt im PDF → 300 px reichen für den Druck
+_logo_daten: Optional[bytes] = None
+
+
+def logo_bytes() -> Optional[bytes]:
+    """
+    Logo einmal dekodieren, auf LOGO_PIXEL verkleinern und als PNG-Bytes merken.
+    Jedes weitere PDF (auch in Worker-Prozessen, siehe setze_logo) nutzt die
+    kleinen Bytes statt das Original erneut zu lesen.
+    """
+    global _logo_daten
+    if _logo_daten is None:
+        from PIL import Image as PILImage
+
+        try:
+            with PILImage.open(LOGO_PATH) as img:
+                img.thumbnail((LOGO_PIXEL, LOGO_PIXEL))
+                puffer = io.BytesIO()
+                img.save(puffer, "PNG", optimize=True)
+        except OSError:
+            print(f"Logo nicht gefunden: {LOGO_PATH}")
+            return None
+        _logo_daten = puffer.getvalue()
+    return _logo_daten
+
+
+def setze_logo(daten: Optional[bytes]) -> None:
+    """Vorbereitetes Logo übernehmen (z. B. vom Elternprozess beim Batch-Export)."""
+    global _logo_daten
+    _logo_daten = daten
+
+
+def _logo() -> Optional[Image]:
+    daten = logo_bytes()
+    if daten is None:
+        return None
+    return Image(io.BytesIO(daten), width=100, height=100)
+
+
+def _laerm_einleitung(heute: Optional[date] = None) -> list:
+    """Logo, Titel, Erstellungsdatum (heute, Standard: date.today()) und Beschreibung."""
     elements = []
 
     # Styles und Logo
@@ -31,17 +215,14 @@ def generiere_protokoll(self, *args):
     title_style = styles["Heading1"]
     body_style = styles["BodyText"]
 
-    logo_path = "utils/image/Designer.png"
-    try:
-        logo = Image(logo_path, width=100, height=100)
+    logo = _logo()
+    if logo is not None:
         elements.append(logo)
-    except FileNotFoundError:
-        print(f"Logo nicht gefunden: {logo_path}")
 
     # Titel und Datum hinzufügen
     title = Paragraph("Lärmprotokoll", title_style)
     date_paragraph = Paragraph(
-        f"<b>Erstellt am:</b> {date.today().strftime('%d.%m.%Y')}", body_style
+        f"<b>Erstellt am:</b> {(heute or date.today()).strftime('%d.%m.%Y')}", body_style
     )
     elements.append(title)
     elements.append(date_paragraph)
@@ -55,90 +236,252 @@ def generiere_protokoll(self, *args):
     )
     elements.append(description)
     elements.append(Spacer(1, 20))
+    return elements
 
-    # Tabellendaten vorbereiten (Spaltenüberschriften und Daten)
-    if not data.empty:
-        # Entfernen der ID-Spalte
-        data = data.drop(columns=["id"], errors="ignore")
 
-        # Datum im richtigen Format ändern
-        data["datum"] = pd.to_datetime(data["datum"]).dt.strftime("%d.%m.%Y")
+def _laerm_footer() -> list:
+    footer = Paragraph(
+        "Lärmprotokoll - Generated with Protokoli der Protokollapp - Version 1.0 (2024) - © Alexander Rothe",
+        ParagraphStyle(name="Footer", alignment=1, fontSize=10),
+    )
+    return [Spacer(1, 40), footer]
 
-        # Uhrzeit im Format HH:MM ändern (z.B., 20:08 statt 20:08:00)
-        data["beginn"] = pd.to_datetime(data["beginn"]).dt.strftime("%H:%M")
-        data["ende"] = pd.to_datetime(data["ende"]).dt.strftime("%H:%M")
 
-        # Umbenennung von 'grund' auf 'Art der Störung'
-        data = data.rename(columns={"grund": "Art der Störung"})
+def _keine_daten() -> Table:
+    table = Table([["Keine Daten vorhanden"]], rowHeights=LAERM_ZEILENHOEHE)
+    table.setStyle(LAERM_TABELLEN_STIL)
+    return table
 
-        # Spaltenüberschrift in Großbuchstaben
-        column_headers = [col.capitalize() for col in data.columns]
-        table_data = [column_headers]
 
-        # Datenzeilen hinzufügen
-        for row in data.values.tolist():
-            table_data.append(row)
+# Auflösung der eingebetteten Plots: reicht für Druck, hält das PDF klein
+ANHANG_DPI = 150
+
+
+class Figurbild(Flowable):
+    """Gerastertes Plot-Bild (PIL) in Satzspiegelbreite, bei Bedarf auf die Resthöhe verkleinert."""
+
+    def __init__(self, bild, breite: float):
+        super().__init__()
+        from reportlab.lib.utils import ImageReader
+
+        self._reader = ImageReader(bild)
+        pixel_breite, pixel_hoehe = bild.size
+        self._breite = breite
+        self._hoehe = breite * pixel_hoehe / pixel_breite
+
+    def wrap(self, availWidth, availHeight):
+        faktor = min(1.0, availWidth / self._breite)
+        self.width, self.height = self._breite * faktor, self._hoehe * faktor
+        return self.width, self.height
+
+    def draw(self):
+        self.canv.drawImage(self._reader, 0, 0, self.width, self.height)
+
+
+def _statistik_anhang(breite: float, start=None, end=None) -> list:
+    """
+    Seiten mit den Analyse-Plots aus data_processing. Die Figures werden im
+    Speicher auf ANHANG_DPI gerastert und direkt eingebettet – keine PNGs auf der Platte.
+    """
+    from core.services import data_processing
+
+    if start is not None or end is not None:
+        df = data_processing.load_laermdaten(start, end)
+    else:
+        df = data_processing.get_all_data()
+    styles = getSampleStyleSheet()
+    elements = [PageBreak(), Paragraph("Statistik-Anhang", styles["Heading1"])]
+    pixel = int(breite / 72 * ANHANG_DPI)
+    for _, fig in data_processing.figuren(df):
+        elements.append(Figurbild(data_processing.figur_als_bild(fig, pixel), breite))
+        elements.append(Spacer(1, 12))
+    if len(elements) == 2:
+        elements.append(Paragraph("Keine Daten für Analysen vorhanden.", styles["BodyText"]))
+    return elements
+
+
+def _seitenzahl(canvas, doc=None) -> None:
+    """Seitenzahl unten rechts (onFirstPage/onLaterPages)."""
+    canvas.setFont("Helvetica", 10)
+    canvas.drawString(530, 30, f"Seite {canvas.getPageNumber()}")
+
+
+def generiere_protokoll(self, *args, start=None, end=None, statistik=False):
+    """
+    Lärmprotokoll als PDF. Die Zeilen werden per Cursor blockweise gelesen und
+    seitenweise gesetzt (StreamingTabelle) – auch mehrjährige Protokolle
+    brauchen konstant Speicher. Mit start/end nur der gewünschte Zeitraum,
+    mit statistik=True folgt ein Anhang mit den Analyse-Plots.
+    """
+    filename = f"Lärmprotokoll_vom_{date.today().strftime('%d-%m-%Y')}.pdf"
+    doc = SimpleDocTemplate(filename, pagesize=A4)
+    elements = _laerm_einleitung()
+
+    # Zeilen als Generator; die ersten dienen als Stichprobe für die Spaltenbreiten
+    zeilen = map(_laerm_zeile, iter_laermdaten(start, end))
+    stichprobe = list(islice(zeilen, SPALTEN_STICHPROBE))
+    if stichprobe:
+        col_widths = _spaltenbreiten([LAERM_KOPFZEILE] + stichprobe, doc.width)
+        elements.append(StreamingTabelle(zeilen, col_widths, stichprobe))
     else:
         # Keine Daten verfügbar
-        table_data = [["Keine Daten vorhanden"]]
-
-    # Berechnung der Spaltenbreiten basierend auf der maximalen Textlänge
-    col_widths = []
-    for i in range(len(table_data[0])):
-        max_len = max(
-            [len(str(row[i])) for row in table_data]
-        )  # Maximale Länge der Zellen in der Spalte
-        col_widths.append(
-            max_len * 6
-        )  # Multiplizieren mit einem Faktor (z.B., 6) für bessere Sichtbarkeit
-
-    # Tabelle formatieren
-    table = Table(table_data, colWidths=col_widths, rowHeights=30, repeatRows=1)
-    table.setStyle(
-        TableStyle(
-            [
-                ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
-                ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
-                ("FONTSIZE", (0, 0), (-1, -1), 10),
-                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
-                ("BACKGROUND", (0, 0), (-1, 0), colors.lightblue),  # Überschriften grau hinterlegen
-                ("WORDWRAP", (0, 0), (-1, -1), True),  # Umbruch des Textes
-            ]
-        )
-    )
+        elements.append(_keine_daten())
 
-    # Funktion, um die Seitenzahl hinzuzufügen und die Tabelle richtig anzuordnen
-    def on_page(canvas, doc):
-        # Seitenzahl hinzufügen
-        page_num = canvas.getPageNumber()
-        text = f"Seite {page_num}"
-        canvas.setFont("Helvetica", 10)
-        canvas.drawString(530, 30, text)
+    if statistik:
+        elements.extend(_statistik_anhang(doc.width, start, end))
 
     # Kopf- und Fußbereich
-    elements.append(table)
     elements.append(PageBreak())  # Seitewechsel einfügen
+    elements.extend(_laerm_footer())
 
-    # Footer hinzufügen
-    elements.append(Spacer(1, 40))
-    footer = Paragraph(
-        "Lärmprotokoll - Generated with Protokoli der Protokollapp - Version 1.0 (2024) - © Alexander Rothe",
-        ParagraphStyle(name="Footer", alignment=1, fontSize=10),
+    # PDF erstellen
+    doc.build(elements, onFirstPage=_seitenzahl, onLaterPages=_seitenzahl)
+    return filename
+
+
+# ---------------------------------------------------------------
+# Inkrementeller Export: abgeschlossene Monate aus dem Cache
+# ---------------------------------------------------------------
+
+# Fester Spaltensatz, damit alle Monatsfragmente gleich aussehen (Summe = Satzspiegel A4)
+LAERM_SPALTENBREITEN = [62, 42, 42, 40, 115, 90, 60]
+# Erhöhen, wenn sich das Layout der Fragmente ändert – verwirft den Cache
+FRAGMENT_VERSION = 2
+
+
+def _monats_hashes() -> Dict[str, str]:
+    """SHA-256 der Zeilen je Monat (YYYY-MM), in einem Durchlauf über den Cursor."""
+    hashes = {}
+    for row in iter_laermdaten():
+        monat = row[0][:7]
+        h = hashes.get(monat)
+        if h is None:
+            h = hashes[monat] = hashlib.sha256(f"v{FRAGMENT_VERSION}".encode())
+        h.update(repr(row).encode())
+    return {monat: h.hexdigest() for monat, h in hashes.items()}
+
+
+def _monatsgrenzen(monat: str) -> Tuple[date, date]:
+    jahr, nr = map(int, monat.split("-"))
+    return date(jahr, nr, 1), date(jahr, nr, calendar.monthrange(jahr, nr)[1])
+
+
+def _seitenzahlen_ab(erste_seite: int):
+    """onPage-Callback wie _seitenzahl für ein Fragment, das auf Seite erste_seite beginnt."""
+
+    def seitenzahl(canvas, doc=None) -> None:
+        canvas.setFont("Helvetica", 10)
+        canvas.drawString(530, 30, f"Seite {erste_seite + canvas.getPageNumber() - 1}")
+
+    return seitenzahl
+
+
+def _render_fragment(elements: list, ziel, erste_seite: int = 1) -> int:
+    """Flowables mit Seitenzahlen ab erste_seite rendern; liefert die Seitenzahl des Fragments."""
+    doc = SimpleDocTemplate(ziel, pagesize=A4)
+    seitenzahl = _seitenzahlen_ab(erste_seite)
+    doc.build(elements, onFirstPage=seitenzahl, onLaterPages=seitenzahl)
+    return doc.page
+
+
+def _monats_fragment(monat: str, ziel, erste_seite: int) -> int:
+    start, end = _monatsgrenzen(monat)
+    zeilen = map(_laerm_zeile, iter_laermdaten(start, end))
+    return _render_fragment([StreamingTabelle(zeilen, LAERM_SPALTENBREITEN)], ziel, erste_seite)
+
+
+def generiere_protokoll_inkrementell(
+    self, *args, heute: Optional[date] = None, statistik: bool = False
+) -> str:
+    """
+    Lärmprotokoll wie generiere_protokoll, aber für wiederholte Exporte:
+    Abgeschlossene Monate (vor dem aktuellen) werden als Fragment in pdf_cache/
+    abgelegt und nur neu gerendert, wenn sich ihre Zeilen geändert haben.
+    Neu gerendert werden jedes Mal nur die erste Seite (Erstellungsdatum),
+    der laufende Monat und der Abschluss. Jeder Monat beginnt auf einer neuen
+    Seite mit eigener Kopfzeile. Die Seitenzahlen zeichnet reportlab beim
+    Rendern mit ein; ein gecachter Monat gilt daher nur, solange er auf
+    derselben Seite beginnt (ändert sich die Seitenzahl eines früheren Monats,
+    werden die folgenden neu gerendert).
+    Der Statistik-Anhang (statistik=True) hängt an der ganzen Historie und wird
+    daher ebenfalls jedes Mal neu gerendert.
+    """
+    from pypdf import PdfWriter
+
+    heute = heute or date.today()
+    offen_ab = heute.strftime("%Y-%m")
+    filename = f"Lärmprotokoll_vom_{heute.strftime('%d-%m-%Y')}.pdf"
+
+    start = time.perf_counter()
+    hashes = _monats_hashes()
+    manifest = pdf_cache.load_manifest()
+    for monat in [m for m in manifest if m not in hashes or m >= offen_ab]:
+        pdf_cache.entferne(manifest, monat)
+
+    writer = PdfWriter()
+
+    einleitung = io.BytesIO()
+    elements = _laerm_einleitung(heute)
+    if not hashes:
+        elements.append(_keine_daten())
+    seite = 1 + _render_fragment(elements, einleitung)  # erste Seite des nächsten Fragments
+    writer.append(einleitung)
+
+    gerendert = 0
+    for monat, hash_wert in hashes.items():
+        datei = pdf_cache.gueltiges_fragment(manifest, monat, hash_wert, seite)
+        if datei is not None:
+            seiten = manifest[monat]["seiten"]
+        else:
+            gerendert += 1
+            if monat >= offen_ab:
+                # Laufender Monat: ändert sich noch, nicht cachen
+                datei = io.BytesIO()
+                seiten = _monats_fragment(monat, datei, seite)
+            else:
+                datei = pdf_cache.fragment_pfad(monat)
+                os.makedirs(pdf_cache.PDF_CACHE_DIR, exist_ok=True)
+                seiten = _monats_fragment(monat, datei, seite)
+                manifest[monat] = pdf_cache.eintrag(hash_wert, datei, seiten, seite)
+        writer.append(datei)
+        seite += seiten
+
+    if statistik:
+        anhang = io.BytesIO()
+        seite += _render_fragment(_statistik_anhang(sum(LAERM_SPALTENBREITEN))[1:], anhang, seite)
+        writer.append(anhang)
+
+    abschluss = io.BytesIO()
+    _render_fragment(_laerm_footer(), abschluss, seite)
+    writer.append(abschluss)
+
+    pdf_cache.save_manifest(manifest)
+    with open(filename, "wb") as f:
+        writer.write(f)
+    logging.info(
+        f"Lärmprotokoll: {gerendert} von {len(hashes)} Monaten gerendert, "
+        f"{len(writer.pages)} Seiten in {time.perf_counter() - start:.2f}s"
     )
-    elements.append(footer)
+    return filename
 
-    # PDF erstellen
-    doc.build(elements, onFirstPage=on_page, onLaterPages=on_page)
+
+MASSNAHMEN_SPALTENBREITEN = [100, 200, 200]  # Maximale Spaltenbreiten in Pixel
+
+
+@lru_cache(maxsize=4096)
+def umbrechen(text: str, font: str, size: float, width: float) -> Tuple[str, ...]:
+    """simpleSplit mit Cache – gleiche Texte (z. B. "Keine Reaktion.") nur einmal umbrechen."""
+    return tuple(simpleSplit(text, font, size, width))
 
 
 def generiere_massnahmen(self, *args):
     # Daten für Maßnahmen holen
     data = get_all_massnahmen()  # Holt die Daten der Maßnahmen
 
-    # Umwandeln in DataFrame, um die Daten einfacher zu bearbeiten
-    df = pd.DataFrame(data, columns=["Datum", "Maßnahme", "Ergebnis"])
+    # Spalten der Tabelle auswählen und für die Überschriften umbenennen
+    df = data.reindex(columns=["datum", "massnahme", "ergebnis"]).set_axis(
+        ["Datum", "Maßnahme", "Ergebnis"], axis=1
+    )
 
     # Dokument Setup
     filename = (
@@ -152,12 +495,9 @@ def generiere_massnahmen(self, *args):
     title_style = styles["Heading1"]
     body_style = styles["BodyText"]
 
-    logo_path = "utils/image/Designer.png"
-    try:
-        logo = Image(logo_path, width=100, height=100)
+    logo = _logo()
+    if logo is not None:
         elements.append(logo)
-    except FileNotFoundError:
-        print(f"Logo nicht gefunden: {logo_path}")
 
     # Titel und Datum hinzufügen
     title = Paragraph("Maßnahmenprotokoll", title_style)
@@ -177,6 +517,7 @@ def generiere_massnahmen(self, *args):
     elements.append(Spacer(1, 20))
 
     # Tabellendaten vorbereiten
+    col_widths = MASSNAHMEN_SPALTENBREITEN
     if not df.empty:
         # **Datum direkt als String belassen**:
         df["Datum"] = df["Datum"].astype(str)
@@ -184,44 +525,25 @@ def generiere_massnahmen(self, *args):
         # Spaltenüberschriften
         column_headers = [col.capitalize() for col in df.columns]
         table_data = [column_headers]
+        row_heights = [30]  # Höhe für die Kopfzeile
 
-        # Dynamische Zeilenumbrüche hinzufügen
-        max_widths = [100, 200, 200]  # Maximale Spaltenbreiten in Pixel (Anpassung nach Bedarf)
-        row_heights = []  # Liste für dynamische Zeilenhöhen
+        # Jede Zelle genau einmal umbrechen; die Zeilenzahl ergibt direkt die Zeilenhöhe
         for row in df.values.tolist():
             wrapped_row = []
             max_lines = 1  # Zählt die maximalen Zeilen einer Zelle in der Reihe
             for i, cell in enumerate(row):
-                # Text auf die maximale Spaltenbreite umbrechen
-                wrapped_text = "\n".join(simpleSplit(str(cell), "Helvetica", 10, max_widths[i]))
-                wrapped_row.append(wrapped_text)
-                # Anzahl der Zeilen berechnen und Höchstenwert speichern
-                max_lines = max(max_lines, len(wrapped_text.split("\n")))
+                lines = umbrechen(str(cell), "Helvetica", 10, col_widths[i])
+                wrapped_row.append("\n".join(lines))
+                max_lines = max(max_lines, len(lines))
             table_data.append(wrapped_row)
-            # Dynamische Höhe basierend auf der maximalen Anzahl von Zeilen
             row_heights.append(max_lines * 12)  # Multipliziert mit der Zeilenhöhe
 
     else:
         # Keine Daten verfügbar
         table_data = [["Keine Maßnahmen vorhanden"]]
+        col_widths = None
         row_heights = [30]  # Standardhöhe für leere Tabelle
 
-    # Dynamische Zeilenhöhen berechnen
-    row_heights = []
-
-    # Standardhöhe für die Kopfzeile hinzufügen
-    row_heights.append(30)  # Höhe für die Kopfzeile
-
-    col_widths = [100, 200, 200]  # Maximale Spaltenbreiten in Pixel (Anpassung nach Bedarf)
-    # Berechnung der Höhen für Datenzeilen
-    for row in table_data[1:]:  # Überspringe die Kopfzeile
-        max_lines = 1  # Minimale Anzahl von Zeilen
-        for i, cell in enumerate(row):
-            # Text umbrechen, um die maximale Spaltenbreite zu berücksichtigen
-            wrapped_text = "\n".join(simpleSplit(str(cell), "Helvetica", 10, col_widths[i]))
-            max_lines = max(max_lines, len(wrapped_text.split("\n")))
-        row_heights.append(max_lines * 12)  # Zeilenhöhe basierend auf der Anzahl der Zeilen
-
     # Tabelle erstellen
     table = Table(table_data, colWidths=col_widths, rowHeights=row_heights, repeatRows=1)
     table.setStyle(
@@ -261,5 +583,7 @@ def generiere_massnahmen(self, *args):
     try:
         doc.build(elements, onFirstPage=on_page, onLaterPages=on_page)
         print(f"PDF erfolgreich erstellt: {filename}")
+        return filename
     except Exception as e:
         print(f"Fehler beim Erstellen des PDFs: {e}")
+        return None
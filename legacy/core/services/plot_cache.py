@@ -0,0 +1,41 @@
+# core/services/plot_cache.py
+"""
+Manifest der gerenderten Plots (plots/manifest.json).
+Speichert je PNG den Hash der Eingangsdaten, aus denen es gerendert wurde.
+generate_plots rendert nur Plots neu, deren Hash sich geändert hat; die GUI
+liest hier, welche Plots vorhanden sind, statt jede Datei zu prüfen.
+Bewusst ohne pandas/matplotlib, damit die GUI das Modul billig importieren kann.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, List
+
+PLOT_DIR = "plots"
+MANIFEST_FILE = os.path.join(PLOT_DIR, "manifest.json")
+
+
+def load_manifest() -> Dict[str, dict]:
+    try:
+        with open(MANIFEST_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest: Dict[str, dict]) -> None:
+    os.makedirs(PLOT_DIR, exist_ok=True)
+    tmp = MANIFEST_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, MANIFEST_FILE)  # atomar: nie ein halb geschriebenes Manifest
+
+
+def eintrag(hash_wert: str) -> dict:
+    return {"hash": hash_wert, "erstellt": datetime.now().isoformat(timespec="seconds")}
+
+
+def verfuegbare_plots() -> List[str]:
+    """Dateinamen der aktuell gerenderten Plots, sortiert."""
+    return sorted(load_manifest())
@@ -5,8 +5,40 @@ Speichern von Lärmdaten und Maßnahmen.
 """
 
 import logging
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, List, Mapping, Sequence, Tuple, Union
 
-from infrastructure.database.database_setup import insert_laermdaten, insert_massnahmen
+from infrastructure.database.database_setup import (
+    insert_laermdaten,
+    insert_laermdaten_many,
+    insert_massnahmen,
+    insert_massnahmen_many,
+    to_iso_datum,
+)
+
+EVENT_FIELDS = ("datum", "beginn", "ende", "grund", "verursacher", "auswirkung")
+ACTION_FIELDS = ("zeitraum", "beschreibung", "ergebnis")
+
+Row = Union[Sequence, Mapping]
+
+_ZEIT_RE = re.compile(r"^\d{2}:\d{2}$")
+
+
+@dataclass
+class BatchResult:
+    """Ergebnis eines Massenimports."""
+
+    total: int = 0
+    inserted: int = 0
+    invalid: List[Tuple[int, str]] = field(default_factory=list)  # (Zeile, Grund)
+    conflicts: List[Tuple[int, str]] = field(default_factory=list)  # (Zeile, DB-Fehler)
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.inserted / self.seconds if self.seconds > 0 else 0.0
 
 
 def save_event(
@@ -40,3 +72,85 @@ def save_action(zeitraum: str, beschreibung: str, ergebnis: str) -> None:
     except Exception as e:
         logging.error(f"Speichern fehlgeschlagen: {e}")
         raise
+
+
+def _as_tuple(row: Row, fields: Tuple[str, ...]) -> tuple:
+    if isinstance(row, Mapping):
+        return tuple(row.get(f) for f in fields)
+    if len(row) != len(fields):
+        raise ValueError(f"{len(fields)} Felder erwartet, {len(row)} erhalten")
+    return tuple(row)
+
+
+def _validate_event(row: tuple) -> tuple:
+    """Gleiche Regeln wie RootWidget.validate_inputs, liefert die bereinigte Zeile."""
+    datum, beginn, ende, grund, verursacher, auswirkung = row
+    # GUI-Format DD-MM-YYYY oder ISO YYYY-MM-DD (z. B. aus Exporten anderer Tools)
+    try:
+        datum = to_iso_datum(str(datum or ""))
+    except ValueError:
+        raise ValueError("Datum: DD-MM-YYYY oder YYYY-MM-DD") from None
+    if not (_ZEIT_RE.match(str(beginn or "")) and _ZEIT_RE.match(str(ende or ""))):
+        raise ValueError("Zeit: HH:MM")
+    if beginn == ende:
+        raise ValueError("Beginn und Ende sind gleich!")
+    if not all([grund, verursacher]):
+        raise ValueError("Alle Felder ausfüllen!")
+    try:
+        auswirkung = int(auswirkung)
+    except (TypeError, ValueError):
+        raise ValueError("Auswirkung muss Zahl sein!") from None
+    if not 1 <= auswirkung <= 5:
+        raise ValueError("Auswirkung: 1–5")
+    return (datum, beginn, ende, grund, verursacher, auswirkung)
+
+
+def _validate_action(row: tuple) -> tuple:
+    if not all(row):
+        raise ValueError("Bitte fülle alle Felder aus.")
+    return row
+
+
+def _save_many(rows, fields, validate, insert_many, chunk_size: int) -> BatchResult:
+    start = time.perf_counter()
+    result = BatchResult()
+    valid: List[tuple] = []
+    positions: List[int] = []  # Index in valid -> Index in der Eingabe
+    for i, row in enumerate(rows):
+        result.total += 1
+        try:
+            valid.append(validate(_as_tuple(row, fields)))
+            positions.append(i)
+        except ValueError as e:
+            result.invalid.append((i, str(e)))
+
+    if valid:
+        result.inserted, conflicts = insert_many(valid, chunk_size=chunk_size)
+        result.conflicts = [(positions[i], msg) for i, msg in conflicts]
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def save_events(rows: Iterable[Row], chunk_size: int = 500) -> BatchResult:
+    """
+    Massenimport von Lärmdaten (Tupel in EVENT_FIELDS-Reihenfolge oder Dicts).
+    Ungültige Zeilen und UNIQUE-Konflikte werden gemeldet, brechen den Import aber nicht ab.
+    """
+    result = _save_many(rows, EVENT_FIELDS, _validate_event, insert_laermdaten_many, chunk_size)
+    logging.info(
+        f"Lärmdaten-Import: {result.inserted}/{result.total} gespeichert, "
+        f"{len(result.invalid)} ungültig, {len(result.conflicts)} Konflikte, "
+        f"{result.rows_per_second:.0f} Zeilen/s"
+    )
+    return result
+
+
+def save_actions(rows: Iterable[Row], chunk_size: int = 500) -> BatchResult:
+    """Massenimport von Maßnahmen (Tupel in ACTION_FIELDS-Reihenfolge oder Dicts)."""
+    result = _save_many(rows, ACTION_FIELDS, _validate_action, insert_massnahmen_many, chunk_size)
+    logging.info(
+        f"Maßnahmen-Import: {result.inserted}/{result.total} gespeichert, "
+        f"{len(result.invalid)} ungültig, {len(result.conflicts)} Konflikte, "
+        f"{result.rows_per_second:.0f} Zeilen/s"
+    )
+    return result
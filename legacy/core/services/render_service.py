@@ -0,0 +1,162 @@
+# core/services/render_service.py
+"""
+Hintergrund-Rendering der Analyse-Plots.
+Die GUI ruft nur request() auf und bekommt Fortschritt/Ergebnis über Callbacks
+zurück. Mehrere Anfragen kurz hintereinander (z. B. viele Speichervorgänge)
+werden zu einem einzigen Rendering zusammengefasst (Debounce); ein laufendes
+Rendering wird abgebrochen, sobald eine neuere Anfrage kommt.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+ProgressCallback = Callable[[int, int, str], None]
+DoneCallback = Callable[[Optional[Exception]], None]
+
+
+def _direkt(fn: Callable, *args) -> None:
+    fn(*args)
+
+
+class PlotRenderService:
+    """
+    Ein Worker-Thread, eine "Warteschlange" der Tiefe 1: es zählt nur die jeweils
+    neueste Anfrage (generation). Ältere Jobs gelten als veraltet und werden
+    übersprungen bzw. zwischen zwei Plots abgebrochen.
+    """
+
+    def __init__(
+        self,
+        render: Optional[Callable[..., bool]] = None,
+        debounce: float = 0.75,
+        dispatch: Callable[..., None] = _direkt,
+    ):
+        """
+        render:   Funktion(on_progress, abbrechen) -> bool, Standard: generate_plots
+                  (wird erst im Worker-Thread importiert – hält pandas & Co. aus dem App-Start)
+        debounce: Sekunden Ruhe nach der letzten Anfrage, bevor gerendert wird
+        dispatch: reicht Callbacks an den GUI-Thread weiter,
+                  z. B. lambda fn, *a: Clock.schedule_once(lambda dt: fn(*a), 0)
+        """
+        self._render = render  # None: generate_plots, erst im Worker importiert
+        self.debounce = debounce
+        self._dispatch = dispatch
+        self._cond = threading.Condition()
+        self._generation = 0  # Nummer der neuesten Anfrage
+        self._erledigt = 0  # zuletzt abgeschlossene (oder verworfene) Anfrage
+        self._angefragt_um = 0.0
+        self._on_progress: Optional[ProgressCallback] = None
+        self._on_done: Optional[DoneCallback] = None
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    # ---------------------------------------------------------------
+    # API für die GUI
+    # ---------------------------------------------------------------
+    def request(
+        self,
+        on_progress: Optional[ProgressCallback] = None,
+        on_done: Optional[DoneCallback] = None,
+    ) -> int:
+        """Plots neu rendern lassen. Kehrt sofort zurück; liefert die Job-Nummer."""
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError("Render-Service wurde beendet")
+            self._generation += 1
+            self._angefragt_um = time.monotonic()
+            self._on_progress = on_progress
+            self._on_done = on_done
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="plot-render", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+            return self._generation
+
+    def cancel(self) -> None:
+        """Verwirft wartende Anfragen und bricht ein laufendes Rendering ab."""
+        with self._cond:
+            self._generation += 1
+            self._erledigt = self._generation
+            self._cond.notify()
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """
+        Worker beenden (z. B. in App.on_stop). Ein laufender Plot wird noch
+        fertig gezeichnet. False: der Worker lief nach timeout Sekunden noch.
+        """
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+
+    @property
+    def busy(self) -> bool:
+        with self._cond:
+            return self._generation != self._erledigt
+
+    # ---------------------------------------------------------------
+    # Worker
+    # ---------------------------------------------------------------
+    def _naechster_job(self):
+        """Wartet auf eine Anfrage und deren Debounce-Zeit. None = beenden."""
+        with self._cond:
+            while True:
+                if self._stopped:
+                    return None
+                if self._generation == self._erledigt:
+                    self._cond.wait()
+                    continue
+                rest = self._angefragt_um + self.debounce - time.monotonic()
+                if rest > 0:
+                    self._cond.wait(rest)
+                    continue
+                return self._generation, self._on_progress, self._on_done
+
+    def _run(self) -> None:
+        while True:
+            job = self._naechster_job()
+            if job is None:
+                return
+            generation, on_progress, on_done = job
+
+            def veraltet(generation: int = generation) -> bool:
+                return self._stopped or self._generation != generation
+
+            def fortschritt(
+                fertig: int,
+                gesamt: int,
+                name: str,
+                on_progress: Optional[ProgressCallback] = on_progress,
+                veraltet: Callable[[], bool] = veraltet,
+            ) -> None:
+                if on_progress is not None and not veraltet():
+                    self._dispatch(on_progress, fertig, gesamt, name)
+
+            fehler: Optional[Exception] = None
+            start = time.perf_counter()
+            try:
+                if self._render is None:
+                    # Importfehler (z. B. fehlendes pandas) kommen so bei on_done an
+                    from core.services.data_processing import generate_plots
+
+                    self._render = generate_plots
+                vollstaendig = self._render(on_progress=fortschritt, abbrechen=veraltet)
+            except Exception as e:  # Fehler landen beim Aufrufer, Worker läuft weiter
+                logging.error(f"Plot-Rendering fehlgeschlagen: {e}")
+                fehler, vollstaendig = e, True
+
+            with self._cond:
+                if veraltet() or vollstaendig is False:
+                    continue  # neuere Anfrage übernimmt
+                self._erledigt = generation
+            logging.info(f"Plots gerendert in {time.perf_counter() - start:.2f}s")
+            if on_done is not None:
+                self._dispatch(on_done, fehler)
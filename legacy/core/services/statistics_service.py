@@ -2,26 +2,79 @@
 
 """
 Service für alle Berechnungen / Analysen.
-GUI ruft nur diese Funktionen, keine DB-Zugriffe hier.
+GUI ruft nur diese Funktionen. Gerechnet wird in SQLite
+(infrastructure/database/aggregations.py), hier kommen nur kleine Ergebnisobjekte an.
 """
 
+from dataclasses import dataclass
+from typing import List, Optional
 
-def get_top_verursacher(df):
+from infrastructure.database import aggregations
+
+
+@dataclass(frozen=True)
+class Kennzahlen:
+    anzahl: int
+    durchschnitt_dauer: float
+    summe_dauer: float
+    durchschnitt_auswirkung: float
+    max_dauer: float
+    median_dauer: Optional[float]
+    p90_dauer: Optional[float]
+    top_verursacher: Optional[str]
+
+
+@dataclass(frozen=True)
+class Gruppe:
+    schluessel: object
+    anzahl: int
+    summe_dauer: float
+    durchschnitt_dauer: float
+    durchschnitt_auswirkung: float
+
+
+def get_top_verursacher(start=None, end=None):
     """Berechnung des Häufigsten Verursachers"""
-    if df.empty:
-        return None
-    return df["verursacher"].mode()[0]
+    return aggregations.haeufigster_wert("verursacher", start, end)
+
+
+def get_average_auswirkung(start=None, end=None):
+    """Berechnung der durchschnittlichen Auswirkungen (aus den Tagessummen)"""
+    anzahl, _, _, summe_auswirkung = aggregations.summen(start, end)
+    return summe_auswirkung / anzahl if anzahl else 0.0
+
+
+def get_average_duration(start=None, end=None):
+    """Berechnung der durchschnittlichen Dauer der Störungen (aus den Tagessummen)"""
+    _, anzahl_dauer, summe_dauer, _ = aggregations.summen(start, end)
+    return summe_dauer / anzahl_dauer if anzahl_dauer else 0.0
 
 
-def get_average_auswirkung(df):
-    """Berechnung der durchschnittlichen Auswirkungen"""
-    if df.empty:
-        return 0
-    return df["auswirkung"].astype(float).mean()
+def get_kennzahlen(start=None, end=None) -> Kennzahlen:
+    """Alle Kennzahlen für den Zeitraum (ohne start/end: gesamte Historie)"""
+    anzahl, avg_dauer, summe, avg_auswirkung, max_dauer = aggregations.kennzahlen(start, end)
+    median, p90 = aggregations.perzentile_dauer((0.5, 0.9), start, end)
+    return Kennzahlen(
+        anzahl=anzahl,
+        durchschnitt_dauer=avg_dauer,
+        summe_dauer=summe,
+        durchschnitt_auswirkung=avg_auswirkung,
+        max_dauer=max_dauer,
+        median_dauer=median,
+        p90_dauer=p90,
+        top_verursacher=aggregations.haeufigster_wert("verursacher", start, end),
+    )
 
 
-def get_average_duration(df):
-    """Berechnung der durchschnittlichen Dauer der Störungen"""
-    if df.empty:
-        return 0
-    return df["dauer"].mean()
+def get_gruppen(nach: str, start=None, end=None, limit: Optional[int] = None) -> List[Gruppe]:
+    """
+    Gruppierte Kennzahlen, nach: verursacher, grund, tag, monat, wochentag oder stunde.
+    """
+    if nach not in aggregations.GRUPPIERUNGEN:
+        raise ValueError(f"Unbekannte Gruppierung: {nach}")
+    return [
+        Gruppe(schluessel, anzahl, summe or 0.0, avg_dauer or 0.0, avg_auswirkung or 0.0)
+        for schluessel, anzahl, summe, avg_dauer, avg_auswirkung in aggregations.gruppiert(
+            nach, start, end, limit
+        )
+    ]
@@ -1,4 +1,25 @@
 # database/__init__.py
-from .database_setup import create_database, insert_laermdaten, insert_massnahmen
+from .connection import close_all, configure, get_connection, unit_of_work
+from .database_setup import (
+    create_database,
+    get_laermdaten_between,
+    insert_laermdaten,
+    insert_laermdaten_many,
+    insert_massnahmen,
+    insert_massnahmen_many,
+    iter_laermdaten,
+)
 
-__all__ = ["create_database", "insert_laermdaten", "insert_massnahmen"]
+__all__ = [
+    "close_all",
+    "configure",
+    "create_database",
+    "get_laermdaten_between",
+    "get_connection",
+    "insert_laermdaten",
+    "insert_laermdaten_many",
+    "insert_massnahmen",
+    "insert_massnahmen_many",
+    "iter_laermdaten",
+    "unit_of_work",
+]
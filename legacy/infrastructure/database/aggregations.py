@@ -0,0 +1,156 @@
+# infrastructure/database/aggregations.py
+"""
+Aggregat-Abfragen auf laermdaten.
+Rechnet direkt in SQLite (GROUP BY / Window-Funktionen) und liefert nur
+kleine Ergebnisse zurück – der Speicherbedarf wächst nicht mit der Historie.
+"""
+
+from datetime import date
+from typing import List, Optional, Tuple, Union
+
+from .connection import get_connection
+from .database_setup import to_iso_datum
+
+Datum = Union[str, date, None]
+
+# Erlaubte Gruppierungen → SQL-Ausdruck (kein freier Text in die Abfrage)
+GRUPPIERUNGEN = {
+    "verursacher": "verursacher",
+    "grund": "grund",
+    "tag": "datum",
+    "monat": "substr(datum, 1, 7)",
+    "wochentag": "CAST(strftime('%w', datum) AS INTEGER)",  # 0 = Sonntag
+    "stunde": "CAST(substr(beginn, 1, 2) AS INTEGER)",
+}
+
+
+def _where(start: Datum, end: Datum) -> Tuple[str, List[str]]:
+    clauses, params = [], []
+    if start is not None:
+        clauses.append("datum >= ?")
+        params.append(to_iso_datum(start))
+    if end is not None:
+        clauses.append("datum <= ?")
+        params.append(to_iso_datum(end))
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def kennzahlen(start: Datum = None, end: Datum = None) -> Tuple[int, float, float, float, float]:
+    """(Anzahl, Ø Dauer, Summe Dauer, Ø Auswirkung, max. Dauer) in einem Durchlauf."""
+    where, params = _where(start, end)
+    row = (
+        get_connection()
+        .execute(
+            "SELECT COUNT(*), AVG(dauer), TOTAL(dauer), AVG(CAST(auswirkung AS REAL)), MAX(dauer) "
+            f"FROM laermdaten{where}",
+            params,
+        )
+        .fetchone()
+    )
+    return row[0], row[1] or 0.0, row[2] or 0.0, row[3] or 0.0, row[4] or 0.0
+
+
+def haeufigster_wert(spalte: str, start: Datum = None, end: Datum = None) -> Optional[str]:
+    """Modus von verursacher oder grund (bei Gleichstand alphabetisch, wie pandas.mode)."""
+    ausdruck = GRUPPIERUNGEN[spalte]
+    where, params = _where(start, end)
+    row = (
+        get_connection()
+        .execute(
+            f"SELECT {ausdruck} AS wert, COUNT(*) AS n FROM laermdaten{where} "
+            "GROUP BY wert ORDER BY n DESC, wert LIMIT 1",
+            params,
+        )
+        .fetchone()
+    )
+    return row[0] if row else None
+
+
+def perzentile_dauer(
+    anteile: Tuple[float, ...], start: Datum = None, end: Datum = None
+) -> List[Optional[float]]:
+    """Perzentile der Dauer (Nearest-Rank) per ROW_NUMBER() – ohne die Werte zu laden."""
+    where, params = _where(start, end)
+    where += " AND dauer IS NOT NULL" if where else " WHERE dauer IS NOT NULL"
+    ergebnis: List[Optional[float]] = []
+    conn = get_connection()
+    for p in anteile:
+        row = conn.execute(
+            f"""
+            SELECT dauer FROM (
+                SELECT dauer,
+                       ROW_NUMBER() OVER (ORDER BY dauer) AS rn,
+                       COUNT(*) OVER () AS n
+                FROM laermdaten{where}
+            )
+            WHERE rn = MAX(1, CAST(? * n AS INTEGER) + (? * n > CAST(? * n AS INTEGER)))
+            """,
+            [*params, p, p, p],
+        ).fetchone()
+        ergebnis.append(row[0] if row else None)
+    return ergebnis
+
+
+def gruppiert(
+    nach: str, start: Datum = None, end: Datum = None, limit: Optional[int] = None
+) -> List[Tuple]:
+    """(Schlüssel, Anzahl, Summe Dauer, Ø Dauer, Ø Auswirkung) je Gruppe, häufigste zuerst."""
+    ausdruck = GRUPPIERUNGEN[nach]
+    where, params = _where(start, end)
+    sql = (
+        f"SELECT {ausdruck} AS schluessel, COUNT(*) AS n, TOTAL(dauer), AVG(dauer), "
+        f"AVG(CAST(auswirkung AS REAL)) FROM laermdaten{where} "
+        "GROUP BY schluessel ORDER BY n DESC, schluessel"
+    )
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+    return get_connection().execute(sql, params).fetchall()
+
+
+# --- Lesen aus den Summentabellen (rollups.py): wenige Zeilen statt aller Ereignisse ---
+
+
+def summen(start: Datum = None, end: Datum = None) -> Tuple[int, int, float, float]:
+    """(Anzahl, Anzahl mit Dauer, Summe Dauer, Summe Auswirkung) aus laermdaten_tag."""
+    where, params = _where(start, end)
+    row = (
+        get_connection()
+        .execute(
+            "SELECT TOTAL(anzahl), TOTAL(anzahl_dauer), TOTAL(summe_dauer), "
+            "TOTAL(summe_auswirkung) "
+            f"FROM laermdaten_tag{where}",
+            params,
+        )
+        .fetchone()
+    )
+    return int(row[0]), int(row[1]), row[2], row[3]
+
+
+def tageswerte(start: Datum = None, end: Datum = None) -> List[Tuple]:
+    """(datum, Anzahl, Anzahl mit Dauer, Summe Dauer, Summe Auswirkung) je Tag, chronologisch."""
+    where, params = _where(start, end)
+    return (
+        get_connection()
+        .execute(
+            "SELECT datum, anzahl, anzahl_dauer, summe_dauer, summe_auswirkung "
+            f"FROM laermdaten_tag{where} ORDER BY datum",
+            params,
+        )
+        .fetchall()
+    )
+
+
+def wochenstunden() -> List[Tuple]:
+    """
+    (wochentag, stunde, Anzahl, Anzahl mit Dauer, Summe Dauer, Summe Auswirkung),
+    wochentag 0 = Sonntag.
+    """
+    return (
+        get_connection()
+        .execute(
+            "SELECT wochentag, stunde, anzahl, anzahl_dauer, summe_dauer, summe_auswirkung "
+            "FROM laermdaten_wochenstunde ORDER BY wochentag, stunde"
+        )
+        .fetchall()
+    )
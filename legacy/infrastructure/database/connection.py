@@ -0,0 +1,173 @@
+# infrastructure/database/connection.py
+"""
+Verbindungsverwaltung für SQLite.
+Statt bei jedem Aufruf connect/commit/close gibt es eine langlebige Verbindung
+pro Thread (WAL-Modus, einstellbare Pragmas) und eine Unit of Work als
+Context-Manager, die mehrere Statements in einer Transaktion bündelt.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Iterator, List, Optional
+
+DB_FILE = "database/protokoll.db"
+
+
+@dataclass(frozen=True)
+class PragmaSettings:
+    """Pragmas, die auf jede neue Verbindung angewendet werden."""
+
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"  # bei WAL sicher genug, spart fsync pro Commit
+    cache_size: int = -16000  # negativ = KiB, hier ~16 MB Page-Cache
+    mmap_size: int = 64 * 1024 * 1024
+    busy_timeout: int = 5000  # ms warten, falls ein anderer Thread schreibt
+    foreign_keys: bool = True
+
+
+class ConnectionManager:
+    """
+    Hält eine Verbindung pro Thread offen und gibt sie wieder aus.
+    Verbindungen werden erst beim ersten Zugriff geöffnet.
+    """
+
+    def __init__(self, db_file: str = DB_FILE, pragmas: Optional[PragmaSettings] = None):
+        self.db_file = db_file
+        self.pragmas = pragmas or PragmaSettings()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+
+    def _open(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.db_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # isolation_level=None: Transaktionen steuern wir selbst über unit_of_work()
+        conn = sqlite3.connect(self.db_file, isolation_level=None, check_same_thread=False)
+        p = self.pragmas
+        conn.execute(f"PRAGMA journal_mode = {p.journal_mode}")
+        conn.execute(f"PRAGMA synchronous = {p.synchronous}")
+        conn.execute(f"PRAGMA cache_size = {int(p.cache_size)}")
+        conn.execute(f"PRAGMA mmap_size = {int(p.mmap_size)}")
+        conn.execute(f"PRAGMA busy_timeout = {int(p.busy_timeout)}")
+        conn.execute(f"PRAGMA foreign_keys = {'ON' if p.foreign_keys else 'OFF'}")
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """Liefert die Verbindung des aktuellen Threads (öffnet sie bei Bedarf)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            self._local.depth = 0
+        return conn
+
+    @contextmanager
+    def unit_of_work(self) -> Iterator[sqlite3.Connection]:
+        """
+        Bündelt alle Statements im Block in einer Transaktion.
+        Commit am Ende, Rollback bei Fehler – auch wenn erst das COMMIT
+        scheitert (SQLITE_BUSY, verzögerte Fremdschlüssel), sonst bliebe die
+        Transaktion offen und jedes weitere BEGIN dieses Threads schlüge fehl.
+        Verschachtelte Aufrufe laufen in der äußeren Transaktion mit (nur der
+        äußerste Block committet).
+
+        BEGIN IMMEDIATE holt die Schreibsperre gleich zu Beginn: bei einem
+        verzögerten BEGIN könnte ein Block, der erst liest und dann schreibt,
+        neben einem lesenden Worker SQLITE_BUSY_SNAPSHOT bekommen – das
+        wiederholt busy_timeout nicht. Reine Lesezugriffe brauchen keine
+        Unit of Work (get_connection()).
+        """
+        conn = self.connection()
+        depth = self._local.depth
+        if depth == 0:
+            conn.execute("BEGIN IMMEDIATE")
+        self._local.depth = depth + 1
+        try:
+            yield conn
+        except BaseException:
+            self._local.depth = depth
+            if depth == 0:
+                _rollback(conn)
+            raise
+        self._local.depth = depth
+        if depth == 0:
+            try:
+                conn.execute("COMMIT")
+            except BaseException:
+                _rollback(conn)
+                raise
+
+    def close(self) -> None:
+        """Schließt die Verbindung des aktuellen Threads."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        with self._lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        conn.close()
+        self._local.conn = None
+
+    def close_all(self) -> None:
+        """Schließt alle offenen Verbindungen (z. B. beim Beenden der App)."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+
+def _rollback(conn: sqlite3.Connection) -> None:
+    # SQLite kann die Transaktion bei manchen Fehlern schon selbst beendet haben
+    if conn.in_transaction:
+        conn.execute("ROLLBACK")
+
+
+_manager = ConnectionManager()
+
+
+def get_manager() -> ConnectionManager:
+    return _manager
+
+
+def configure(db_file: Optional[str] = None, **pragmas) -> ConnectionManager:
+    """
+    Stellt Datei und/oder Pragmas um, z. B. configure(synchronous="OFF") für
+    einen einmaligen Import. Bestehende Verbindungen werden geschlossen.
+    """
+    _manager.close_all()
+    if db_file is not None:
+        _manager.db_file = db_file
+    if pragmas:
+        _manager.pragmas = replace(_manager.pragmas, **pragmas)
+    return _manager
+
+
+def get_connection() -> sqlite3.Connection:
+    return _manager.connection()
+
+
+def unit_of_work():
+    return _manager.unit_of_work()
+
+
+def close_all() -> None:
+    _manager.close_all()
+
+
+def snapshot(ziel: str) -> None:
+    """
+    Konsistente Kopie der Datenbank nach ziel (SQLite-Backup-API). Andere Prozesse
+    können dann von einem festen Stand lesen, während die App weiterschreibt.
+    """
+    dst = sqlite3.connect(ziel)
+    try:
+        get_connection().backup(dst)
+    finally:
+        dst.close()
@@ -1,118 +1,197 @@
-import os
 import sqlite3
+from datetime import date, datetime
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
 
-DB_FILE = "database/protokoll.db"
+from .connection import DB_FILE, get_connection, unit_of_work  # noqa: F401
+from .migrations import MINUTEN_SQL, migrate
 
-
-def copy_data() -> None:
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        INSERT INTO laermdaten (datum, beginn, ende, grund, verursacher, auswirkung)
-        SELECT datum, startzeit, endzeit, dauer, grund, nachbar, auswirkung 
-        FROM laermdaten_old
-    """
-    )
-    conn.commit()
-    cursor.execute("DROP TABLE laermdaten_old")
-    conn.close()
-    print("Migration abgeschlossen!")
+INSERT_LAERMDATEN = (
+    "INSERT INTO laermdaten (datum, beginn, ende, dauer, grund, verursacher, auswirkung) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+INSERT_MASSNAHMEN = "INSERT INTO massnahmen (datum, massnahme, ergebnis) VALUES (?, ?, ?)"
 
 
 def create_database() -> None:
-    os.makedirs(os.path.dirname(DB_FILE), exist_ok=True)
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-
-    # Migration prüfen
-    c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='laermdaten_old'")
-    if c.fetchone():
-        print("Migration wird durchgeführt...")
-        copy_data()
-
-    # Tabellen
-    c.execute(
+    with unit_of_work() as conn:
+        c = conn.cursor()
+        # Tabellen
+        c.execute(
+            """
+            CREATE TABLE IF NOT EXISTS laermdaten (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                datum TEXT NOT NULL,
+                beginn TEXT NOT NULL,
+                ende TEXT NOT NULL,
+                dauer REAL,
+                grund TEXT NOT NULL,
+                verursacher TEXT NOT NULL,
+                auswirkung INTEGER NOT NULL CHECK(auswirkung BETWEEN 1 AND 5),
+                UNIQUE(datum, beginn, verursacher)
+            )
         """
-        CREATE TABLE IF NOT EXISTS laermdaten (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            datum TEXT NOT NULL,
-            beginn TEXT NOT NULL,
-            ende TEXT NOT NULL,
-            dauer REAL,
-            grund TEXT NOT NULL,
-            verursacher TEXT NOT NULL,
-            auswirkung INTEGER NOT NULL CHECK(auswirkung BETWEEN 1 AND 5),
-            UNIQUE(datum, beginn, verursacher)
         )
-    """
-    )
 
-    c.execute(
+        c.execute(
+            """
+            CREATE TABLE IF NOT EXISTS massnahmen (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                datum TEXT NOT NULL,
+                massnahme TEXT NOT NULL,
+                ergebnis TEXT
+            )
         """
-        CREATE TABLE IF NOT EXISTS massnahmen (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            datum TEXT NOT NULL,
-            massnahme TEXT NOT NULL,
-            ergebnis TEXT
         )
-    """
-    )
 
-    # Trigger
-    c.execute(
-        """
-        CREATE TRIGGER IF NOT EXISTS calc_dauer AFTER INSERT ON laermdaten
-        BEGIN
-            UPDATE laermdaten 
-            SET dauer = (julianday('2000-01-01 ' || NEW.ende) - julianday('2000-01-01 ' || NEW.beginn)) * 1440
-            WHERE id = NEW.id;
-        END
-    """
-    )
+    # Bestehende Datenbanken nachziehen – außerhalb der Transaktion oben, damit
+    # große Kopien blockweise committen und nach Abbruch fortsetzen können
+    migrate()
 
-    conn.commit()
-    conn.close()
     print("Datenbank bereit!")
 
 
+def to_iso_datum(datum: Union[str, date]) -> str:
+    """
+    Datum für die Speicherung: YYYY-MM-DD (sortierbar, indexfähig).
+    Akzeptiert date/datetime, ISO-Text und das GUI-Format DD-MM-YYYY.
+    """
+    if isinstance(datum, datetime):
+        return datum.date().isoformat()
+    if isinstance(datum, date):
+        return datum.isoformat()
+    try:
+        return datetime.strptime(datum, "%d-%m-%Y").date().isoformat()
+    except ValueError:
+        return date.fromisoformat(datum).isoformat()
+
+
+def berechne_dauer(beginn: str, ende: str) -> float:
+    """
+    Dauer in Minuten aus HH:MM. Liegt ende vor beginn, geht die Störung über
+    Mitternacht (z. B. 23:30–00:15 → 45 Minuten).
+    """
+    h1, m1 = beginn.split(":")[:2]
+    h2, m2 = ende.split(":")[:2]
+    minuten = (int(h2) * 60 + int(m2)) - (int(h1) * 60 + int(m1))
+    return float(minuten + 1440 if minuten < 0 else minuten)
+
+
 def insert_laermdaten(
     datum: str, beginn: str, ende: str, grund: str, verursacher: str, auswirkung: int
 ) -> None:
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute(
-        "INSERT INTO laermdaten (datum, beginn, ende, grund, verursacher, auswirkung) VALUES (?, ?, ?, ?, ?, ?)",
-        (datum, beginn, ende, grund, verursacher, auswirkung),
-    )
-    conn.commit()
-    conn.close()
+    datum = to_iso_datum(datum)
+    dauer = berechne_dauer(beginn, ende)
+    with unit_of_work() as conn:
+        conn.execute(
+            INSERT_LAERMDATEN, (datum, beginn, ende, dauer, grund, verursacher, auswirkung)
+        )
 
 
 def insert_massnahmen(datum: str, massnahme: str, ergebnis: str) -> None:
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute(
-        "INSERT INTO massnahmen (datum, massnahme, ergebnis) VALUES (?, ?, ?)",
-        (datum, massnahme, ergebnis),
-    )
-    conn.commit()
-    conn.close()
+    with unit_of_work() as conn:
+        conn.execute(INSERT_MASSNAHMEN, (datum, massnahme, ergebnis))
+
+
+def _insert_many(
+    sql: str, rows: Sequence[Sequence], chunk_size: int
+) -> Tuple[int, List[Tuple[int, str]]]:
+    """
+    Fügt rows blockweise per executemany in EINER Transaktion ein.
+    Scheitert ein Block an einem Constraint (z. B. UNIQUE), wird nur dieser Block
+    per Savepoint zurückgerollt und zeilenweise wiederholt – so landen alle
+    gültigen Zeilen in der DB und die Konflikte werden einzeln gemeldet.
+    Rückgabe: (Anzahl eingefügt, [(Zeilenindex, Fehlermeldung), ...])
+    """
+    inserted = 0
+    conflicts: List[Tuple[int, str]] = []
+    with unit_of_work() as conn:
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start : start + chunk_size]
+            conn.execute("SAVEPOINT batch_chunk")
+            try:
+                conn.executemany(sql, chunk)
+                conn.execute("RELEASE batch_chunk")
+                inserted += len(chunk)
+                continue
+            except sqlite3.IntegrityError:
+                conn.execute("ROLLBACK TO batch_chunk")
+                conn.execute("RELEASE batch_chunk")
+            for offset, row in enumerate(chunk):
+                try:
+                    conn.execute(sql, row)
+                    inserted += 1
+                except sqlite3.IntegrityError as e:
+                    conflicts.append((start + offset, str(e)))
+    return inserted, conflicts
+
+
+def insert_laermdaten_many(
+    rows: Sequence[Sequence], chunk_size: int = 500
+) -> Tuple[int, List[Tuple[int, str]]]:
+    """rows: (datum, beginn, ende, grund, verursacher, auswirkung)"""
+    rows = [(to_iso_datum(d), b, e, berechne_dauer(b, e), g, v, a) for d, b, e, g, v, a in rows]
+    return _insert_many(INSERT_LAERMDATEN, rows, chunk_size)
+
+
+def insert_massnahmen_many(
+    rows: Sequence[Sequence], chunk_size: int = 500
+) -> Tuple[int, List[Tuple[int, str]]]:
+    """rows: (datum, massnahme, ergebnis)"""
+    return _insert_many(INSERT_MASSNAHMEN, rows, chunk_size)
+
+
+# Chronologisch wie iter_laermdaten: nach Minuten, als Text stünde '9:47' hinter '10:00'
+CHRONOLOGISCH = f"ORDER BY datum, {MINUTEN_SQL.format(t='beginn')}, id"
 
 
 def get_all_laermdaten():
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute("SELECT * FROM laermdaten ORDER BY datum, beginn")
-    data = c.fetchall()
-    conn.close()
-    return data
+    return get_connection().execute(f"SELECT * FROM laermdaten {CHRONOLOGISCH}").fetchall()
+
+
+def get_laermdaten_between(start: Union[str, date], end: Union[str, date]):
+    """Alle Lärmdaten mit start <= datum <= end (inklusive), nutzt idx_laermdaten_datum_beginn."""
+    return (
+        get_connection()
+        .execute(
+            f"SELECT * FROM laermdaten WHERE datum BETWEEN ? AND ? {CHRONOLOGISCH}",
+            (to_iso_datum(start), to_iso_datum(end)),
+        )
+        .fetchall()
+    )
+
+
+def iter_laermdaten(
+    start: Optional[Union[str, date]] = None,
+    end: Optional[Union[str, date]] = None,
+    chunk_size: int = 1000,
+) -> Iterator[Tuple]:
+    """
+    Lärmdaten (datum, beginn, ende, dauer, grund, verursacher, auswirkung) chronologisch
+    als Generator. Liest per fetchmany in Blöcken – der Speicherbedarf bleibt konstant,
+    egal wie lang die Historie ist.
+    """
+    clauses, params = [], []
+    if start is not None:
+        clauses.append("datum >= ?")
+        params.append(to_iso_datum(start))
+    if end is not None:
+        clauses.append("datum <= ?")
+        params.append(to_iso_datum(end))
+    where = " WHERE " + " AND ".join(clauses) if clauses else ""
+    cursor = get_connection().execute(
+        "SELECT datum, beginn, ende, dauer, grund, verursacher, auswirkung "
+        f"FROM laermdaten{where} {CHRONOLOGISCH}",
+        params,
+    )
+    try:
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield from rows
+    finally:
+        cursor.close()
 
 
 def get_all_massnahmen():
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute("SELECT * FROM massnahmen ORDER BY datum")
-    data = c.fetchall()
-    conn.close()
-    return data
+    return get_connection().execute("SELECT * FROM massnahmen ORDER BY datum").fetchall()
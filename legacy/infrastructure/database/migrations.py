@@ -0,0 +1,578 @@
+# infrastructure/database/migrations.py
+"""
+Versionierte Schema-Migrationen.
+Jeder Schritt hat eine Nummer; angewendete Schritte stehen in schema_version
+und laufen nie wieder. migrate() (aus create_database()) holt fehlende
+Schritte der Reihe nach nach, jeden in einer eigenen Transaktion.
+
+Große Kopien (kopiere_in_bloecken) laufen blockweise per INSERT ... SELECT;
+jeder Block wird zusammen mit seinem Fortschritt (schema_fortschritt)
+committet. Bricht ein Lauf ab, macht der nächste beim letzten Block weiter.
+
+Die Schritte 1–6 sind idempotent (1–3, 5 und 6 stammen aus der Zeit vor
+schema_version): auf älteren Datenbanken laufen sie einfach einmal erneut.
+"""
+
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+
+from . import rollups, volltext
+from .connection import get_connection, unit_of_work
+
+# Dauer in Minuten aus H:MM/HH:MM-Texten; ende < beginn heißt: über Mitternacht.
+# Text ohne ':' (z. B. 'kurz') ergibt NULL statt stillschweigend 0 Minuten
+MINUTEN_SQL = (
+    "(CASE WHEN instr({t}, ':') > 0 THEN"
+    " CAST(substr({t}, 1, instr({t}, ':') - 1) AS INTEGER) * 60"
+    " + CAST(substr({t}, instr({t}, ':') + 1, 2) AS INTEGER) END)"
+)
+DAUER_SQL = (
+    f"({MINUTEN_SQL.format(t='ende')} - {MINUTEN_SQL.format(t='beginn')}"
+    f" + CASE WHEN {MINUTEN_SQL.format(t='ende')} < {MINUTEN_SQL.format(t='beginn')}"
+    " THEN 1440 ELSE 0 END)"
+)
+
+
+# Zeilen je Block bei kopiere_in_bloecken (bezogen auf die rowid der Quelle)
+BLOCK_GROESSE = 20_000
+
+
+# ---------------------------------------------------------------
+# Fortschritt und Blockkopie
+# ---------------------------------------------------------------
+def _tabellen(conn: sqlite3.Connection) -> set:
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def kopiere_in_bloecken(
+    schluessel: str, quelle: str, sql: Union[str, Sequence[str]], block: Optional[int] = None
+) -> int:
+    """
+    Führt sql (ein INSERT ... SELECT ... FROM quelle ... mit der Bedingung
+    "quelle.rowid > :von AND quelle.rowid <= :bis", oder mehrere davon der Reihe
+    nach) für alle rowid-Bereiche der Quelle aus. Jeder Block ist eine
+    Transaktion samt Fortschritt unter schluessel; ein erneuter Aufruf setzt
+    nach dem letzten fertigen Block fort. Muss außerhalb einer Transaktion
+    aufgerufen werden. Rückgabe: von der letzten Anweisung eingefügte Zeilen.
+    """
+    anweisungen = [sql] if isinstance(sql, str) else list(sql)
+    block = block or BLOCK_GROESSE
+    with unit_of_work() as conn:
+        row = conn.execute(
+            "SELECT letzte_id FROM schema_fortschritt WHERE schluessel = ?", (schluessel,)
+        ).fetchone()
+        von = row[0] if row else 0
+        bis_max = conn.execute(f"SELECT MAX(rowid) FROM {quelle}").fetchone()[0] or 0
+    if von:
+        print(f"  {schluessel}: setze nach rowid {von} fort")
+    eingefuegt = 0
+    while von < bis_max:
+        bis = min(von + block, bis_max)
+        with unit_of_work() as conn:
+            for anweisung in anweisungen:
+                anzahl = conn.execute(anweisung, {"von": von, "bis": bis}).rowcount
+            eingefuegt += anzahl
+            conn.execute(
+                "INSERT OR REPLACE INTO schema_fortschritt (schluessel, letzte_id) VALUES (?, ?)",
+                (schluessel, bis),
+            )
+        von = bis
+    return eingefuegt
+
+
+# ---------------------------------------------------------------
+# Schritte
+# ---------------------------------------------------------------
+# Spalten der alten Tabelle laermdaten_old → laermdaten (je nach Alter der DB)
+ALTE_SPALTEN = {
+    "datum": ("datum",),
+    "beginn": ("startzeit", "beginn"),
+    "ende": ("endzeit", "ende"),
+    "grund": ("grund",),
+    "verursacher": ("nachbar", "verursacher"),
+    "auswirkung": ("auswirkung",),
+}
+
+
+def migrate_laermdaten_old(conn: sqlite3.Connection) -> None:
+    """
+    Übernimmt eine umbenannte Alt-Tabelle laermdaten_old nach laermdaten und
+    löscht sie danach (ersetzt database_setup.copy_data/scripts/update_backup.py).
+    dauer bleibt leer und wird von migrate_dauer berechnet; Dubletten
+    (gleiches datum, beginn, verursacher) werden übersprungen.
+    """
+    if "laermdaten_old" not in _tabellen(conn):
+        return
+    vorhanden = {row[1] for row in conn.execute("PRAGMA table_info(laermdaten_old)")}
+    quellen = []
+    for ziel, kandidaten in ALTE_SPALTEN.items():
+        spalte = next((k for k in kandidaten if k in vorhanden), None)
+        if spalte is None:
+            raise RuntimeError(
+                f"laermdaten_old: keine Spalte für {ziel} ({', '.join(kandidaten)})"
+            )
+        quellen.append(spalte)
+    kopiert = kopiere_in_bloecken(
+        "laermdaten_old",
+        "laermdaten_old",
+        f"INSERT OR IGNORE INTO laermdaten ({', '.join(ALTE_SPALTEN)}) "
+        f"SELECT {', '.join(quellen)} FROM laermdaten_old "
+        "WHERE rowid > :von AND rowid <= :bis ORDER BY rowid",
+    )
+    with unit_of_work() as conn:
+        conn.execute("DROP TABLE laermdaten_old")
+    print(f"  laermdaten_old: {kopiert} Zeilen übernommen")
+
+
+def migrate_dauer(conn: sqlite3.Connection) -> None:
+    """
+    Ersetzt den Trigger calc_dauer (zweites UPDATE pro INSERT) durch eine beim
+    Einfügen berechnete Spalte und trägt fehlende bzw. negative Werte nach
+    (der alte Trigger lieferte bei Störungen über Mitternacht negative Dauern).
+    """
+    conn.execute("DROP TRIGGER IF EXISTS calc_dauer")
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(laermdaten)")}
+    if "dauer" not in columns:
+        conn.execute("ALTER TABLE laermdaten ADD COLUMN dauer REAL")
+    conn.execute(f"UPDATE laermdaten SET dauer = {DAUER_SQL} WHERE dauer IS NULL OR dauer < 0")
+
+
+def migrate_iso_datum(conn: sqlite3.Connection) -> None:
+    """
+    Schreibt laermdaten.datum von DD-MM-YYYY auf ISO (YYYY-MM-DD) um, damit
+    ORDER BY datum chronologisch sortiert und Zeiträume per Index gefunden werden.
+    Legt außerdem die Indizes für Zeitraum- und Gruppenabfragen an.
+    """
+    conn.execute(
+        """
+        UPDATE laermdaten
+        SET datum = substr(datum, 7, 4) || '-' || substr(datum, 4, 2) || '-' || substr(datum, 1, 2)
+        WHERE datum GLOB '[0-9][0-9]-[0-9][0-9]-[0-9][0-9][0-9][0-9]'
+    """
+    )
+    # (datum, beginn) ersetzt den alten Einzelindex idx_datum
+    conn.execute("DROP INDEX IF EXISTS idx_datum")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_laermdaten_datum_beginn ON laermdaten (datum, beginn)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_laermdaten_grund ON laermdaten (grund)")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_laermdaten_verursacher ON laermdaten (verursacher)"
+    )
+
+
+# Spalten, in denen sich Dubletten gleichen müssen, um gelöscht zu werden
+LAERMDATEN_SPALTEN = "datum, beginn, ende, dauer, grund, verursacher, auswirkung"
+EINDEUTIG = "datum, beginn, verursacher"
+
+
+def widerspruechliche_dubletten(conn: sqlite3.Connection) -> List[Tuple[str, str, str, str]]:
+    """
+    Gruppen mit gleichem (datum, beginn, verursacher), deren Zeilen sich in
+    anderen Spalten unterscheiden: (datum, beginn, verursacher, "id,id,...").
+    """
+    return conn.execute(
+        f"""
+        SELECT {EINDEUTIG}, group_concat(id, ',') FROM laermdaten
+        GROUP BY {EINDEUTIG} HAVING COUNT(*) > 1 ORDER BY {EINDEUTIG}
+    """
+    ).fetchall()
+
+
+def migrate_eindeutig(conn: sqlite3.Connection) -> None:
+    """
+    Erzwingt UNIQUE(datum, beginn, verursacher) auch in Datenbanken, deren
+    laermdaten älter als die Bedingung in create_database() ist – erst dann
+    meldet der Import (insert_laermdaten_many) Dubletten als Konflikte.
+    Gelöscht werden nur Zeilen, die in allen Spalten übereinstimmen (die zuerst
+    erfasste bleibt). Unterscheiden sich Zeilen mit gleichem Schlüssel sonst,
+    sind es womöglich verschiedene Vorfälle: sie bleiben stehen, werden gemeldet,
+    und der Index entsteht erst, wenn sie von Hand bereinigt sind (migrate()
+    prüft das bei jedem Start erneut).
+    Läuft nach migrate_iso_datum: erst danach sind 01-02-2024 und 2024-02-01
+    als dasselbe Datum erkennbar.
+    """
+    geloescht = conn.execute(
+        f"""
+        DELETE FROM laermdaten
+        WHERE id NOT IN (SELECT MIN(id) FROM laermdaten GROUP BY {LAERMDATEN_SPALTEN})
+    """
+    ).rowcount
+    if geloescht:
+        print(f"  laermdaten: {geloescht} Dubletten entfernt")
+    konflikte = widerspruechliche_dubletten(conn)
+    if konflikte:
+        print(
+            f"  laermdaten: {len(konflikte)} Einträge mit gleichem Datum, Beginn und "
+            "Verursacher, aber unterschiedlichen Angaben – bitte prüfen "
+            "(UNIQUE-Index folgt danach):"
+        )
+        for datum, beginn, verursacher, ids in konflikte:
+            print(f"    {datum} {beginn} {verursacher}: ids {ids}")
+        return
+    conn.execute(
+        f"CREATE UNIQUE INDEX IF NOT EXISTS idx_laermdaten_eindeutig ON laermdaten ({EINDEUTIG})"
+    )
+
+
+def migrate_aenderungsprotokoll(conn: sqlite3.Connection) -> None:
+    """
+    Protokolliert UPDATE/DELETE auf laermdaten, damit Caches nur geänderte Zeilen
+    nachladen müssen. INSERTs brauchen keinen Trigger: neue Zeilen erkennt man an
+    id > letzte bekannte id (AUTOINCREMENT vergibt keine ids doppelt).
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS laermdaten_aenderungen (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            laermdaten_id INTEGER NOT NULL
+        )
+    """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS laermdaten_update_log AFTER UPDATE ON laermdaten
+        BEGIN
+            INSERT INTO laermdaten_aenderungen (laermdaten_id) VALUES (NEW.id);
+        END
+    """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS laermdaten_delete_log AFTER DELETE ON laermdaten
+        BEGIN
+            INSERT INTO laermdaten_aenderungen (laermdaten_id) VALUES (OLD.id);
+        END
+    """
+    )
+
+
+def migrate_rollups(conn: sqlite3.Connection) -> None:
+    """Summentabellen je Tag / Wochenstunde samt Triggern (siehe rollups.py)."""
+    rollups.erstelle(conn)
+
+
+# Wie SQLModel die Tabelle für domain/models.py:Stoerungseintrag anlegt (typ = Enum-Name);
+# tests/test_migrations.py vergleicht beide Schemata
+STOERUNGSEINTRAG_SQL = """
+CREATE TABLE IF NOT EXISTS stoerungseintrag (
+    id INTEGER NOT NULL,
+    datum DATETIME NOT NULL,
+    beginn DATETIME,
+    ende DATETIME,
+    typ VARCHAR(13) NOT NULL,
+    beschreibung VARCHAR(2000) NOT NULL,
+    auswirkung INTEGER,
+    foto_pfad VARCHAR(500),
+    video_pfad VARCHAR(500),
+    erstellt_von VARCHAR(100) NOT NULL,
+    zeuge VARCHAR(100),
+    PRIMARY KEY (id)
+)
+"""
+
+# Welche Altzeile welchen Störungseintrag erzeugt hat. eintrag_id NULL: der
+# Eintrag wurde im neuen Modell gelöscht (die Altzeile wird nicht neu gespiegelt)
+HERKUNFT_SQL = """
+CREATE TABLE IF NOT EXISTS stoerungseintrag_herkunft (
+    quelle TEXT NOT NULL,
+    quelle_id INTEGER NOT NULL,
+    eintrag_id INTEGER UNIQUE,
+    PRIMARY KEY (quelle, quelle_id)
+)
+"""
+
+# Zeitpunkt im Speicherformat von SQLAlchemy ("YYYY-MM-DD HH:MM:SS.ffffff"),
+# {datum} ISO-Datum, {minuten} Minuten ab Mitternacht
+ZEITPUNKT_SQL = (
+    "strftime('%Y-%m-%d %H:%M:%S', {datum}, '+' || ({minuten}) || ' minutes') || '.000000'"
+)
+_BEGINN = ZEITPUNKT_SQL.format(datum="datum", minuten=MINUTEN_SQL.format(t="beginn"))
+_ENDE = ZEITPUNKT_SQL.format(
+    datum="datum", minuten=f"{MINUTEN_SQL.format(t='beginn')} + {DAUER_SQL}"
+)
+
+# Altzeile → Spalten von stoerungseintrag, als Sichten in reinem SQL: dieselbe
+# Abbildung nutzen die Blockkopie und die Abgleich-Trigger (die ohne Python-
+# Funktionen auskommen müssen – auch andere Programme schreiben in die DB).
+# Nicht lesbare Zeiten/Daten gehen nicht verloren: der Eintrag bekommt ein
+# Ersatzdatum, der Originaltext steht in der Beschreibung.
+LAERMDATEN_ALS_EINTRAG = f"""
+CREATE VIEW IF NOT EXISTS laermdaten_als_eintrag AS
+SELECT id AS quelle_id,
+       COALESCE(beginn_zeit, date(datum) || ' 00:00:00.000000',
+                date('now') || ' 00:00:00.000000') AS datum,
+       beginn_zeit AS beginn, ende_zeit AS ende, 'LAERM' AS typ,
+       substr(
+           COALESCE(grund, '') || ' – Verursacher: ' || COALESCE(verursacher, '')
+           || CASE WHEN ende_zeit IS NULL
+                   THEN char(10) || 'Datum/Zeit (Original): ' || COALESCE(datum, '') || ' '
+                        || COALESCE(beginn, '') || '–' || COALESCE(ende, '')
+                   ELSE '' END,
+           1, 2000
+       ) AS beschreibung,
+       CAST(auswirkung AS INTEGER) AS auswirkung, 'Mieter' AS erstellt_von
+FROM (SELECT *, {_BEGINN} AS beginn_zeit, {_ENDE} AS ende_zeit FROM laermdaten)
+"""
+
+# massnahmen.datum ist Freitext, meist D.M.YYYY aus der GUI → ISO-Datum;
+# NULL bei Angaben ohne genaues Datum (z. B. "Mitte Juli")
+MASSNAHMEN_TAG = """
+CREATE VIEW IF NOT EXISTS massnahmen_tag AS
+SELECT id, CASE WHEN date(t) IS t THEN t WHEN date(iso) IS iso THEN iso END AS tag
+FROM (
+    SELECT id, t,
+           CASE WHEN (d GLOB '[0-9]' OR d GLOB '[0-9][0-9]')
+                 AND (m GLOB '[0-9]' OR m GLOB '[0-9][0-9]')
+                 AND j GLOB '[0-9][0-9][0-9][0-9]'
+                THEN j || '-' || substr('0' || m, -2) || '-' || substr('0' || d, -2) END AS iso
+    FROM (
+        SELECT id, t, substr(p, 1, instr(p, '.') - 1) AS d,
+               substr(r, 1, instr(r, '.') - 1) AS m, substr(r, instr(r, '.') + 1) AS j
+        FROM (
+            SELECT id, t, p, substr(p, instr(p, '.') + 1) AS r
+            FROM (SELECT id, trim(datum) AS t, replace(trim(datum), '-', '.') AS p FROM massnahmen)
+        )
+    )
+)
+"""
+
+# Maßnahmen ohne genaues Datum: Datum der nächsten vorher erfassten datierten
+# Maßnahme (die GUI erfasst der Reihe nach), sonst der nächsten danach
+MASSNAHMEN_ALS_EINTRAG = """
+CREATE VIEW IF NOT EXISTS massnahmen_als_eintrag AS
+SELECT m.id AS quelle_id,
+       COALESCE(
+           t.tag,
+           (SELECT v.tag FROM massnahmen_tag v
+            WHERE v.id < m.id AND v.tag IS NOT NULL ORDER BY v.id DESC LIMIT 1),
+           (SELECT v.tag FROM massnahmen_tag v
+            WHERE v.id > m.id AND v.tag IS NOT NULL ORDER BY v.id LIMIT 1),
+           date('now')
+       ) || ' 00:00:00.000000' AS datum,
+       NULL AS beginn, NULL AS ende, 'SONSTIGES' AS typ,
+       substr(
+           'Maßnahme: ' || COALESCE(m.massnahme, '')
+           || COALESCE(char(10) || 'Ergebnis: ' || m.ergebnis, '')
+           || CASE WHEN t.tag IS NULL
+                   THEN char(10) || 'Datum (Original): ' || COALESCE(m.datum, '') ELSE '' END,
+           1, 2000
+       ) AS beschreibung,
+       NULL AS auswirkung, 'Mieter' AS erstellt_von
+FROM massnahmen m JOIN massnahmen_tag t ON t.id = m.id
+"""
+
+# Quelle → Sicht mit der Abbildung auf stoerungseintrag
+ABGLEICH = {
+    "laermdaten": "laermdaten_als_eintrag",
+    "massnahmen": "massnahmen_als_eintrag",
+}
+_SPALTEN = "datum, beginn, ende, typ, beschreibung, auswirkung"
+
+
+def _abgleich_trigger(quelle: str, sicht: str) -> List[str]:
+    """Trigger, die Änderungen an der Alt-Tabelle in stoerungseintrag nachziehen."""
+    eintrag = (
+        f"(SELECT eintrag_id FROM stoerungseintrag_herkunft "
+        f"WHERE quelle = '{quelle}' AND quelle_id = {{zeile}}.id)"
+    )
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {quelle}_abgleich_insert AFTER INSERT ON {quelle}
+        BEGIN
+            INSERT INTO stoerungseintrag ({_SPALTEN}, erstellt_von)
+            SELECT {_SPALTEN}, erstellt_von FROM {sicht} WHERE quelle_id = NEW.id;
+            INSERT INTO stoerungseintrag_herkunft (quelle, quelle_id, eintrag_id)
+            VALUES ('{quelle}', NEW.id, last_insert_rowid());
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {quelle}_abgleich_update AFTER UPDATE ON {quelle}
+        BEGIN
+            UPDATE stoerungseintrag
+            SET ({_SPALTEN}) = (SELECT {_SPALTEN} FROM {sicht} WHERE quelle_id = NEW.id)
+            WHERE id = {eintrag.format(zeile="NEW")};
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {quelle}_abgleich_delete AFTER DELETE ON {quelle}
+        BEGIN
+            DELETE FROM stoerungseintrag WHERE id = {eintrag.format(zeile="OLD")};
+            DELETE FROM stoerungseintrag_herkunft
+            WHERE quelle = '{quelle}' AND quelle_id = OLD.id;
+        END
+        """,
+    ]
+
+
+def _nachtragen(quelle: str, sicht: str) -> List[str]:
+    """
+    Blockkopie der Zeilen ohne Herkunftseintrag: erst die Zuordnung mit neuen ids
+    (ab der höchsten vergebenen), dann die Einträge mit genau diesen ids.
+    """
+    return [
+        f"""
+        INSERT INTO stoerungseintrag_herkunft (quelle, quelle_id, eintrag_id)
+        SELECT '{quelle}', id,
+               (SELECT COALESCE(MAX(id), 0) FROM stoerungseintrag)
+               + row_number() OVER (ORDER BY id)
+        FROM {quelle}
+        WHERE rowid > :von AND rowid <= :bis
+          AND id NOT IN (SELECT quelle_id FROM stoerungseintrag_herkunft WHERE quelle = '{quelle}')
+        """,
+        f"""
+        INSERT INTO stoerungseintrag (id, {_SPALTEN}, erstellt_von)
+        SELECT h.eintrag_id, {", ".join(f"v.{s}" for s in _SPALTEN.split(", "))}, v.erstellt_von
+        FROM {sicht} v
+        JOIN stoerungseintrag_herkunft h ON h.quelle = '{quelle}' AND h.quelle_id = v.quelle_id
+        WHERE v.quelle_id > :von AND v.quelle_id <= :bis
+          AND NOT EXISTS (SELECT 1 FROM stoerungseintrag s WHERE s.id = h.eintrag_id)
+        ORDER BY v.quelle_id
+        """,
+    ]
+
+
+def migrate_stoerungseintrag(conn: sqlite3.Connection) -> None:
+    """
+    Legt die Tabelle des neuen Datenmodells an und übernimmt die Altdaten:
+    laermdaten als Typ LAERM (Verursacher in der Beschreibung), massnahmen als
+    SONSTIGES. Die Legacy-App arbeitet weiter mit den Alt-Tabellen; bis zur
+    Umstellung ziehen Trigger jedes INSERT/UPDATE/DELETE dort in
+    stoerungseintrag nach (nur in diese Richtung). Die Trigger entstehen vor
+    der Blockkopie, Zeilen aus der Zeit dazwischen werden also nicht verpasst.
+    """
+    with unit_of_work() as conn:
+        conn.execute(STOERUNGSEINTRAG_SQL)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_stoerungseintrag_typ ON stoerungseintrag (typ)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_stoerungseintrag_datum ON stoerungseintrag (datum)"
+        )
+        conn.execute(HERKUNFT_SQL)
+        conn.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS stoerungseintrag_herkunft_delete
+            AFTER DELETE ON stoerungseintrag
+            BEGIN
+                UPDATE stoerungseintrag_herkunft SET eintrag_id = NULL WHERE eintrag_id = OLD.id;
+            END
+        """
+        )
+        for sicht in (LAERMDATEN_ALS_EINTRAG, MASSNAHMEN_TAG, MASSNAHMEN_ALS_EINTRAG):
+            conn.execute(sicht)
+        for quelle, sicht in ABGLEICH.items():
+            for trigger in _abgleich_trigger(quelle, sicht):
+                conn.execute(trigger)
+    for quelle, sicht in ABGLEICH.items():
+        kopiert = kopiere_in_bloecken(
+            f"stoerungseintrag:{quelle}", quelle, _nachtragen(quelle, sicht)
+        )
+        with unit_of_work() as conn:
+            gesamt = conn.execute(f"SELECT COUNT(*) FROM {quelle}").fetchone()[0]
+        print(f"  {quelle} → stoerungseintrag: {kopiert} Zeilen (Quelle: {gesamt})")
+
+
+def migrate_volltext(conn: sqlite3.Connection) -> None:
+    """FTS5-Volltextindex über die Freitextspalten samt Triggern (siehe volltext.py)."""
+    volltext.erstelle(conn)
+
+
+# ---------------------------------------------------------------
+# Versionen
+# ---------------------------------------------------------------
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    schritt: Callable[[sqlite3.Connection], None]
+    # True: der Schritt steuert seine Transaktionen selbst (z. B. kopiere_in_bloecken)
+    eigene_transaktionen: bool = False
+
+
+# Neue Schritte nur hinten anhängen, Nummern nie ändern
+MIGRATIONS: List[Migration] = [
+    Migration(1, "laermdaten_old übernehmen", migrate_laermdaten_old, eigene_transaktionen=True),
+    Migration(2, "Dauer als Spalte", migrate_dauer),
+    Migration(3, "ISO-Datum und Indizes", migrate_iso_datum),
+    Migration(4, "Dubletten entfernen, UNIQUE-Index", migrate_eindeutig),
+    Migration(5, "Änderungsprotokoll", migrate_aenderungsprotokoll),
+    Migration(6, "Summentabellen", migrate_rollups),
+    Migration(
+        7, "Störungseinträge aus Altdaten", migrate_stoerungseintrag, eigene_transaktionen=True
+    ),
+    Migration(8, "Volltextindex", migrate_volltext),
+    Migration(9, "Summentabellen: Anzahl mit Dauer", migrate_rollups),
+]
+
+
+def _verwaltungstabellen(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            angewendet TEXT NOT NULL
+        )
+    """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_fortschritt (
+            schluessel TEXT PRIMARY KEY,
+            letzte_id INTEGER NOT NULL
+        )
+    """
+    )
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Höchste angewendete Version (0 = noch keine)."""
+    if "schema_version" not in _tabellen(conn):
+        return 0
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def ausstehend(conn: sqlite3.Connection) -> List[Migration]:
+    """Noch nicht angewendete Schritte in Reihenfolge."""
+    erledigt = set()
+    if "schema_version" in _tabellen(conn):
+        erledigt = {row[0] for row in conn.execute("SELECT version FROM schema_version")}
+    return [m for m in MIGRATIONS if m.version not in erledigt]
+
+
+def migrate() -> List[int]:
+    """
+    Wendet alle ausstehenden Schritte an. Jeder Schritt und sein Eintrag in
+    schema_version werden gemeinsam committet. Rückgabe: angewendete Versionen.
+    """
+    with unit_of_work() as conn:
+        _verwaltungstabellen(conn)
+        offen = ausstehend(conn)
+    angewendet = []
+    for migration in offen:
+        start = time.perf_counter()
+        if migration.eigene_transaktionen:
+            migration.schritt(get_connection())
+        with unit_of_work() as conn:
+            if not migration.eigene_transaktionen:
+                migration.schritt(conn)
+            conn.execute(
+                "INSERT INTO schema_version (version, name, angewendet) VALUES (?, ?, ?)",
+                (migration.version, migration.name, datetime.now().isoformat(timespec="seconds")),
+            )
+        angewendet.append(migration.version)
+        print(
+            f"Migration {migration.version} ({migration.name}): "
+            f"{time.perf_counter() - start:.2f}s"
+        )
+    # Schritt 4 lässt den UNIQUE-Index bei widersprüchlichen Dubletten aus
+    with unit_of_work() as conn:
+        if 4 not in angewendet and not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_laermdaten_eindeutig'"
+        ).fetchone():
+            migrate_eindeutig(conn)
+    return angewendet
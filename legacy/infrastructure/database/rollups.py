@@ -0,0 +1,165 @@
+# infrastructure/database/rollups.py
+"""
+Vorverdichtete Summen über laermdaten:
+    laermdaten_tag          – je Kalendertag
+    laermdaten_wochenstunde – je Wochentag (0 = Sonntag) und Stunde des Beginns
+jeweils Anzahl, Anzahl mit Dauer, Summe Dauer und Summe Auswirkung. Mittelwerte:
+Summe Dauer / Anzahl mit Dauer (Zeilen ohne Dauer zählen wie bei AVG nicht mit),
+Summe Auswirkung / Anzahl.
+
+Trigger auf laermdaten halten die Tabellen bei jedem INSERT/UPDATE/DELETE
+aktuell; Plots und Kennzahlen lesen so wenige hundert Zeilen statt der ganzen
+Historie. rebuild() rechnet alles neu, pruefe() vergleicht mit den Rohdaten.
+"""
+
+import sqlite3
+from typing import Dict, List, Tuple
+
+# Schlüsselausdrücke, {p} = Tabellenpräfix ("", "NEW." oder "OLD.")
+WOCHENTAG_SQL = "CAST(strftime('%w', {p}datum) AS INTEGER)"
+STUNDE_SQL = "CAST(substr({p}beginn, 1, instr({p}beginn, ':') - 1) AS INTEGER)"
+
+ROLLUPS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    # Tabelle → (Schlüsselspalte, Ausdruck), ...
+    "laermdaten_tag": (("datum", "{p}datum"),),
+    "laermdaten_wochenstunde": (("wochentag", WOCHENTAG_SQL), ("stunde", STUNDE_SQL)),
+}
+
+_TABELLE = """
+CREATE TABLE IF NOT EXISTS {tabelle} (
+    {schluessel_def},
+    anzahl INTEGER NOT NULL,
+    anzahl_dauer INTEGER NOT NULL,
+    summe_dauer REAL NOT NULL,
+    summe_auswirkung INTEGER NOT NULL,
+    PRIMARY KEY ({schluessel})
+)
+"""
+
+
+def _schluessel(tabelle: str) -> List[str]:
+    return [spalte for spalte, _ in ROLLUPS[tabelle]]
+
+
+def _ausdruecke(tabelle: str, p: str) -> List[str]:
+    return [ausdruck.format(p=p) for _, ausdruck in ROLLUPS[tabelle]]
+
+
+def _plus(tabelle: str) -> str:
+    """Statement: Zeile NEW in die Summen aufnehmen (Upsert)."""
+    schluessel = _schluessel(tabelle)
+    return (
+        f"INSERT INTO {tabelle} ({', '.join(schluessel)}, anzahl, anzahl_dauer, summe_dauer, "
+        "summe_auswirkung) "
+        f"VALUES ({', '.join(_ausdruecke(tabelle, 'NEW.'))}, 1, NEW.dauer IS NOT NULL, "
+        "COALESCE(NEW.dauer, 0), COALESCE(CAST(NEW.auswirkung AS INTEGER), 0)) "
+        f"ON CONFLICT({', '.join(schluessel)}) DO UPDATE SET "
+        "anzahl = anzahl + 1, "
+        "anzahl_dauer = anzahl_dauer + excluded.anzahl_dauer, "
+        "summe_dauer = summe_dauer + excluded.summe_dauer, "
+        "summe_auswirkung = summe_auswirkung + excluded.summe_auswirkung;"
+    )
+
+
+def _minus(tabelle: str) -> str:
+    """Statements: Zeile OLD aus den Summen nehmen, leere Gruppen löschen."""
+    bedingung = " AND ".join(
+        f"{spalte} = {ausdruck}"
+        for spalte, ausdruck in zip(_schluessel(tabelle), _ausdruecke(tabelle, "OLD."), strict=True)
+    )
+    return (
+        f"UPDATE {tabelle} SET anzahl = anzahl - 1, "
+        "anzahl_dauer = anzahl_dauer - (OLD.dauer IS NOT NULL), "
+        "summe_dauer = summe_dauer - COALESCE(OLD.dauer, 0), "
+        "summe_auswirkung = summe_auswirkung - COALESCE(CAST(OLD.auswirkung AS INTEGER), 0) "
+        f"WHERE {bedingung};\n"
+        f"DELETE FROM {tabelle} WHERE {bedingung} AND anzahl <= 0;"
+    )
+
+
+def erstelle(conn: sqlite3.Connection) -> None:
+    """
+    Tabellen und Trigger anlegen; neu angelegte Tabellen aus den Rohdaten füllen.
+    Tabellen aus der Zeit vor anzahl_dauer werden samt Triggern neu angelegt.
+    """
+    vorhanden = {
+        row[0]
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    }
+    veraltet = {
+        tabelle
+        for tabelle in ROLLUPS.keys() & vorhanden
+        if "anzahl_dauer" not in {row[1] for row in conn.execute(f"PRAGMA table_info({tabelle})")}
+    }
+    if veraltet:
+        for aktion in ("insert", "delete", "update"):
+            conn.execute(f"DROP TRIGGER IF EXISTS laermdaten_rollup_{aktion}")
+        for tabelle in veraltet:
+            conn.execute(f"DROP TABLE {tabelle}")
+        vorhanden -= veraltet
+    for tabelle in ROLLUPS:
+        schluessel = _schluessel(tabelle)
+        typen = ["TEXT" if s == "datum" else "INTEGER" for s in schluessel]
+        conn.execute(
+            _TABELLE.format(
+                tabelle=tabelle,
+                schluessel_def=", ".join(
+                    f"{s} {t} NOT NULL" for s, t in zip(schluessel, typen, strict=True)
+                ),
+                schluessel=", ".join(schluessel),
+            )
+        )
+    plus = "\n".join(_plus(t) for t in ROLLUPS)
+    minus = "\n".join(_minus(t) for t in ROLLUPS)
+    conn.execute(
+        f"CREATE TRIGGER IF NOT EXISTS laermdaten_rollup_insert AFTER INSERT ON laermdaten "
+        f"BEGIN\n{plus}\nEND"
+    )
+    conn.execute(
+        f"CREATE TRIGGER IF NOT EXISTS laermdaten_rollup_delete AFTER DELETE ON laermdaten "
+        f"BEGIN\n{minus}\nEND"
+    )
+    conn.execute(
+        "CREATE TRIGGER IF NOT EXISTS laermdaten_rollup_update "
+        "AFTER UPDATE OF datum, beginn, dauer, auswirkung ON laermdaten "
+        f"BEGIN\n{minus}\n{plus}\nEND"
+    )
+    if not set(ROLLUPS) <= vorhanden:
+        rebuild(conn)
+
+
+def _aus_rohdaten(tabelle: str) -> str:
+    ausdruecke = _ausdruecke(tabelle, "")
+    return (
+        f"SELECT {', '.join(ausdruecke)}, COUNT(*), COUNT(dauer), TOTAL(dauer), "
+        f"TOTAL(CAST(auswirkung AS INTEGER)) FROM laermdaten GROUP BY {', '.join(ausdruecke)}"
+    )
+
+
+def rebuild(conn: sqlite3.Connection) -> None:
+    """Alle Summen aus laermdaten neu berechnen (im laufenden Transaktionskontext)."""
+    for tabelle in ROLLUPS:
+        conn.execute(f"DELETE FROM {tabelle}")
+        conn.execute(f"INSERT INTO {tabelle} {_aus_rohdaten(tabelle)}")
+
+
+def pruefe(conn: sqlite3.Connection, toleranz: float = 1e-6) -> List[str]:
+    """Vergleicht die Summentabellen mit den Rohdaten. Rückgabe: Liste der Abweichungen."""
+    abweichungen = []
+    for tabelle in ROLLUPS:
+        n = len(ROLLUPS[tabelle])
+        soll = {row[:n]: row[n:] for row in conn.execute(_aus_rohdaten(tabelle))}
+        ist = {
+            row[:n]: row[n:]
+            for row in conn.execute(
+                f"SELECT {', '.join(_schluessel(tabelle))}, anzahl, anzahl_dauer, summe_dauer, "
+                f"summe_auswirkung FROM {tabelle}"
+            )
+        }
+        for schluessel in sorted(soll.keys() | ist.keys(), key=str):
+            a, b = soll.get(schluessel), ist.get(schluessel)
+            if a is None or b is None or any(
+                abs(x - y) > toleranz for x, y in zip(a, b, strict=True)
+            ):
+                abweichungen.append(f"{tabelle} {schluessel}: roh={a} rollup={b}")
+    return abweichungen
@@ -0,0 +1,95 @@
+# infrastructure/database/volltext.py
+"""
+Volltextindex (SQLite FTS5) über die Freitextspalten:
+    laermdaten        – grund, verursacher
+    massnahmen        – massnahme, ergebnis
+    stoerungseintrag  – beschreibung, zeuge
+Je Tabelle eine FTS5-Tabelle <tabelle>_fts mit external content: der Index
+speichert nur Tokens, der Text bleibt in der Tabelle selbst (rowid = id).
+
+Trigger auf den Tabellen halten den Index bei jedem INSERT/UPDATE/DELETE
+aktuell. Umlaute werden gefaltet ("Lärm" findet "Larm" und umgekehrt).
+Das neue Paket (src/, adapters/volltext.py) legt dieselben Tabellen an und sucht darin.
+"""
+
+import sqlite3
+from typing import Dict, List, Tuple
+
+# Tabelle → indizierte Spalten (Reihenfolge = Spaltennummer in snippet()/bm25())
+INDIZES: Dict[str, Tuple[str, ...]] = {
+    "laermdaten": ("grund", "verursacher"),
+    "massnahmen": ("massnahme", "ergebnis"),
+    "stoerungseintrag": ("beschreibung", "zeuge"),
+}
+
+TOKENIZER = "unicode61 remove_diacritics 2"
+
+
+def _werte(tabelle: str, p: str) -> str:
+    return ", ".join(f"{p}{spalte}" for spalte in INDIZES[tabelle])
+
+
+def _ddl(tabelle: str) -> List[str]:
+    """
+    FTS-Tabelle und Trigger einer Tabelle. Zeichengleich mit adapters/volltext.py
+    im neuen Paket (tests/test_volltext.py vergleicht sqlite_master).
+    """
+    fts, liste = f"{tabelle}_fts", ", ".join(INDIZES[tabelle])
+    neu = f"INSERT INTO {fts} (rowid, {liste}) VALUES (NEW.id, {_werte(tabelle, 'NEW.')});"
+    # external content: der Index braucht die alten Werte, um ihre Tokens zu entfernen
+    alt = (
+        f"INSERT INTO {fts} ({fts}, rowid, {liste}) "
+        f"VALUES ('delete', OLD.id, {_werte(tabelle, 'OLD.')});"
+    )
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({liste}, "
+        f"content='{tabelle}', content_rowid='id', tokenize='{TOKENIZER}')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {tabelle} BEGIN {neu} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {tabelle} BEGIN {alt} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF {liste} ON {tabelle} "
+        f"BEGIN {alt} {neu} END",
+    ]
+
+
+def erstelle(conn: sqlite3.Connection) -> List[str]:
+    """
+    FTS-Tabellen und Trigger für alle vorhandenen Tabellen aus INDIZES anlegen;
+    neu angelegte Indizes aus dem Bestand füllen. Rückgabe: neu angelegte Indizes.
+    """
+    vorhanden = {
+        row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    }
+    neu = []
+    for tabelle in INDIZES:
+        if tabelle not in vorhanden:
+            continue
+        for anweisung in _ddl(tabelle):
+            conn.execute(anweisung)
+        if f"{tabelle}_fts" not in vorhanden:
+            neu.append(tabelle)
+    for tabelle in neu:
+        rebuild(conn, tabelle)
+    return neu
+
+
+def rebuild(conn: sqlite3.Connection, tabelle: str) -> None:
+    """Index einer Tabelle komplett aus dem Bestand neu aufbauen."""
+    conn.execute(f"INSERT INTO {tabelle}_fts ({tabelle}_fts) VALUES ('rebuild')")
+
+
+def pruefe(conn: sqlite3.Connection) -> List[str]:
+    """Vergleicht jeden vorhandenen Index mit seiner Tabelle. Rückgabe: Liste der Abweichungen."""
+    abweichungen = []
+    for tabelle in INDIZES:
+        if not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (f"{tabelle}_fts",)
+        ).fetchone():
+            continue
+        try:
+            # rank = 1: auch gegen den Inhalt der Tabelle prüfen, nicht nur den Index selbst
+            conn.execute(
+                f"INSERT INTO {tabelle}_fts ({tabelle}_fts, rank) VALUES ('integrity-check', 1)"
+            )
+        except sqlite3.DatabaseError as e:
+            abweichungen.append(f"{tabelle}_fts: {e}")
+    return abweichungen
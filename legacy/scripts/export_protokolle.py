@@ -0,0 +1,128 @@
+# scripts/export_protokolle.py
+"""
+Batch-Export ohne GUI: Lärmprotokoll, Maßnahmenprotokoll und Plot-Anhang
+parallel in eigenen Prozessen.
+
+Alle Worker lesen aus demselben Snapshot der Datenbank (ein konsistenter Stand,
+auch wenn die App währenddessen speichert). Das Logo wird nur einmal im
+Elternprozess dekodiert und verkleinert an die Worker übergeben.
+
+Aufruf (im Ordner legacy/):
+    python -m scripts.export_protokolle [--db database/protokoll.db] [--seriell]
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, Optional, Tuple
+
+from infrastructure.database import connection
+from infrastructure.database.database_setup import create_database
+
+
+def _laermprotokoll(inkrementell: bool, statistik: bool):
+    from core.services import pdf_generation
+
+    if inkrementell:
+        return pdf_generation.generiere_protokoll_inkrementell(None, statistik=statistik)
+    return pdf_generation.generiere_protokoll(None, statistik=statistik)
+
+
+def _massnahmen(inkrementell: bool, statistik: bool):
+    from core.services import pdf_generation
+
+    return pdf_generation.generiere_massnahmen(None)
+
+
+def _plots(inkrementell: bool, statistik: bool):
+    from core.services import data_processing, plot_cache
+
+    data_processing.generate_plots(force=not inkrementell)
+    return ", ".join(plot_cache.verfuegbare_plots())
+
+
+DOKUMENTE: Dict[str, Callable[[bool, bool], object]] = {
+    "Lärmprotokoll": _laermprotokoll,
+    "Maßnahmenprotokoll": _massnahmen,
+    "Plot-Anhang": _plots,
+}
+
+
+def _init_worker(db_file: str, logo: Optional[bytes]) -> None:
+    from core.services import pdf_generation
+
+    connection.configure(db_file)
+    pdf_generation.setze_logo(logo)
+
+
+def _export(name: str, inkrementell: bool, statistik: bool) -> Tuple[str, object, float]:
+    start = time.perf_counter()
+    ergebnis = DOKUMENTE[name](inkrementell, statistik)
+    return name, ergebnis, time.perf_counter() - start
+
+
+def _ausgabe(name: str, ergebnis: object, sekunden: float) -> None:
+    print(f"{name:<20} {sekunden:>7.2f}s  {ergebnis}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Alle Protokolle exportieren")
+    parser.add_argument("--db", default=connection.DB_FILE, help="Datenbankdatei")
+    parser.add_argument("--seriell", action="store_true", help="nacheinander im selben Prozess")
+    parser.add_argument(
+        "--inkrementell",
+        action="store_true",
+        help="gecachte Monate/Plots wiederverwenden (pdf_cache/, plots/manifest.json)",
+    )
+    parser.add_argument(
+        "--statistik", action="store_true", help="Lärmprotokoll mit Statistik-Anhang (Plots)"
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    from core.services import pdf_generation
+
+    gesamt = time.perf_counter()
+    connection.configure(args.db)
+    create_database()  # Migrationen wie beim App-Start
+    logo = pdf_generation.logo_bytes()
+    fehler = 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_snapshot = os.path.join(tmp, "snapshot.db")
+        connection.snapshot(db_snapshot)
+        connection.close_all()
+
+        if args.seriell:
+            _init_worker(db_snapshot, logo)
+            for name in DOKUMENTE:
+                _ausgabe(*_export(name, args.inkrementell, args.statistik))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=len(DOKUMENTE),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(db_snapshot, logo),
+            ) as pool:
+                futures = {
+                    pool.submit(_export, name, args.inkrementell, args.statistik): name
+                    for name in DOKUMENTE
+                }
+                for future in as_completed(futures):
+                    try:
+                        _ausgabe(*future.result())
+                    except Exception as e:
+                        fehler += 1
+                        print(f"{futures[future]:<20} FEHLER: {e}")
+        connection.close_all()
+
+    print(f"{'Gesamt':<20} {time.perf_counter() - gesamt:>7.2f}s")
+    return 1 if fehler else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,46 @@
+# scripts/migrieren.py
+"""
+Schema-Migrationen anzeigen bzw. ausführen (siehe infrastructure/database/migrations.py).
+Ein abgebrochener Lauf kann einfach erneut gestartet werden und setzt beim
+letzten fertigen Block fort.
+
+Aufruf (im Ordner legacy/):
+    python -m scripts.migrieren [--db database/protokoll.db] [--status] [--backup kopie.db]
+"""
+
+import argparse
+import os
+
+from infrastructure.database import connection, migrations
+from infrastructure.database.database_setup import create_database
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Schema-Migrationen ausführen")
+    parser.add_argument("--db", default=connection.DB_FILE, help="Datenbankdatei")
+    parser.add_argument("--status", action="store_true", help="nur Stand anzeigen")
+    parser.add_argument("--backup", help="vorher eine Kopie der Datenbank hierhin schreiben")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"Datenbank nicht gefunden: {args.db}")
+        return 1
+    connection.configure(args.db)
+    conn = connection.get_connection()
+    offen = migrations.ausstehend(conn)
+    print(f"Schema-Version: {migrations.schema_version(conn)}")
+    for migration in offen:
+        print(f"  ausstehend: {migration.version} {migration.name}")
+
+    if not args.status and offen:
+        if args.backup:
+            connection.snapshot(args.backup)
+            print(f"Backup: {args.backup}")
+        create_database()  # Tabellen anlegen + migrate()
+        print(f"Schema-Version: {migrations.schema_version(conn)}")
+    connection.close_all()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,42 @@
+# scripts/rollups_neu_aufbauen.py
+"""
+Summentabellen (laermdaten_tag, laermdaten_wochenstunde) neu berechnen und
+gegen die Rohdaten prüfen. Exit-Code 1, wenn Abweichungen bleiben.
+
+Aufruf (im Ordner legacy/):
+    python -m scripts.rollups_neu_aufbauen [--db database/protokoll.db] [--nur-pruefen]
+"""
+
+import argparse
+import time
+
+from infrastructure.database import connection, rollups
+from infrastructure.database.database_setup import create_database
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Summentabellen neu aufbauen und prüfen")
+    parser.add_argument("--db", default=connection.DB_FILE, help="Datenbankdatei")
+    parser.add_argument("--nur-pruefen", action="store_true", help="nichts ändern, nur prüfen")
+    args = parser.parse_args(argv)
+
+    connection.configure(args.db)
+    create_database()  # legt Tabellen/Trigger an, falls noch nicht vorhanden
+    if not args.nur_pruefen:
+        start = time.perf_counter()
+        with connection.unit_of_work() as conn:
+            rollups.rebuild(conn)
+        print(f"Neu aufgebaut in {time.perf_counter() - start:.2f}s")
+
+    abweichungen = rollups.pruefe(connection.get_connection())
+    for zeile in abweichungen[:50]:
+        print(zeile)
+    if len(abweichungen) > 50:
+        print(f"... und {len(abweichungen) - 50} weitere")
+    print("OK" if not abweichungen else f"{len(abweichungen)} Abweichungen")
+    connection.close_all()
+    return 1 if abweichungen else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,30 @@
+# tests/conftest.py – Aufruf im Ordner legacy/: python -m pytest tests
+# (das neue Paket aus src/ liegt per pyproject.toml [tool.pytest.ini_options] im Pfad)
+import importlib.util
+
+import pytest
+
+from infrastructure.database import connection
+
+# Manuelle Kivy-Vorschau, kein Test (python -m tests.test_protokoll)
+collect_ignore = ["test_protokoll.py"]
+# Tests mit optionalen Abhängigkeiten nur, wenn diese installiert sind
+BENOETIGT = {
+    "test_volltext.py": ("sqlmodel",),  # Abgleich mit dem neuen Paket
+    "test_pdf_generation.py": ("reportlab", "pypdf"),
+    "test_data_processing.py": ("pandas",),
+}
+collect_ignore += [
+    datei
+    for datei, module in BENOETIGT.items()
+    if any(importlib.util.find_spec(modul) is None for modul in module)
+]
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Eigene Datenbankdatei je Test; danach wieder die Standard-DB."""
+    pfad = str(tmp_path / "test.db")
+    connection.configure(pfad)
+    yield pfad
+    connection.configure(connection.DB_FILE)
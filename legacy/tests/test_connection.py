@@ -0,0 +1,40 @@
+import sqlite3
+
+import pytest
+
+from infrastructure.database import connection
+
+
+def test_gescheitertes_commit_rollt_zurueck(db):
+    with connection.unit_of_work() as conn:
+        conn.execute("CREATE TABLE eltern (id INTEGER PRIMARY KEY)")
+        conn.execute(
+            "CREATE TABLE kind (eltern_id INTEGER REFERENCES eltern (id) "
+            "DEFERRABLE INITIALLY DEFERRED)"
+        )
+
+    # Verzögerter Fremdschlüssel: erst das COMMIT scheitert
+    with pytest.raises(sqlite3.IntegrityError):
+        with connection.unit_of_work() as conn:
+            conn.execute("INSERT INTO kind (eltern_id) VALUES (42)")
+
+    conn = connection.get_connection()
+    assert not conn.in_transaction
+    with connection.unit_of_work() as conn:
+        conn.execute("INSERT INTO eltern (id) VALUES (1)")
+    assert conn.execute("SELECT COUNT(*) FROM kind").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM eltern").fetchone()[0] == 1
+
+
+def test_unit_of_work_sperrt_sofort(db):
+    with connection.unit_of_work() as conn:
+        conn.execute("CREATE TABLE t (x)")
+
+    andere = sqlite3.connect(db, timeout=0, isolation_level=None)
+    try:
+        with connection.unit_of_work():
+            # noch kein Statement im Block – die Schreibsperre ist trotzdem schon da
+            with pytest.raises(sqlite3.OperationalError, match="locked"):
+                andere.execute("BEGIN IMMEDIATE")
+    finally:
+        andere.close()
@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+
+from core.services import data_processing
+from infrastructure.database import connection
+from infrastructure.database.database_setup import create_database, insert_laermdaten_many
+
+
+@pytest.fixture
+def cache(db):
+    create_database()
+    insert_laermdaten_many(
+        [
+            ("2024-11-05", "20:35", "20:45", "Poltern", "Melnik", 4),
+            ("2024-11-05", "9:47", "10:05", "Bohren", "Melnik", 2),
+            ("2024-11-06", "23:50", "00:20", "Musik", "Nowak", 5),
+        ]
+    )
+    data_processing.clear_cache()
+    data_processing.get_all_data()  # befüllt den Cache
+    yield data_processing._cache
+    data_processing.clear_cache()
+
+
+def _gleich_neu_geladen(cache):
+    inkrementell = data_processing.get_all_data()
+    assert cache.frame is inkrementell  # Ergebnis liegt im Cache
+    pd.testing.assert_frame_equal(inkrementell, data_processing.get_all_data(force_reload=True))
+    return inkrementell
+
+
+def test_cache_wie_neu_geladen_nach_schreibzugriffen(cache):
+    insert_laermdaten_many([("2024-11-04", "07:00", "07:30", "Trampeln", "Schulz", 3)])
+    assert len(_gleich_neu_geladen(cache)) == 4
+
+    with connection.unit_of_work() as conn:
+        conn.execute(
+            "UPDATE laermdaten SET grund = 'Hämmern', auswirkung = 1 WHERE beginn = '9:47'"
+        )
+    df = _gleich_neu_geladen(cache)
+    assert "Bohren" not in df["grund"].cat.categories
+
+    with connection.unit_of_work() as conn:
+        conn.execute("DELETE FROM laermdaten WHERE verursacher = 'Nowak'")
+    df = _gleich_neu_geladen(cache)
+    assert "Nowak" not in df["verursacher"].cat.categories
+    assert len(df) == 3
+
+
+def test_cache_ohne_aenderungen_liefert_denselben_frame(cache):
+    assert data_processing.get_all_data() is data_processing.get_all_data()
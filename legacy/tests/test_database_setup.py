@@ -0,0 +1,19 @@
+from infrastructure.database.database_setup import (
+    create_database,
+    get_all_laermdaten,
+    get_laermdaten_between,
+    insert_laermdaten,
+    iter_laermdaten,
+)
+
+
+def test_alle_abfragen_sortieren_nach_uhrzeit(db):
+    create_database()
+    insert_laermdaten("2024-11-05", "10:00", "10:05", "Bohren", "Melnik", 3)
+    insert_laermdaten("2024-11-05", "9:47", "9:50", "Poltern", "Melnik", 4)
+    insert_laermdaten("2024-11-04", "23:10", "23:20", "Musik", "Melnik", 2)
+
+    erwartet = [("2024-11-04", "23:10"), ("2024-11-05", "9:47"), ("2024-11-05", "10:00")]
+    assert [(z[1], z[2]) for z in get_all_laermdaten()] == erwartet
+    assert [(z[1], z[2]) for z in get_laermdaten_between("2024-11-04", "2024-11-05")] == erwartet
+    assert [(z[0], z[1]) for z in iter_laermdaten()] == erwartet
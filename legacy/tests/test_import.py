@@ -0,0 +1,39 @@
+import os
+import shutil
+
+from core.services.protokol_service import save_events
+from infrastructure.database import connection
+from infrastructure.database.database_setup import create_database
+
+# Ausgelieferte Datenbank: altes Schema ohne UNIQUE, zwei Dublettengruppen
+PROTOKOLL_DB = os.path.join(
+    os.path.dirname(__file__), "..", "infrastructure", "database", "protokoll.db"
+)
+
+
+def _anzahl(conn, sql):
+    return conn.execute(sql).fetchone()[0]
+
+
+def test_reimport_meldet_konflikt_in_alter_datenbank(db):
+    shutil.copy(PROTOKOLL_DB, db)
+    vorher = _anzahl(connection.get_connection(), "SELECT COUNT(*) FROM laermdaten")
+    create_database()
+
+    conn = connection.get_connection()
+    # je Dublettengruppe bleibt die zuerst erfasste Zeile
+    assert _anzahl(conn, "SELECT COUNT(*) FROM laermdaten") == vorher - 3
+    assert _anzahl(
+        conn,
+        "SELECT COUNT(*) FROM (SELECT 1 FROM laermdaten "
+        "GROUP BY datum, beginn, verursacher HAVING COUNT(*) > 1)",
+    ) == 0
+
+    zeile = conn.execute(
+        "SELECT datum, beginn, ende, grund, verursacher, auswirkung "
+        "FROM laermdaten ORDER BY id LIMIT 1"
+    ).fetchone()
+    ergebnis = save_events([tuple(zeile)])
+    assert ergebnis.inserted == 0
+    assert len(ergebnis.conflicts) == 1
+    assert _anzahl(conn, "SELECT COUNT(*) FROM laermdaten") == vorher - 3
@@ -0,0 +1,223 @@
+import sqlite3
+from contextlib import contextmanager
+
+import pytest
+
+from infrastructure.database import connection, migrations
+from infrastructure.database.database_setup import create_database, insert_laermdaten
+
+# Schema aus der Zeit vor der Spalte dauer: DD-MM-YYYY, auswirkung als Text, kein UNIQUE
+ALTE_LAERMDATEN = """
+CREATE TABLE laermdaten (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    datum TEXT NOT NULL,
+    beginn TEXT NOT NULL,
+    ende TEXT NOT NULL,
+    grund TEXT NOT NULL,
+    verursacher TEXT NOT NULL,
+    auswirkung TEXT NOT NULL
+)
+"""
+
+
+@pytest.fixture
+def alte_db(db, monkeypatch):
+    """Datenbank im alten Schema samt laermdaten_old; kleine Blöcke für die Kopien."""
+    monkeypatch.setattr(migrations, "BLOCK_GROESSE", 1)
+    conn = sqlite3.connect(db)
+    conn.execute(ALTE_LAERMDATEN)
+    conn.executemany(
+        "INSERT INTO laermdaten (datum, beginn, ende, grund, verursacher, auswirkung) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            ("05-11-2024", "20:35", "20:38", "Poltern", "Melnik", "4"),
+            ("06-11-2024", "23:30", "0:15", "Bohren", "Melnik", "3"),
+            ("06-11-2024", "kurz", "22:00", "Trampeln", "Melnik", "2"),
+            ("05-11-2024", "20:35", "20:38", "Poltern", "Melnik", "4"),  # Dublette
+        ],
+    )
+    conn.execute(
+        "CREATE TABLE laermdaten_old (id INTEGER PRIMARY KEY, datum TEXT, startzeit TEXT, "
+        "endzeit TEXT, grund TEXT, nachbar TEXT, auswirkung TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO laermdaten_old (datum, startzeit, endzeit, grund, nachbar, auswirkung) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            ("07-11-2024", "08:00", "08:30", "Musik", "Melnik", "2"),
+            ("06-11-2024", "23:30", "0:15", "Bohren", "Melnik", "3"),  # Dublette
+        ],
+    )
+    conn.execute(
+        "CREATE TABLE massnahmen (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "datum TEXT NOT NULL, massnahme TEXT NOT NULL, ergebnis TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO massnahmen (datum, massnahme, ergebnis) VALUES (?, ?, ?)",
+        [
+            ("Mitte Juli", "Gespräch", None),
+            ("2.10.2024", "Brief", "Keine Reaktion"),
+            ("15-12-2024", "Polizei", "-"),
+        ],
+    )
+    conn.commit()
+    conn.close()
+    return db
+
+
+def _werte(sql, *parameter):
+    return connection.get_connection().execute(sql, parameter).fetchall()
+
+
+def test_alte_datenbank_wird_migriert(alte_db):
+    create_database()
+
+    assert _werte("SELECT MAX(version) FROM schema_version") == [(len(migrations.MIGRATIONS),)]
+    assert _werte("SELECT name FROM sqlite_master WHERE name = 'laermdaten_old'") == []
+    assert _werte("SELECT COUNT(*), SUM(dauer) FROM laermdaten") == [(4, 3 + 45 + 30)]
+    assert _werte("SELECT MIN(datum), MAX(datum) FROM laermdaten") == [
+        ("2024-11-05", "2024-11-07")
+    ]
+    assert _werte("SELECT COUNT(*) FROM stoerungseintrag") == [(4 + 3,)]
+    assert _werte("SELECT COUNT(*), COUNT(eintrag_id) FROM stoerungseintrag_herkunft") == [
+        (7, 7)
+    ]
+
+    # nicht lesbare Angaben: Ersatzdatum, Originaltext in der Beschreibung
+    ((datum, beginn, beschreibung),) = _werte(
+        "SELECT datum, beginn, beschreibung FROM stoerungseintrag "
+        "WHERE beschreibung LIKE 'Trampeln%'"
+    )
+    assert (datum, beginn) == ("2024-11-06 00:00:00.000000", None)
+    assert beschreibung.endswith("Datum/Zeit (Original): 2024-11-06 kurz–22:00")
+    ((datum, beschreibung),) = _werte(
+        "SELECT datum, beschreibung FROM stoerungseintrag WHERE beschreibung LIKE '%Gespräch%'"
+    )
+    assert datum == "2024-10-02 00:00:00.000000"
+    assert beschreibung.endswith("Datum (Original): Mitte Juli")
+
+
+def test_widerspruechliche_dubletten_bleiben_erhalten(alte_db):
+    conn = sqlite3.connect(alte_db)
+    conn.execute(
+        "INSERT INTO laermdaten (datum, beginn, ende, grund, verursacher, auswirkung) "
+        "VALUES ('05-11-2024', '20:35', '21:10', 'Bohren', 'Melnik', '5')"
+    )
+    conn.commit()
+    conn.close()
+    create_database()
+
+    poltern_oder_bohren = (
+        "SELECT ende, grund FROM laermdaten "
+        "WHERE datum = '2024-11-05' AND beginn = '20:35' ORDER BY id"
+    )
+    assert _werte(poltern_oder_bohren) == [("20:38", "Poltern"), ("21:10", "Bohren")]
+    assert _werte("SELECT name FROM sqlite_master WHERE name = 'idx_laermdaten_eindeutig'") == []
+    assert migrations.widerspruechliche_dubletten(connection.get_connection()) == [
+        ("2024-11-05", "20:35", "Melnik", "1,5")
+    ]
+
+    # von Hand bereinigt: der nächste Start legt den Index an
+    with connection.unit_of_work() as conn:
+        conn.execute("UPDATE laermdaten SET beginn = '20:36' WHERE grund = 'Bohren'")
+    create_database()
+    assert _werte("SELECT name FROM sqlite_master WHERE name = 'idx_laermdaten_eindeutig'") == [
+        ("idx_laermdaten_eindeutig",)
+    ]
+    assert len(_werte(poltern_oder_bohren)) == 1
+
+
+def test_abbruch_in_blockkopie_setzt_ohne_dubletten_fort(alte_db, monkeypatch):
+    echte_unit_of_work = migrations.unit_of_work
+    abgebrochen = []
+
+    @contextmanager
+    def abbrechend():
+        # bricht einmal ab, nachdem der zweite Block der Übernahme gelaufen ist
+        with echte_unit_of_work() as conn:
+            yield conn
+            tabellen = migrations._tabellen(conn)
+            if (
+                not abgebrochen
+                and "stoerungseintrag_herkunft" in tabellen
+                and conn.execute("SELECT COUNT(*) FROM stoerungseintrag_herkunft").fetchone()[0]
+                >= 2
+            ):
+                abgebrochen.append(True)
+                raise RuntimeError("Abbruch")
+
+    monkeypatch.setattr(migrations, "unit_of_work", abbrechend)
+    with pytest.raises(RuntimeError, match="Abbruch"):
+        create_database()
+    # der abgebrochene Block ist ganz zurückgerollt
+    assert _werte("SELECT COUNT(*) FROM stoerungseintrag") == [(1,)]
+    assert _werte("SELECT COUNT(*) FROM stoerungseintrag_herkunft") == [(1,)]
+
+    create_database()
+    assert _werte("SELECT COUNT(*) FROM stoerungseintrag") == [(7,)]
+    assert _werte("SELECT COUNT(DISTINCT beschreibung) FROM stoerungseintrag") == [(7,)]
+    assert _werte(
+        "SELECT COUNT(*) FROM stoerungseintrag_herkunft h "
+        "JOIN stoerungseintrag s ON s.id = h.eintrag_id"
+    ) == [(7,)]
+
+
+def test_abgleich_mit_altdaten(alte_db):
+    create_database()
+
+    def eintrag(quelle_id):
+        return _werte(
+            "SELECT s.beschreibung, s.ende FROM stoerungseintrag s "
+            "JOIN stoerungseintrag_herkunft h ON h.eintrag_id = s.id "
+            "WHERE h.quelle = 'laermdaten' AND h.quelle_id = ?",
+            quelle_id,
+        )
+
+    insert_laermdaten("2024-11-08", "22:00", "22:10", "Bass", "Melnik", 3)
+    ((neu,),) = _werte("SELECT MAX(id) FROM laermdaten")
+    assert eintrag(neu) == [("Bass – Verursacher: Melnik", "2024-11-08 22:10:00.000000")]
+
+    with connection.unit_of_work() as conn:
+        conn.execute("UPDATE laermdaten SET ende = '22:20' WHERE id = ?", (neu,))
+    assert eintrag(neu) == [("Bass – Verursacher: Melnik", "2024-11-08 22:20:00.000000")]
+
+    with connection.unit_of_work() as conn:
+        conn.execute("DELETE FROM laermdaten WHERE id = ?", (neu,))
+    assert eintrag(neu) == []
+    assert _werte("SELECT COUNT(*) FROM stoerungseintrag") == [(7,)]
+
+    # im neuen Modell gelöscht: die Altzeile wird nicht wieder gespiegelt
+    ((erste,),) = _werte("SELECT MIN(id) FROM laermdaten")
+    with connection.unit_of_work() as conn:
+        conn.execute(
+            "DELETE FROM stoerungseintrag WHERE id = (SELECT eintrag_id "
+            "FROM stoerungseintrag_herkunft WHERE quelle = 'laermdaten' AND quelle_id = ?)",
+            (erste,),
+        )
+        conn.execute("UPDATE laermdaten SET grund = 'Poltern!' WHERE id = ?", (erste,))
+    assert _werte("SELECT COUNT(*) FROM stoerungseintrag") == [(6,)]
+
+
+def test_stoerungseintrag_wie_sqlmodel(db, tmp_path):
+    sqlmodel = pytest.importorskip("sqlmodel")
+    from mietstoerungsprotokoll.domain.models import Stoerungseintrag
+
+    referenz = str(tmp_path / "sqlmodel.db")
+    engine = sqlmodel.create_engine(f"sqlite:///{referenz}")
+    Stoerungseintrag.__table__.create(engine)
+    engine.dispose()
+    create_database()
+
+    def schema(conn):
+        spalten = conn.execute("PRAGMA table_info(stoerungseintrag)").fetchall()
+        indizes = {
+            (name, eindeutig, tuple(s[2] for s in conn.execute(f"PRAGMA index_info({name})")))
+            for _, name, eindeutig, *_ in conn.execute("PRAGMA index_list(stoerungseintrag)")
+        }
+        return spalten, indizes
+
+    erwartet = sqlite3.connect(referenz)
+    try:
+        assert schema(connection.get_connection()) == schema(erwartet)
+    finally:
+        erwartet.close()
@@ -0,0 +1,117 @@
+import json
+import re
+from datetime import date
+
+import pypdf
+import pytest
+
+from core.services import pdf_cache, pdf_generation
+from core.services.pdf_generation import _laerm_zeile
+from infrastructure.database.database_setup import create_database, insert_laermdaten_many
+
+
+def _seitenzahlen(pfad):
+    seiten = pypdf.PdfReader(pfad, strict=True).pages
+    return [re.findall(r"Seite \d+", seite.extract_text()) for seite in seiten]
+
+
+def _zeilen(monat, anzahl, verursacher="Melnik"):
+    return [
+        (f"{monat}-{tag % 28 + 1:02d}", f"{stunde}:00", f"{stunde}:10", "Poltern", verursacher, 3)
+        for tag, stunde in ((i // 12, i % 12 + 8) for i in range(anzahl))
+    ]
+
+
+@pytest.fixture
+def protokoll(db, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Protokoll und pdf_cache/ im Testordner
+    monkeypatch.setattr(pdf_generation, "LOGO_PATH", str(tmp_path / "kein_logo.png"))
+    create_database()
+    insert_laermdaten_many(_zeilen("2024-09", 40) + _zeilen("2024-10", 5) + _zeilen("2024-11", 3))
+
+    def exportieren():
+        pfad = pdf_generation.generiere_protokoll_inkrementell(None, heute=date(2024, 11, 20))
+        with open(pdf_cache.MANIFEST_FILE, encoding="utf-8") as f:
+            return pfad, json.load(f)
+
+    return exportieren
+
+
+def test_inkrementell_seitenzahlen_ueber_alle_fragmente(protokoll):
+    pfad, manifest = protokoll()
+    assert "Erstellt am: 20.11.2024" in pypdf.PdfReader(pfad).pages[0].extract_text()
+    seiten = _seitenzahlen(pfad)
+    assert seiten == [[f"Seite {nr}"] for nr in range(1, len(seiten) + 1)]
+    # Einleitung, September (2 Seiten), Oktober, November (laufend), Abschluss
+    assert len(seiten) == 6
+    assert {m: (e["erste_seite"], e["seiten"]) for m, e in manifest.items()} == {
+        "2024-09": (2, 2),
+        "2024-10": (4, 1),
+    }
+
+
+def test_inkrementell_nutzt_cache_nur_auf_gleicher_seite(protokoll):
+    _, vorher = protokoll()
+    _, unveraendert = protokoll()
+    assert unveraendert == vorher
+
+    # September wächst um eine Seite: Oktober beginnt später und wird neu gerendert
+    insert_laermdaten_many(_zeilen("2024-09", 15, verursacher="Nowak"))
+    pfad, nachher = protokoll()
+    assert nachher["2024-09"]["seiten"] == 3
+    assert nachher["2024-10"]["erste_seite"] == 5
+    assert nachher["2024-10"]["hash"] == vorher["2024-10"]["hash"]
+    seiten = _seitenzahlen(pfad)
+    assert seiten == [[f"Seite {nr}"] for nr in range(1, 8)]
+
+
+def test_gestreamtes_protokoll_seiten_und_seitenzahlen(db, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(pdf_generation, "LOGO_PATH", str(tmp_path / "kein_logo.png"))
+    create_database()
+    anzahl = 300  # weit mehr als die Stichprobe für die Spaltenbreiten
+    assert anzahl > pdf_generation.SPALTEN_STICHPROBE
+    insert_laermdaten_many(
+        (
+            f"2024-09-{i // 12 + 1:02d}",
+            f"{i % 12 + 8}:00",
+            f"{i % 12 + 8}:10",
+            "Poltern",
+            "Melnik",
+            3,
+        )
+        for i in range(anzahl)
+    )
+
+    pfad = pdf_generation.generiere_protokoll(None)
+    seiten = [seite.extract_text() for seite in pypdf.PdfReader(pfad, strict=True).pages]
+    zeilen_je_seite = [text.count("Poltern") for text in seiten]
+    # Einleitung mit Tabellenanfang, 13 volle Tabellenseiten, Tabellenrest, Abschluss
+    assert len(seiten) == 16
+    assert zeilen_je_seite[1:14] == [21] * 13
+    assert zeilen_je_seite[-1] == 0
+    assert sum(zeilen_je_seite) == anzahl
+    assert [re.findall(r"Seite \d+", text) for text in seiten] == [
+        [f"Seite {nr}"] for nr in range(1, 17)
+    ]
+
+
+def test_laerm_zeile_mit_nicht_lesbaren_altwerten():
+    assert _laerm_zeile(("2024-11-05", "9:47", "10:05", 18.0, "Poltern", "Melnik", 4)) == [
+        "05.11.2024",
+        "09:47",
+        "10:05",
+        "18",
+        "Poltern",
+        "Melnik",
+        "4",
+    ]
+    assert _laerm_zeile(("Mitte Juli", "kurz", "22:xx", None, "Bohren", "Melnik", 2)) == [
+        "Mitte Juli",
+        "kurz",
+        "22:xx",
+        "",
+        "Bohren",
+        "Melnik",
+        "2",
+    ]
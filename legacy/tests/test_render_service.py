@@ -0,0 +1,41 @@
+import sys
+import threading
+
+from core.services.render_service import PlotRenderService
+
+
+def test_stop_meldet_noch_laufenden_worker():
+    gestartet, weiter = threading.Event(), threading.Event()
+
+    def render(on_progress, abbrechen):
+        gestartet.set()
+        weiter.wait(5)  # ein Plot lässt sich nicht mittendrin abbrechen
+        return True
+
+    service = PlotRenderService(render=render, debounce=0)
+    service.request()
+    assert gestartet.wait(5)
+
+    assert service.stop(timeout=0.05) is False
+    weiter.set()
+    assert service.stop(timeout=5) is True
+
+
+def test_stop_ohne_worker():
+    assert PlotRenderService(render=lambda **_: True).stop(timeout=0) is True
+
+
+def test_importfehler_landet_bei_on_done(monkeypatch):
+    monkeypatch.setitem(sys.modules, "core.services.data_processing", None)
+    fertig = threading.Event()
+    fehler = []
+
+    def on_done(e):
+        fehler.append(e)
+        fertig.set()
+
+    service = PlotRenderService(debounce=0)
+    service.request(on_done=on_done)
+    assert fertig.wait(5)
+    assert isinstance(fehler[0], ImportError)
+    assert service.stop(timeout=5) is True
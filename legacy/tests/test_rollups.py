@@ -0,0 +1,82 @@
+import pytest
+
+from core.services import statistics_service
+from infrastructure.database import aggregations, connection, rollups
+from infrastructure.database.database_setup import create_database, insert_laermdaten
+
+
+@pytest.fixture
+def daten(db):
+    create_database()
+    insert_laermdaten("2024-11-05", "20:35", "20:45", "Poltern", "Melnik", 4)
+    insert_laermdaten("2024-11-05", "22:00", "22:30", "Bohren", "Melnik", 2)
+    with connection.unit_of_work() as conn:
+        # Altzeile ohne lesbare Dauer
+        conn.execute(
+            "INSERT INTO laermdaten (datum, beginn, ende, dauer, grund, verursacher, auswirkung) "
+            "VALUES ('2024-11-05', '23:00', 'kurz', NULL, 'Trampeln', 'Melnik', 3)"
+        )
+    return db
+
+
+def test_durchschnitt_ohne_zeilen_ohne_dauer(daten):
+    assert statistics_service.get_average_duration() == 20.0
+    assert statistics_service.get_kennzahlen().durchschnitt_dauer == 20.0
+    assert statistics_service.get_average_auswirkung() == 3.0
+    assert aggregations.tageswerte() == [("2024-11-05", 3, 2, 40.0, 9)]
+    assert [zeile[2:] for zeile in aggregations.wochenstunden()] == [
+        (1, 1, 10.0, 4),
+        (1, 1, 30.0, 2),
+        (1, 0, 0.0, 3),
+    ]
+
+
+def test_trend_dauer_wie_aus_ereignissen(daten):
+    pd = pytest.importorskip("pandas")
+    from core.services import data_processing
+
+    tage = data_processing.load_tageswerte()
+    assert (tage["summe_dauer"] / tage["anzahl_dauer"]).tolist() == [20.0]
+
+    ereignisse = pd.DataFrame(
+        {
+            "datum": pd.to_datetime(["2024-11-05"] * 3),
+            "dauer": [10.0, 30.0, None],
+            "auswirkung": [4, 2, 3],
+        }
+    )
+    aus_ereignissen = data_processing.tageswerte_aus(ereignisse)
+    assert aus_ereignissen[data_processing.TAGES_SPALTEN].values.tolist() == (
+        tage[data_processing.TAGES_SPALTEN].values.tolist()
+    )
+
+
+def _summen(conn):
+    return {
+        tabelle: sorted(conn.execute(f"SELECT * FROM {tabelle}").fetchall())
+        for tabelle in rollups.ROLLUPS
+    }
+
+
+def test_trigger_wie_neuberechnung_nach_schreibzugriffen(daten):
+    with connection.unit_of_work() as conn:
+        conn.execute(
+            "INSERT INTO laermdaten (datum, beginn, ende, dauer, grund, verursacher, auswirkung) "
+            "VALUES ('2024-11-06', '07:15', '07:45', 30, 'Musik', 'Melnik', 5)"
+        )
+        # Dauer nachgetragen, Tag und Stunde verschoben, Auswirkung geändert
+        conn.execute(
+            "UPDATE laermdaten SET dauer = 5, datum = '2024-11-07', beginn = '08:00', "
+            "auswirkung = 1 WHERE beginn = '23:00'"
+        )
+        conn.execute("UPDATE laermdaten SET dauer = NULL WHERE beginn = '20:35'")
+        conn.execute("DELETE FROM laermdaten WHERE beginn = '22:00'")
+
+    conn = connection.get_connection()
+    assert rollups.pruefe(conn) == []
+    per_trigger = _summen(conn)
+    with connection.unit_of_work() as conn:
+        rollups.rebuild(conn)
+    assert _summen(connection.get_connection()) == per_trigger
+    # Leere Gruppen (22-Uhr-Stunde) sind gelöscht, nicht mit 0 stehen geblieben
+    assert all(zeile[-4] > 0 for zeilen in per_trigger.values() for zeile in zeilen)
@@ -0,0 +1,92 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine
+
+from infrastructure.database import connection, volltext
+from infrastructure.database.database_setup import (
+    create_database,
+    insert_laermdaten,
+    insert_massnahmen,
+)
+from mietstoerungsprotokoll.adapters.volltext import (
+    QUELLEN,
+    Volltextindex,
+    erstelle_volltext,
+)
+from mietstoerungsprotokoll.use_cases.volltextsuche import suche
+
+TABELLEN = [
+    "CREATE TABLE laermdaten (id INTEGER PRIMARY KEY, grund TEXT, verursacher TEXT)",
+    "CREATE TABLE massnahmen (id INTEGER PRIMARY KEY, massnahme TEXT, ergebnis TEXT)",
+    "CREATE TABLE stoerungseintrag (id INTEGER PRIMARY KEY, beschreibung TEXT, zeuge TEXT)",
+]
+
+
+def _sqlite_master(pfad):
+    conn = sqlite3.connect(pfad)
+    try:
+        return conn.execute(
+            "SELECT type, name, tbl_name, sql FROM sqlite_master ORDER BY name"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def test_beide_seiten_legen_denselben_index_an(tmp_path):
+    assert volltext.INDIZES == QUELLEN
+    legacy, neu = str(tmp_path / "legacy.db"), str(tmp_path / "neu.db")
+    for pfad in (legacy, neu):
+        conn = sqlite3.connect(pfad)
+        for sql in TABELLEN:
+            conn.execute(sql)
+        conn.commit()
+        conn.close()
+
+    conn = sqlite3.connect(legacy)
+    volltext.erstelle(conn)
+    conn.commit()
+    conn.close()
+    engine = create_engine(f"sqlite:///{neu}")
+    erstelle_volltext(engine)
+    engine.dispose()
+
+    assert _sqlite_master(legacy) == _sqlite_master(neu)
+
+
+@pytest.fixture
+def index(db):
+    create_database()
+    insert_laermdaten("2024-11-05", "20:35", "20:38", "Poltern", "Melnik", 4)
+    insert_laermdaten("2024-11-07", "9:05", "9:10", "Poltern", "Melnik", 3)
+    insert_massnahmen("6.11.2024", "Brief wegen Poltern", None)
+    engine = create_engine(f"sqlite:///{db}")
+    yield Volltextindex(engine)
+    engine.dispose()
+
+
+def test_gespiegelte_altzeilen_zaehlen_einmal(index):
+    assert suche(index, "Poltern").gesamt == 3
+    assert {t.quelle for t in suche(index, "Poltern").treffer} == {"stoerungseintrag"}
+    assert suche(index, "Poltern", quellen={"laermdaten"}).gesamt == 2
+
+    # nicht gespiegelte Altzeile (z. B. Abgleich noch nicht gelaufen): über ihre Quelle
+    with connection.unit_of_work() as conn:
+        conn.execute("DROP TRIGGER laermdaten_abgleich_insert")
+    insert_laermdaten("2024-11-08", "22:00", "22:10", "Poltern", "Melnik", 2)
+    ergebnis = suche(index, "Poltern")
+    assert ergebnis.gesamt == 4
+    assert [t.quelle for t in ergebnis.treffer].count("laermdaten") == 1
+
+
+def test_ohne_ranking_neueste_zuerst_ueber_alle_quellen(index):
+    treffer = index.suchen('"Poltern"', set(QUELLEN), nach_relevanz=False)
+    # Altzeile und ihr Spiegel stehen direkt hintereinander
+    assert [(t.quelle, t.datum) for t in treffer] == [
+        ("stoerungseintrag", "2024-11-07 09:05"),
+        ("laermdaten", "2024-11-07 9:05"),
+        ("massnahmen", "6.11.2024"),
+        ("stoerungseintrag", "2024-11-06 00:00"),
+        ("stoerungseintrag", "2024-11-05 20:35"),
+        ("laermdaten", "2024-11-05 20:35"),
+    ]
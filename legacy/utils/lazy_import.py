@@ -0,0 +1,39 @@
+# utils/lazy_import.py
+"""
+Verzögertes Importieren schwerer Bibliotheken (pandas, matplotlib, seaborn, …).
+Das Modul wird erst beim ersten Attributzugriff geladen, nicht beim Import
+des aufrufenden Moduls – das hält den App-Start schnell.
+"""
+
+import importlib
+import threading
+from types import ModuleType
+from typing import Optional
+
+
+class LazyModule(ModuleType):
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        module: Optional[ModuleType] = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> ModuleType:
+    """z. B. pd = lazy_import("pandas") – lädt pandas erst bei pd.DataFrame(...)."""
+    return LazyModule(name)
@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import tempfile
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from enum import StrEnum, auto
+from pathlib import Path
+from typing import IO
+
+# Bytes je Lesevorgang beim Hashen und Kopieren – große Videos liegen nie ganz im Speicher
+LESE_BLOCK = 1 << 20
+
+# Vorschau-Cache: Obergrenze und Ziel nach dem Aufräumen (Abstand, damit nicht
+# jede neue Vorschau wieder einen Verzeichnis-Scan auslöst)
+CACHE_MAX_BYTES = 256 << 20
+CACHE_ZIEL_ANTEIL = 0.9
+
+VIDEO_ENDUNGEN = {".mp4", ".m4v", ".mov", ".avi", ".mkv", ".webm", ".3gp"}
+_BILD_ENDUNGEN = {"JPEG": ".jpg", "PNG": ".png", "WEBP": ".webp", "GIF": ".gif"}
+
+
+class Medientyp(StrEnum):
+    BILD = auto()
+    VIDEO = auto()
+
+
+class Vorschaugroesse(StrEnum):
+    LISTE = auto()  # Kachel in Listenansichten
+    PDF = auto()  # Einbettung in PDF-Exporte
+
+
+# Längste Kante in Pixeln. PDF: volle Satzspiegelbreite (~17 cm) bei 150 dpi
+KANTE = {Vorschaugroesse.LISTE: 256, Vorschaugroesse.PDF: 1024}
+
+
+@dataclass(frozen=True)
+class Anhang:
+    """Ein abgelegter Anhang. pfad kommt so in Stoerungseintrag.foto_pfad/video_pfad."""
+
+    sha256: str
+    pfad: str  # relativ zum Speicher, z. B. "blobs/3a/3a7f….jpg"
+    medientyp: Medientyp
+    groesse: int  # Bytes
+    breite: int | None = None  # nur Bilder, aus dem Dateikopf
+    hoehe: int | None = None
+    neu: bool = True  # False: gleicher Inhalt lag schon im Speicher
+
+
+# ----------------------------------------------------------------------
+# 1. Vorschau-Cache (LRU auf der Platte)
+# ----------------------------------------------------------------------
+class Vorschaucache:
+    """
+    Dateien unter verzeichnis, zusammen höchstens max_bytes groß. Jeder Zugriff
+    setzt die mtime neu; wird es zu voll, fliegen die am längsten nicht
+    benutzten Dateien raus (atime ist wegen noatime/relatime unzuverlässig).
+    """
+
+    def __init__(self, verzeichnis: Path, max_bytes: int = CACHE_MAX_BYTES) -> None:
+        self.verzeichnis = verzeichnis
+        self.max_bytes = max_bytes
+        self._belegt: int | None = None  # erst beim ersten Schreiben gezählt
+
+    def holen(self, schluessel: str) -> Path | None:
+        pfad = self.verzeichnis / schluessel
+        try:
+            os.utime(pfad)
+        except FileNotFoundError:
+            return None
+        return pfad
+
+    def ablegen(self, schluessel: str, daten: bytes) -> Path:
+        pfad = self.verzeichnis / schluessel
+        _atomar_schreiben(pfad, daten)
+        if self._belegt is None:
+            self._belegt = sum(groesse for _, _, groesse in self._dateien())
+        else:
+            self._belegt += len(daten)
+        if self._belegt > self.max_bytes:
+            self._verkleinern()
+        return pfad
+
+    def entfernen(self, schluessel: str) -> None:
+        """Einen Eintrag löschen (fehlt er, passiert nichts)."""
+        pfad = self.verzeichnis / schluessel
+        try:
+            groesse = pfad.stat().st_size
+            pfad.unlink()
+        except FileNotFoundError:
+            return
+        if self._belegt is not None:
+            self._belegt -= groesse
+
+    def _dateien(self) -> Iterator[tuple[Path, float, int]]:
+        for pfad in self.verzeichnis.rglob("*"):
+            try:
+                info = pfad.stat()
+            except FileNotFoundError:
+                continue  # von einem anderen Prozess schon verdrängt
+            if pfad.is_file():
+                yield pfad, info.st_mtime, info.st_size
+
+    def _verkleinern(self) -> None:
+        dateien = sorted(self._dateien(), key=lambda datei: datei[1])
+        belegt = sum(groesse for _, _, groesse in dateien)
+        ziel = self.max_bytes * CACHE_ZIEL_ANTEIL
+        for pfad, _, groesse in dateien:
+            if belegt <= ziel:
+                break
+            pfad.unlink(missing_ok=True)
+            belegt -= groesse
+        self._belegt = belegt
+
+
+# ----------------------------------------------------------------------
+# 2. Anhang-Speicher
+# ----------------------------------------------------------------------
+class AnhangSpeicher:
+    """
+    Inhaltsadressierte Ablage für Fotos und Videos:
+        blobs/<2 Zeichen>/<sha256><Endung>       – jeder Inhalt genau einmal
+        vorschau/<Größe>/<2 Zeichen>/<sha256>.jpg – Vorschaubilder (Vorschaucache)
+        papierkorb/<2 Zeichen>/<sha256><Endung>  – von unbenutzte_entfernen aussortiert
+    Derselbe Inhalt an mehreren Einträgen liegt nur einmal auf der Platte.
+    Listen und PDF-Exporte nehmen vorschau() – die Originale werden dafür nie
+    dekodiert, Vorschaubilder entstehen schon beim Ablegen.
+    """
+
+    def __init__(self, wurzel: Path | str = "data/anhaenge", cache_bytes: int = CACHE_MAX_BYTES):
+        self.wurzel = Path(wurzel)
+        self.cache = Vorschaucache(self.wurzel / "vorschau", cache_bytes)
+
+    # ------------------------------------------------------------------
+    # Ablegen
+    # ------------------------------------------------------------------
+    def ablegen(self, quelle: Path | str | IO[bytes], dateiname: str | None = None) -> Anhang:
+        """
+        Datei (Pfad) oder Datenstrom ablegen. Bei einem Pfad wird erst nur
+        gehasht und nur ein neuer Inhalt kopiert – ein doppelt angehängtes
+        Video kostet so einen Lesedurchgang und keinen Schreibvorgang.
+        dateiname (bei Datenströmen) liefert die Endung für Videos.
+        Raises ValueError: weder lesbares Bild noch bekanntes Videoformat.
+        """
+        if isinstance(quelle, (str, Path)):
+            quelle = Path(quelle)
+            with quelle.open("rb") as datei:
+                sha256, _ = _hashen(datei)
+            if (vorhanden := self._blob(sha256)) is not None:
+                return self._anhang(vorhanden, neu=False)
+            with quelle.open("rb") as datei:
+                return self._uebernehmen(datei, dateiname or quelle.name, erwartet=sha256)
+        return self._uebernehmen(quelle, dateiname or "")
+
+    def _uebernehmen(self, daten: IO[bytes], dateiname: str, erwartet: str | None = None) -> Anhang:
+        """Strom in eine temporäre Datei kopieren (dabei hashen), dann an seinen Platz."""
+        tmp_verzeichnis = self.wurzel / "tmp"
+        tmp_verzeichnis.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=tmp_verzeichnis, delete=False) as tmp:
+            sha256, _ = _hashen(daten, tmp)
+        tmp_pfad = Path(tmp.name)
+        try:
+            if erwartet is not None and sha256 != erwartet:
+                raise ValueError(f"{dateiname}: Datei hat sich beim Ablegen geändert")
+            if (vorhanden := self._blob(sha256)) is not None:
+                return self._anhang(vorhanden, neu=False)
+            endung = _endung(tmp_pfad, dateiname)
+            ziel = self.wurzel / "blobs" / sha256[:2] / f"{sha256}{endung}"
+            ziel.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_pfad, ziel)
+        finally:
+            tmp_pfad.unlink(missing_ok=True)
+        anhang = self._anhang(ziel, neu=True)
+        if anhang.medientyp is Medientyp.BILD:
+            try:
+                # groß zuerst: die Listen-Vorschau wird dann aus der PDF-Vorschau verkleinert
+                for groesse in sorted(Vorschaugroesse, key=KANTE.__getitem__, reverse=True):
+                    self.vorschau(anhang.pfad, groesse)
+            except OSError as e:
+                # Kopf lesbar, Pixel nicht (z. B. abgeschnittenes JPEG): nichts zurücklassen
+                for groesse in Vorschaugroesse:
+                    self.cache.entfernen(_schluessel(sha256, groesse))
+                ziel.unlink(missing_ok=True)
+                raise ValueError(f"{dateiname or 'Anhang'}: Bild nicht lesbar ({e})") from e
+        return anhang
+
+    # ------------------------------------------------------------------
+    # Lesen
+    # ------------------------------------------------------------------
+    def pfad(self, anhang_pfad: str) -> Path:
+        """Absoluter Pfad des Originals (z. B. zum Öffnen in einem Betrachter)."""
+        return self.wurzel / anhang_pfad
+
+    def vorschau(self, anhang_pfad: str, groesse: Vorschaugroesse) -> Path | None:
+        """
+        JPEG-Vorschau (längste Kante KANTE[groesse]) zu foto_pfad. Aus dem Cache;
+        fehlt sie (verdrängt), wird sie aus der nächstgrößeren Vorschau erzeugt
+        und nur ohne eine solche aus dem Original. None für Videos und für
+        Pfade, die nicht in diesem Speicher liegen (alte Rohpfade).
+        """
+        original = self.pfad(anhang_pfad)
+        if original.suffix.lower() in VIDEO_ENDUNGEN or not _ist_blob(anhang_pfad):
+            return None
+        sha256 = original.stem
+        if (treffer := self.cache.holen(_schluessel(sha256, groesse))) is not None:
+            return treffer
+        quelle = original
+        for groessere in sorted(Vorschaugroesse, key=KANTE.__getitem__):
+            if KANTE[groessere] > KANTE[groesse]:
+                if (treffer := self.cache.holen(_schluessel(sha256, groessere))) is not None:
+                    quelle = treffer
+                    break
+        if not quelle.exists():
+            return None
+        daten = _verkleinert(quelle, KANTE[groesse])
+        return self.cache.ablegen(_schluessel(sha256, groesse), daten)
+
+    # ------------------------------------------------------------------
+    # Aufräumen
+    # ------------------------------------------------------------------
+    def unbenutzte_entfernen(
+        self, *, foto_pfade: Iterable[str | None], video_pfade: Iterable[str | None]
+    ) -> int:
+        """
+        Verschiebt Originale, auf die weder ein foto_pfad noch ein video_pfad
+        mehr zeigt, in den Papierkorb und löscht ihre Vorschaubilder. Beide
+        Spalten müssen vollständig übergeben werden – fehlt eine, wären alle ihre
+        Anhänge "unbenutzt". Anhänge sind Beweismittel: endgültig löscht erst
+        papierkorb_leeren(). Rückgabe: Anzahl aussortierter Originale.
+        Nicht parallel zu ablegen() aufrufen.
+        """
+        behalten = {pfad for pfade in (foto_pfade, video_pfade) for pfad in pfade if pfad}
+        aussortiert = 0
+        for blob in (self.wurzel / "blobs").glob("*/*"):
+            if blob.relative_to(self.wurzel).as_posix() in behalten:
+                continue
+            ziel = self.wurzel / "papierkorb" / blob.parent.name / blob.name
+            ziel.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(blob, ziel)
+            for groesse in Vorschaugroesse:
+                self.cache.entfernen(_schluessel(blob.stem, groesse))
+            aussortiert += 1
+        return aussortiert
+
+    def papierkorb_leeren(self) -> int:
+        """Löscht die aussortierten Originale endgültig. Rückgabe: Anzahl."""
+        geloescht = 0
+        for datei in (self.wurzel / "papierkorb").glob("*/*"):
+            datei.unlink(missing_ok=True)
+            geloescht += 1
+        return geloescht
+
+    # ------------------------------------------------------------------
+    # intern
+    # ------------------------------------------------------------------
+    def _blob(self, sha256: str) -> Path | None:
+        return next((self.wurzel / "blobs" / sha256[:2]).glob(f"{sha256}.*"), None)
+
+    def _anhang(self, blob: Path, neu: bool) -> Anhang:
+        pfad = blob.relative_to(self.wurzel).as_posix()
+        groesse = blob.stat().st_size
+        if blob.suffix.lower() in VIDEO_ENDUNGEN:
+            return Anhang(blob.stem, pfad, Medientyp.VIDEO, groesse, neu=neu)
+        breite, hoehe = _bildgroesse(blob) or (None, None)
+        return Anhang(blob.stem, pfad, Medientyp.BILD, groesse, breite, hoehe, neu)
+
+
+# ----------------------------------------------------------------------
+# 3. Hilfsfunktionen
+# ----------------------------------------------------------------------
+def _hashen(quelle: IO[bytes], ziel: IO[bytes] | None = None) -> tuple[str, int]:
+    """SHA-256 und Länge blockweise; ziel bekommt die Bytes dabei mitgeschrieben."""
+    sha = hashlib.sha256()
+    laenge = 0
+    while block := quelle.read(LESE_BLOCK):
+        sha.update(block)
+        laenge += len(block)
+        if ziel is not None:
+            ziel.write(block)
+    return sha.hexdigest(), laenge
+
+
+def _bildgroesse(pfad: Path) -> tuple[int, int] | None:
+    """(Breite, Höhe) aus dem Dateikopf – ohne die Pixel zu dekodieren."""
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        with Image.open(pfad) as bild:
+            return bild.size
+    except UnidentifiedImageError:
+        return None
+
+
+def _endung(pfad: Path, dateiname: str) -> str:
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        with Image.open(pfad) as bild:
+            return _BILD_ENDUNGEN.get(bild.format or "", f".{(bild.format or 'bild').lower()}")
+    except UnidentifiedImageError:
+        pass
+    endung = Path(dateiname).suffix.lower()
+    if endung in VIDEO_ENDUNGEN:
+        return endung
+    raise ValueError(f"{dateiname or 'Anhang'}: weder Bild noch bekanntes Videoformat")
+
+
+def _verkleinert(quelle: Path, kante: int) -> bytes:
+    """
+    Vorschau als JPEG-Bytes. draft() lässt den JPEG-Decoder direkt in 1/2, 1/4
+    oder 1/8 der Auflösung dekodieren – ein 12-MP-Foto wird so nie in voller
+    Größe in den Speicher geholt. Die EXIF-Drehung wird übernommen.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(quelle) as bild:
+        bild.draft("RGB", (kante, kante))
+        vorschau = ImageOps.exif_transpose(bild)
+        vorschau.thumbnail((kante, kante), reducing_gap=2.0)
+        puffer = io.BytesIO()
+        vorschau.convert("RGB").save(puffer, "JPEG", quality=85, optimize=True)
+    return puffer.getvalue()
+
+
+def _schluessel(sha256: str, groesse: Vorschaugroesse) -> str:
+    return f"{groesse}/{sha256[:2]}/{sha256}.jpg"
+
+
+def _ist_blob(anhang_pfad: str) -> bool:
+    teile = Path(anhang_pfad).parts
+    return len(teile) == 3 and teile[0] == "blobs" and Path(teile[2]).stem.startswith(teile[1])
+
+
+def _atomar_schreiben(pfad: Path, daten: bytes) -> None:
+    pfad.parent.mkdir(parents=True, exist_ok=True)
+    tmp = pfad.with_suffix(pfad.suffix + ".tmp")
+    tmp.write_bytes(daten)
+    os.replace(tmp, pfad)
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+from collections.abc import Collection, Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from typing import Any, Generic, TypeVar
+
+import numpy as np
+import numpy.typing as npt
+import sqlalchemy as sa
+from pydantic import create_model
+from sqlalchemy import Engine, Row, Select, String, func, insert, tuple_, type_coerce
+from sqlmodel import Session, SQLModel, col, create_engine, select
+
+from mietstoerungsprotokoll.adapters.volltext import erstelle_volltext
+from mietstoerungsprotokoll.domain.models import Stoerungseintrag, Stoerungstyp
+from mietstoerungsprotokoll.domain.projektionen import EINTRAG_DTYPE, TYPEN, Listeneintrag
+
+T = TypeVar("T")
+S = TypeVar("S", bound=Select[Any])
+
+# Spalten für Listenansichten – ohne beschreibung (bis 2000 Zeichen). Zeitpunkte
+# und typ kommen als Rohtext aus SQLite ("YYYY-MM-DD HH:MM:SS.ffffff" bzw. der
+# Enum-Name): ohne die Ergebnis-Konvertierung von SQLAlchemy, umgewandelt wird
+# gebündelt in _listeneintrag bzw. _als_spalten
+LISTEN_SPALTEN = (
+    col(Stoerungseintrag.id),
+    type_coerce(col(Stoerungseintrag.datum), String),
+    type_coerce(col(Stoerungseintrag.typ), String),
+    col(Stoerungseintrag.auswirkung),
+    type_coerce(col(Stoerungseintrag.beginn), String),
+    type_coerce(col(Stoerungseintrag.ende), String),
+    col(Stoerungseintrag.foto_pfad),
+)
+
+# Zeilen je Block beim Lesen in Spalten-Arrays
+SPALTEN_CHUNK = 10_000
+
+# Zeilen je executemany-Aufruf beim Massen-Insert
+BULK_CHUNK = 500
+
+
+# ----------------------------------------------------------------------
+# 1. Engine
+# ----------------------------------------------------------------------
+def erstelle_engine(url: str = "sqlite:///database/protokoll.db") -> Engine:
+    """Engine für die Protokoll-DB; legt fehlende Tabellen und Indizes an (inkl. Volltext)."""
+    engine = create_engine(url)
+    SQLModel.metadata.create_all(engine)
+    erstelle_volltext(engine)
+    return engine
+
+
+# ----------------------------------------------------------------------
+# 2. Filter und Seiten
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class Filter:
+    """
+    Einschränkung der Einträge. Alle Felder optional, kombiniert per UND.
+    von ist inklusive, bis exklusive – so schließen Zeiträume lückenlos aneinander an.
+    """
+
+    typen: Collection[Stoerungstyp] | None = None
+    von: datetime | None = None
+    bis: datetime | None = None
+
+
+@dataclass(frozen=True)
+class Position:
+    """Keyset-Position: letzter gesehener Eintrag einer Seite (datum, id)."""
+
+    datum: datetime
+    id: int
+
+
+@dataclass(frozen=True)
+class Seite(Generic[T]):
+    eintraege: list[T]
+    weiter: Position | None  # None = keine weiteren Einträge
+
+
+# ----------------------------------------------------------------------
+# 3. Repository
+# ----------------------------------------------------------------------
+class StoerungseintragRepository:
+    """
+    Zugriff auf Störungseinträge.
+    Massen-Inserts laufen über Core-Insert statt über die Session (keine
+    ORM-Objekte, kein Identity-Map-Abgleich); Listen blättern per Keyset auf
+    (datum, id) statt OFFSET – jede Seite kostet gleich viel, egal wie weit hinten.
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+
+    # ------------------------------------------------------------------
+    # Schreiben
+    # ------------------------------------------------------------------
+    def hinzufuegen(self, eintrag: Stoerungseintrag) -> Stoerungseintrag:
+        """Einzelner Eintrag über die Session; liefert ihn mit vergebener id zurück."""
+        with Session(self.engine) as session:
+            session.add(eintrag)
+            session.commit()
+            session.refresh(eintrag)
+        return eintrag
+
+    def hinzufuegen_viele(
+        self,
+        eintraege: Iterable[Stoerungseintrag | Mapping[str, Any]],
+        chunk_size: int = BULK_CHUNK,
+    ) -> int:
+        """
+        Viele Einträge in einer Transaktion: ein kompiliertes Core-Insert, je
+        chunk_size Zeilen als Parameterliste (executemany). Bewusst nicht
+        insert().values([...]): das mehrzeilige VALUES wird für jeden Block neu
+        kompiliert und war ~10× langsamer. Rückgabe: Anzahl eingefügter Zeilen.
+        Einträge dürfen Modelle oder Dicts mit den Feldnamen sein; beide werden
+        validiert (pydantic.ValidationError, dann wird nichts eingefügt), fehlende
+        Felder bekommen die Defaults des Modells.
+        """
+        zeilen = (_als_zeile(e) for e in eintraege)
+        anzahl = 0
+        anweisung = insert(Stoerungseintrag)
+        with self.engine.begin() as conn:
+            for block in _bloecke(zeilen, chunk_size):
+                conn.execute(anweisung, block)
+                anzahl += len(block)
+        return anzahl
+
+    # ------------------------------------------------------------------
+    # Lesen
+    # ------------------------------------------------------------------
+    def holen(self, eintrag_id: int) -> Stoerungseintrag | None:
+        with Session(self.engine) as session:
+            return session.get(Stoerungseintrag, eintrag_id)
+
+    def seite(
+        self,
+        filter: Filter | None = None,
+        nach: Position | None = None,
+        limit: int = 50,
+        absteigend: bool = False,
+    ) -> Seite[Stoerungseintrag]:
+        """Vollständige Einträge (inkl. beschreibung), limit Stück ab Position nach."""
+        abfrage = _seitenabfrage(select(Stoerungseintrag), filter, nach, limit, absteigend)
+        with Session(self.engine) as session:
+            eintraege = list(session.exec(abfrage).all())
+        return Seite(eintraege, _weiter(eintraege, limit))
+
+    def liste(
+        self,
+        filter: Filter | None = None,
+        nach: Position | None = None,
+        limit: int = 50,
+        absteigend: bool = False,
+    ) -> Seite[Listeneintrag]:
+        """
+        Wie seite(), aber als Listeneintrag (id, datum, typ, auswirkung, beginn,
+        ende, foto_pfad) – ohne Modell-Objekte, ohne Validierung und ohne beschreibung.
+        """
+        abfrage = _seitenabfrage(sa.select(*LISTEN_SPALTEN), filter, nach, limit, absteigend)
+        with self.engine.connect() as conn:
+            eintraege = [_listeneintrag(zeile) for zeile in conn.execute(abfrage)]
+        return Seite(eintraege, _weiter(eintraege, limit))
+
+    def alle(self, filter: Filter | None = None, limit: int = 1000) -> Iterator[Listeneintrag]:
+        """Alle Listenzeilen chronologisch, seitenweise nachgeladen."""
+        nach: Position | None = None
+        while True:
+            seite = self.liste(filter, nach, limit)
+            yield from seite.eintraege
+            if seite.weiter is None:
+                return
+            nach = seite.weiter
+
+    def spalten(self, filter: Filter | None = None) -> npt.NDArray[np.void]:
+        """
+        Alle passenden Einträge chronologisch als strukturiertes Array
+        (EINTRAG_DTYPE) für Auswertungen, z. B. mit projektionen.dauer_in_minuten.
+        Gelesen wird blockweise; Zwischenobjekte gibt es nur je Block.
+        """
+        datum, eintrag_id = col(Stoerungseintrag.datum), col(Stoerungseintrag.id)
+        abfrage = _gefiltert(sa.select(*LISTEN_SPALTEN), filter).order_by(datum, eintrag_id)
+        with self.engine.connect() as conn:
+            ergebnis = conn.execution_options(yield_per=SPALTEN_CHUNK).execute(abfrage)
+            bloecke = [_als_spalten(block) for block in ergebnis.partitions()]
+        if not bloecke:
+            return np.empty(0, dtype=EINTRAG_DTYPE)
+        return np.concatenate(bloecke)
+
+    def anzahl(self, filter: Filter | None = None) -> int:
+        abfrage = _gefiltert(select(func.count()).select_from(Stoerungseintrag), filter)
+        with self.engine.connect() as conn:
+            return int(conn.execute(abfrage).scalar_one())
+
+
+# ----------------------------------------------------------------------
+# 4. Hilfsfunktionen
+# ----------------------------------------------------------------------
+_FELDER = [name for name in Stoerungseintrag.model_fields if name != "id"]
+
+
+def _als_zeile(eintrag: Stoerungseintrag | Mapping[str, Any]) -> dict[str, Any]:
+    """
+    Ein Eintrag als vollständiges Dict aller Spalten (gleiche Schlüssel je Zeile).
+    Modelle und Dicts laufen durch die Validierung des Modells (auswirkung 1–5,
+    beschreibung nicht leer, ...) – das Core-Insert selbst prüft nichts davon, und
+    table=True-Modelle validieren auch beim Erzeugen nicht.
+    """
+    geprueft = _Pruefung.model_validate(
+        eintrag, from_attributes=isinstance(eintrag, Stoerungseintrag)
+    )
+    return {name: getattr(geprueft, name) for name in _FELDER}
+
+
+# Felder und Regeln von Stoerungseintrag ohne die SQLAlchemy-Instrumentierung des
+# Tabellenmodells: Stoerungseintrag.model_validate kostet ~70 µs je Zeile, das hier ~7 µs
+_PRUEF_FELDER: dict[str, Any] = {
+    name: (feld.annotation, feld) for name, feld in Stoerungseintrag.model_fields.items()
+}
+_Pruefung = create_model("Stoerungseintrag", **_PRUEF_FELDER)
+
+
+_TYP_NACH_NAME = {typ.name: typ for typ in TYPEN}
+_CODE_NACH_NAME = {typ.name: code for code, typ in enumerate(TYPEN)}
+_datum = datetime.fromisoformat
+
+
+def _listeneintrag(zeile: Row[Any]) -> Listeneintrag:
+    eintrag_id, datum, typ, auswirkung, beginn, ende, foto_pfad = zeile
+    return Listeneintrag(
+        eintrag_id,
+        _datum(datum),
+        _TYP_NACH_NAME[typ],
+        auswirkung,
+        _datum(beginn) if beginn else None,
+        _datum(ende) if ende else None,
+        foto_pfad,
+    )
+
+
+def _als_spalten(zeilen: Sequence[Row[Any]]) -> npt.NDArray[np.void]:
+    """Rohzeilen → strukturiertes Array; Zeitpunkte parst NumPy spaltenweise (None → NaT)."""
+    eintrag_id, datum, typ, auswirkung, beginn, ende, _ = zip(*zeilen, strict=True)
+    spalten = np.empty(len(zeilen), dtype=EINTRAG_DTYPE)
+    spalten["id"] = eintrag_id
+    spalten["datum"] = np.array(datum, dtype=object)
+    spalten["typ"] = [_CODE_NACH_NAME[name] for name in typ]
+    spalten["auswirkung"] = [wert or 0 for wert in auswirkung]
+    spalten["beginn"] = np.array(beginn, dtype=object)
+    spalten["ende"] = np.array(ende, dtype=object)
+    return spalten
+
+
+def _bloecke(zeilen: Iterable[T], groesse: int) -> Iterator[list[T]]:
+    it = iter(zeilen)
+    while block := list(islice(it, groesse)):
+        yield block
+
+
+def _gefiltert(abfrage: S, filter: Filter | None) -> S:
+    """WHERE-Bedingungen auf typ (Index ix_..._typ) und datum (Index ix_..._datum)."""
+    if filter is None:
+        return abfrage
+    if filter.typen is not None:
+        abfrage = abfrage.where(col(Stoerungseintrag.typ).in_(list(filter.typen)))
+    if filter.von is not None:
+        abfrage = abfrage.where(col(Stoerungseintrag.datum) >= filter.von)
+    if filter.bis is not None:
+        abfrage = abfrage.where(col(Stoerungseintrag.datum) < filter.bis)
+    return abfrage
+
+
+def _seitenabfrage(
+    abfrage: S,
+    filter: Filter | None,
+    nach: Position | None,
+    limit: int,
+    absteigend: bool,
+) -> S:
+    datum, eintrag_id = col(Stoerungseintrag.datum), col(Stoerungseintrag.id)
+    abfrage = _gefiltert(abfrage, filter)
+    if nach is not None:
+        # Zeilenwert-Vergleich: SQLite nutzt dafür den Index auf datum (enthält die rowid)
+        schluessel, position = tuple_(datum, eintrag_id), (nach.datum, nach.id)
+        abfrage = abfrage.where(schluessel < position if absteigend else schluessel > position)
+    if absteigend:
+        return abfrage.order_by(datum.desc(), eintrag_id.desc()).limit(limit)
+    return abfrage.order_by(datum, eintrag_id).limit(limit)
+
+
+def _weiter(eintraege: Sequence[Any], limit: int) -> Position | None:
+    """Position nach dem letzten Eintrag, falls die Seite voll ist."""
+    if len(eintraege) < limit or not eintraege:
+        return None
+    letzter = eintraege[-1]
+    return Position(letzter.datum, letzter.id)
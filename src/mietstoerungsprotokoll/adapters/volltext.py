@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+from collections.abc import Collection
+from typing import NamedTuple
+
+from sqlalchemy import Connection, Engine, TextClause, bindparam, text
+
+# Tabelle → indizierte Spalten. Dasselbe Schema legt die Legacy-Migration 8 an
+# (legacy/infrastructure/database/volltext.py, zeichengleiche DDL) – beide
+# Seiten finden ihre Indizes gegenseitig über IF NOT EXISTS.
+QUELLEN: dict[str, tuple[str, ...]] = {
+    "laermdaten": ("grund", "verursacher"),
+    "massnahmen": ("massnahme", "ergebnis"),
+    "stoerungseintrag": ("beschreibung", "zeuge"),
+}
+
+# Umlaute falten: "Lärm" findet "Larm" und umgekehrt
+TOKENIZER = "unicode61 remove_diacritics 2"
+
+# Anzeigedatum je Quelle (t = Tabelle): Störungseinträge ohne Sekunden,
+# Lärm mit Beginn, Maßnahmen als Freitext wie erfasst
+_DATUM = {
+    "laermdaten": "t.datum || ' ' || t.beginn",
+    "massnahmen": "t.datum",
+    "stoerungseintrag": "substr(t.datum, 1, 16)",
+}
+
+# Vergleichbarer Zeitpunkt je Quelle (Text, "YYYY-MM-DD HH:MM..."), für "neueste
+# zuerst" über alle Quellen. Maßnahmen-Daten sind Freitext: gelesen werden sie
+# über die Sicht der Legacy-Migration (fehlt sie, sortiert der Freitext)
+_ZEITPUNKT = {
+    "laermdaten": "t.datum || ' ' || substr('0' || t.beginn, -5)",
+    "massnahmen": "(SELECT v.datum FROM massnahmen_als_eintrag AS v WHERE v.quelle_id = t.id)",
+    "stoerungseintrag": "t.datum",
+}
+# Index in Zeitpunkt-Reihenfolge: ohne Ranking wird er rückwärts gelesen, bis
+# genug Treffer gefunden sind, statt alle Treffer zu sortieren
+_ZEITPUNKT_INDEX = {"stoerungseintrag": "ix_stoerungseintrag_datum"}
+
+# Die Legacy-Migration spiegelt Altzeilen nach stoerungseintrag und vermerkt sie
+# hier; ohne ausdrückliche quellen werden sie nur dort gefunden, nicht doppelt
+HERKUNFT = "stoerungseintrag_herkunft"
+
+
+class Treffer(NamedTuple):
+    """Ein Suchtreffer; ausschnitt enthält die Fundstellen zwischen den Markierungen."""
+
+    quelle: str
+    id: int
+    datum: str
+    rang: float  # bm25: kleiner = besser
+    ausschnitt: str
+
+
+# ----------------------------------------------------------------------
+# 1. Index anlegen
+# ----------------------------------------------------------------------
+def erstelle_volltext(engine: Engine) -> list[str]:
+    """
+    FTS5-Tabellen (external content, rowid = id) und Trigger für alle
+    vorhandenen Tabellen aus QUELLEN; neue Indizes werden aus dem Bestand
+    gefüllt. Rückgabe: Tabellen, deren Index neu angelegt wurde.
+    """
+    with engine.begin() as conn:
+        vorhanden = set(
+            conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'")).scalars()
+        )
+        neu = []
+        for tabelle, spalten in QUELLEN.items():
+            if tabelle not in vorhanden:
+                continue
+            for anweisung in _ddl(tabelle, spalten):
+                conn.execute(text(anweisung))
+            if f"{tabelle}_fts" not in vorhanden:
+                conn.execute(text(f"INSERT INTO {tabelle}_fts ({tabelle}_fts) VALUES ('rebuild')"))
+                neu.append(tabelle)
+    return neu
+
+
+def _ddl(tabelle: str, spalten: tuple[str, ...]) -> list[str]:
+    fts, liste = f"{tabelle}_fts", ", ".join(spalten)
+    neu = f"INSERT INTO {fts} (rowid, {liste}) VALUES (NEW.id, {_werte(spalten, 'NEW.')});"
+    alt = (
+        f"INSERT INTO {fts} ({fts}, rowid, {liste}) "
+        f"VALUES ('delete', OLD.id, {_werte(spalten, 'OLD.')});"
+    )
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({liste}, "
+        f"content='{tabelle}', content_rowid='id', tokenize='{TOKENIZER}')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {tabelle} BEGIN {neu} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {tabelle} BEGIN {alt} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF {liste} ON {tabelle} "
+        f"BEGIN {alt} {neu} END",
+    ]
+
+
+def _werte(spalten: tuple[str, ...], p: str) -> str:
+    return ", ".join(f"{p}{spalte}" for spalte in spalten)
+
+
+# ----------------------------------------------------------------------
+# 2. Suchen
+# ----------------------------------------------------------------------
+class Volltextindex:
+    """
+    Suche in den FTS5-Indizes. ausdruck ist ein FTS5-MATCH-Ausdruck (aus
+    Benutzereingaben bildet ihn use_cases/volltextsuche.suchausdruck). Die
+    Kosten hängen von der Zahl der Treffer ab, nicht von der Tabellengröße:
+    gelesen werden nur die Trefferlisten der Suchwörter, Tabellenzeilen und
+    Ausschnitte nur für die ausgegebene Seite.
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+
+    def quellen(self) -> list[str]:
+        """Quellen, für die ein Index existiert (in der Reihenfolge von QUELLEN)."""
+        with self.engine.connect() as conn:
+            return _vorhandene(conn, None)
+
+    def suchen(
+        self,
+        ausdruck: str,
+        quellen: Collection[str] | None = None,
+        limit: int = 20,
+        offset: int = 0,
+        nach_relevanz: bool = True,
+        markierung: tuple[str, str] = ("[", "]"),
+        woerter: int = 12,
+    ) -> list[Treffer]:
+        """
+        Treffer nach Relevanz (bm25), bei Gleichstand die neueren zuerst.
+        nach_relevanz=False: ohne bm25, die neuesten zuerst – sortiert je Quelle
+        nur die ersten offset + limit Treffer. Der Ausschnitt zeigt bis zu woerter
+        Wörter um die beste Fundstelle. quellen=None: alle Quellen, von der
+        Migration gespiegelte Altzeilen aber nur einmal (als Störungseintrag).
+        """
+        with self.engine.connect() as conn:
+            teile = [
+                _rangabfrage(conn, q, quellen, nach_relevanz) for q in _vorhandene(conn, quellen)
+            ]
+            if not teile:
+                return []
+            # 1. nur Quelle, id, Rang und Zeitpunkt sortieren ...
+            seite = conn.execute(
+                text(
+                    " UNION ALL ".join(teile)
+                    + " ORDER BY rang, zeitpunkt DESC, quelle, id DESC"
+                    " LIMIT :limit OFFSET :offset"
+                ),
+                {"ausdruck": ausdruck, "limit": limit, "offset": offset, "bis": offset + limit},
+            ).all()
+            # 2. ... Datum und Ausschnitt nur für die Zeilen der Seite
+            details: dict[tuple[str, int], tuple[str, str]] = {}
+            for quelle in dict.fromkeys(zeile.quelle for zeile in seite):
+                ids = [zeile.id for zeile in seite if zeile.quelle == quelle]
+                for eintrag_id, datum, ausschnitt in conn.execute(
+                    _detailabfrage(quelle),
+                    {
+                        "ausdruck": ausdruck,
+                        "ids": ids,
+                        "vor": markierung[0],
+                        "nach": markierung[1],
+                        "woerter": woerter,
+                    },
+                ):
+                    details[quelle, eintrag_id] = datum, ausschnitt
+        treffer = []
+        for quelle, eintrag_id, rang, _ in seite:
+            datum, ausschnitt = details[quelle, eintrag_id]
+            treffer.append(Treffer(quelle, eintrag_id, datum, rang, ausschnitt))
+        return treffer
+
+    def anzahl(self, ausdruck: str, quellen: Collection[str] | None = None) -> int:
+        """Zahl aller Treffer (ohne Ranking und ohne die Tabellen selbst zu lesen), wie suchen."""
+        with self.engine.connect() as conn:
+            return sum(
+                conn.execute(
+                    text(
+                        f"SELECT count(*) FROM {q}_fts WHERE {q}_fts MATCH :ausdruck"
+                        + _filter(conn, q, quellen, f"{q}_fts.rowid")
+                    ),
+                    {"ausdruck": ausdruck},
+                ).scalar_one()
+                for q in _vorhandene(conn, quellen)
+            )
+
+
+def _vorhandene(conn: Connection, quellen: Collection[str] | None) -> list[str]:
+    unbekannt = set(quellen or ()) - QUELLEN.keys()
+    if unbekannt:
+        raise ValueError(f"Unbekannte Quelle(n): {', '.join(sorted(unbekannt))}")
+    vorhanden = set(
+        conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'")).scalars()
+    )
+    return [
+        q
+        for q in QUELLEN
+        if f"{q}_fts" in vorhanden
+        and (q in quellen if quellen is not None else not _ganz_gespiegelt(conn, q, vorhanden))
+    ]
+
+
+def _ganz_gespiegelt(conn: Connection, quelle: str, vorhanden: set[str]) -> bool:
+    """True, wenn jede Zeile der Altdaten-Quelle auch ein Störungseintrag ist."""
+    if quelle == "stoerungseintrag" or HERKUNFT not in vorhanden:
+        return False
+    gespiegelt, gesamt = conn.execute(
+        text(
+            f"SELECT (SELECT count(*) FROM {HERKUNFT} WHERE quelle = :quelle), "
+            f"(SELECT count(*) FROM {quelle})"
+        ),
+        {"quelle": quelle},
+    ).one()
+    return bool(gespiegelt == gesamt)
+
+
+def _filter(
+    conn: Connection, quelle: str, quellen: Collection[str] | None, id_spalte: str = "t.id"
+) -> str:
+    """Bedingung, die gespiegelte Altzeilen ausschließt ('' wenn nicht nötig)."""
+    if quellen is not None or quelle == "stoerungseintrag" or not _gibt_es(conn, HERKUNFT):
+        return ""
+    return (
+        f" AND NOT EXISTS (SELECT 1 FROM {HERKUNFT} AS h "
+        f"WHERE h.quelle = '{quelle}' AND h.quelle_id = {id_spalte})"
+    )
+
+
+def _gibt_es(conn: Connection, name: str) -> bool:
+    return (
+        conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": name}
+        ).first()
+        is not None
+    )
+
+
+def _zeitpunkt(conn: Connection, quelle: str) -> str:
+    if quelle == "massnahmen" and not _gibt_es(conn, "massnahmen_als_eintrag"):
+        return "t.datum"
+    return _ZEITPUNKT[quelle]
+
+
+def _rangabfrage(
+    conn: Connection, quelle: str, quellen: Collection[str] | None, nach_relevanz: bool
+) -> str:
+    fts, bedingung = f"{quelle}_fts", _filter(conn, quelle, quellen)
+    zeitpunkt = _zeitpunkt(conn, quelle)
+    index = f" INDEXED BY {_ZEITPUNKT_INDEX[quelle]}" if quelle in _ZEITPUNKT_INDEX else ""
+    if nach_relevanz:
+        return (
+            f"SELECT '{quelle}' AS quelle, t.id AS id, bm25({fts}) AS rang, "
+            f"{zeitpunkt} AS zeitpunkt "
+            f"FROM {fts} JOIN {quelle} AS t ON t.id = {fts}.rowid "
+            f"WHERE {fts} MATCH :ausdruck{bedingung}"
+        )
+    # ohne Ranking reichen je Quelle die neuesten offset + limit Treffer (ohne
+    # Zeitpunkt-Index: alle Treffer der Quelle sortieren)
+    return (
+        f"SELECT * FROM (SELECT '{quelle}' AS quelle, t.id AS id, 0.0 AS rang, "
+        f"{zeitpunkt} AS zeitpunkt FROM {quelle} AS t{index} "
+        f"WHERE t.id IN (SELECT rowid FROM {fts} WHERE {fts} MATCH :ausdruck){bedingung} "
+        f"ORDER BY zeitpunkt DESC, t.id DESC LIMIT :bis)"
+    )
+
+
+def _detailabfrage(quelle: str) -> TextClause:
+    fts = f"{quelle}_fts"
+    return text(
+        f"SELECT t.id, {_DATUM[quelle]}, snippet({fts}, -1, :vor, :nach, '…', :woerter) "
+        f"FROM {fts} JOIN {quelle} AS t ON t.id = {fts}.rowid "
+        f"WHERE {fts} MATCH :ausdruck AND {fts}.rowid IN :ids"
+    ).bindparams(bindparam("ids", expanding=True))
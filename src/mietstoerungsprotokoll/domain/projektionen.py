@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+from mietstoerungsprotokoll.domain.models import Stoerungstyp
+
+
+# ----------------------------------------------------------------------
+# 1. Listeneintrag – eine Zeile der Listenansicht
+# ----------------------------------------------------------------------
+class Listeneintrag(NamedTuple):
+    """
+    Schreibgeschützte Kurzform eines Störungseintrags für Listen.
+    Ein Tupel statt eines Modells: keine Validierung, kein __dict__ je Zeile.
+    """
+
+    id: int
+    datum: datetime
+    typ: Stoerungstyp
+    auswirkung: int | None
+    beginn: datetime | None
+    ende: datetime | None
+    foto_pfad: str | None  # Vorschau über AnhangSpeicher.vorschau, nie das Original
+
+    def dauer_in_minuten(self) -> int | None:
+        """Wie Stoerungseintrag.dauer_in_minuten()."""
+        if self.beginn and self.ende and self.ende > self.beginn:
+            return int((self.ende - self.beginn).total_seconds() // 60)
+        return None
+
+
+# ----------------------------------------------------------------------
+# 2. Spalten – viele Einträge als NumPy-Array für Auswertungen
+# ----------------------------------------------------------------------
+# Typ als Code: Position in TYPEN (Reihenfolge der Enum-Definition)
+TYPEN: tuple[Stoerungstyp, ...] = tuple(Stoerungstyp)
+
+# Fehlende Werte: NaT bei Zeitpunkten, 0 bei auswirkung (gültig ist 1–5)
+EINTRAG_DTYPE = np.dtype(
+    [
+        ("id", np.int64),
+        ("datum", "datetime64[us]"),
+        ("typ", np.int8),
+        ("auswirkung", np.int8),
+        ("beginn", "datetime64[us]"),
+        ("ende", "datetime64[us]"),
+    ]
+)
+
+
+def dauer_in_minuten(
+    beginn: npt.NDArray[np.datetime64], ende: npt.NDArray[np.datetime64]
+) -> npt.NDArray[np.float64]:
+    """
+    Vektorisierte Fassung von Stoerungseintrag.dauer_in_minuten() für ganze
+    Arrays: volle Minuten als float64, NaN wo beginn oder ende fehlt oder ende
+    nicht nach beginn liegt (NaN statt None, damit das Ergebnis ein Array bleibt).
+    """
+    differenz = (ende - beginn).astype("timedelta64[m]").astype(np.float64)
+    gueltig = ~np.isnat(beginn) & ~np.isnat(ende) & (ende > beginn)
+    return np.where(gueltig, differenz, np.nan)
+
+
+def typ_maske(
+    spalten: npt.NDArray[np.void], *typen: Stoerungstyp
+) -> npt.NDArray[np.bool_]:
+    """Zeilen der Spalten-Arrays mit einem der angegebenen Typen."""
+    codes = [TYPEN.index(typ) for typ in typen]
+    return np.isin(spalten["typ"], codes)
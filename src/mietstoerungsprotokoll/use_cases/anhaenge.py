@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from pathlib import Path
+from typing import IO
+
+from mietstoerungsprotokoll.adapters.anhang_speicher import (
+    Anhang,
+    AnhangSpeicher,
+    Medientyp,
+    Vorschaugroesse,
+)
+from mietstoerungsprotokoll.domain.models import Stoerungseintrag
+from mietstoerungsprotokoll.domain.projektionen import Listeneintrag
+
+
+def anhang_hinzufuegen(
+    speicher: AnhangSpeicher,
+    eintrag: Stoerungseintrag,
+    quelle: Path | str | IO[bytes],
+    dateiname: str | None = None,
+) -> Anhang:
+    """
+    Foto oder Video ablegen und am Eintrag vermerken (foto_pfad bzw.
+    video_pfad, Pfad relativ zum Speicher). Gespeichert wird der Eintrag hier
+    nicht – das macht der Aufrufer über das Repository.
+    """
+    anhang = speicher.ablegen(quelle, dateiname)
+    if anhang.medientyp is Medientyp.VIDEO:
+        eintrag.video_pfad = anhang.pfad
+    else:
+        eintrag.foto_pfad = anhang.pfad
+    return anhang
+
+
+def vorschaubilder(
+    speicher: AnhangSpeicher,
+    eintraege: Iterable[Listeneintrag | Stoerungseintrag],
+    groesse: Vorschaugroesse = Vorschaugroesse.LISTE,
+) -> dict[int, Path]:
+    """
+    Vorschaubild je Eintrag-id für Listen (LISTE) oder PDF-Exporte (PDF).
+    Einträge ohne Foto oder mit altem Rohpfad außerhalb des Speichers fehlen.
+    """
+    bilder = {}
+    for eintrag in eintraege:
+        if eintrag.id is None or not eintrag.foto_pfad:
+            continue
+        if (pfad := speicher.vorschau(eintrag.foto_pfad, groesse)) is not None:
+            bilder[eintrag.id] = pfad
+    return bilder
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from collections.abc import Collection
+from dataclasses import dataclass
+
+from mietstoerungsprotokoll.adapters.volltext import Treffer, Volltextindex
+
+# Mehr Treffer als das: nicht nach Relevanz, sondern die neuesten zuerst. Ein Wort,
+# das in so vielen Einträgen steht, unterscheidet sie kaum (bm25 ≈ gleich), und
+# bm25 für alle Treffer zu berechnen kostet ~2 µs je Treffer
+RANKING_GRENZE = 10_000
+
+
+@dataclass(frozen=True)
+class Suchergebnis:
+    treffer: list[Treffer]
+    seite: int  # ab 1
+    pro_seite: int
+    gesamt: int  # Treffer über alle Seiten
+
+    @property
+    def seiten(self) -> int:
+        return -(-self.gesamt // self.pro_seite)
+
+
+def suchausdruck(eingabe: str) -> str | None:
+    """
+    Benutzereingabe → FTS5-Ausdruck. Jedes Wort wird als Phrase zitiert (so
+    werden Bindestriche, Anführungszeichen, AND/OR/NOT usw. nie als Syntax
+    gelesen); mehrere Wörter müssen alle vorkommen. Ein * am Wortende sucht
+    nach Wortanfängen ("Bohr*" findet "Bohrmaschine"). None bei leerer Eingabe.
+    """
+    teile = []
+    for wort in eingabe.split():
+        praefix = wort.endswith("*")
+        wort = wort.strip('*"')
+        if not any(zeichen.isalnum() for zeichen in wort):
+            continue
+        teile.append('"' + wort.replace('"', '""') + '"' + ("*" if praefix else ""))
+    return " ".join(teile) or None
+
+
+def suche(
+    index: Volltextindex,
+    eingabe: str,
+    seite: int = 1,
+    pro_seite: int = 20,
+    quellen: Collection[str] | None = None,
+) -> Suchergebnis:
+    """
+    Volltextsuche über Störungseinträge, Lärmdaten und Maßnahmen: eine Seite
+    Treffer nach Relevanz mit markierten Ausschnitten. Ohne quellen zählt jede
+    Störung einmal – aus den Altdaten gespiegelte Zeilen erscheinen nur als
+    Störungseintrag; quellen schränkt die Suche ein (z. B. {"laermdaten"}). Bei
+    mehr als RANKING_GRENZE Treffern stehen die neuesten vorn statt der relevantesten.
+    """
+    if seite < 1 or pro_seite < 1:
+        raise ValueError("seite und pro_seite müssen mindestens 1 sein")
+    ausdruck = suchausdruck(eingabe)
+    if ausdruck is None:
+        return Suchergebnis([], seite, pro_seite, 0)
+    gesamt = index.anzahl(ausdruck, quellen)
+    if gesamt == 0:
+        return Suchergebnis([], seite, pro_seite, 0)
+    treffer = index.suchen(
+        ausdruck,
+        quellen,
+        limit=pro_seite,
+        offset=(seite - 1) * pro_seite,
+        nach_relevanz=gesamt <= RANKING_GRENZE,
+    )
+    return Suchergebnis(treffer, seite, pro_seite, gesamt)
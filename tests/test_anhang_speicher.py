@@ -0,0 +1,49 @@
+import pytest
+
+from mietstoerungsprotokoll.adapters.anhang_speicher import AnhangSpeicher, Vorschaugroesse
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _foto(pfad, farbe):
+    Image.new("RGB", (640, 480), farbe).save(pfad)
+    return pfad
+
+
+def test_unbenutzte_landen_im_papierkorb(tmp_path):
+    speicher = AnhangSpeicher(tmp_path / "anhaenge")
+    behalten = speicher.ablegen(_foto(tmp_path / "a.jpg", "red"))
+    weg = speicher.ablegen(_foto(tmp_path / "b.jpg", "blue"))
+    (tmp_path / "c.mp4").write_bytes(b"kein Bild")
+    video = speicher.ablegen(tmp_path / "c.mp4")
+    vorschau = [speicher.vorschau(weg.pfad, groesse) for groesse in Vorschaugroesse]
+
+    with pytest.raises(TypeError):
+        speicher.unbenutzte_entfernen([behalten.pfad, video.pfad])  # nur eine Liste
+    assert (
+        speicher.unbenutzte_entfernen(foto_pfade=[behalten.pfad, None], video_pfade=[video.pfad])
+        == 1
+    )
+
+    assert speicher.pfad(behalten.pfad).exists() and speicher.pfad(video.pfad).exists()
+    assert not speicher.pfad(weg.pfad).exists()
+    assert not any(pfad.exists() for pfad in vorschau)
+    assert speicher.vorschau(behalten.pfad, Vorschaugroesse.LISTE) is not None
+    papierkorb = tmp_path / "anhaenge" / "papierkorb" / weg.sha256[:2]
+    assert [datei.name for datei in papierkorb.iterdir()] == [f"{weg.sha256}.jpg"]
+
+    assert speicher.papierkorb_leeren() == 1
+    assert list(papierkorb.iterdir()) == []
+
+
+def test_abgeschnittenes_jpeg_hinterlaesst_nichts(tmp_path):
+    foto = tmp_path / "kaputt.jpg"
+    Image.effect_noise((800, 600), 60).convert("RGB").save(foto)
+    daten = foto.read_bytes()
+    foto.write_bytes(daten[: len(daten) // 2])  # Kopf vollständig, Bilddaten nicht
+    speicher = AnhangSpeicher(tmp_path / "anhaenge")
+
+    with pytest.raises(ValueError, match="nicht lesbar"):
+        speicher.ablegen(foto)
+
+    assert [pfad for pfad in (tmp_path / "anhaenge").rglob("*") if pfad.is_file()] == []
@@ -0,0 +1,164 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from mietstoerungsprotokoll.adapters.stoerungseintrag_repository import (
+    Filter,
+    Position,
+    StoerungseintragRepository,
+    erstelle_engine,
+)
+from mietstoerungsprotokoll.domain.models import Stoerungseintrag, Stoerungstyp
+from mietstoerungsprotokoll.domain.projektionen import (
+    EINTRAG_DTYPE,
+    Listeneintrag,
+    dauer_in_minuten,
+    typ_maske,
+)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    engine = erstelle_engine(f"sqlite:///{tmp_path / 'neu.db'}")
+    yield StoerungseintragRepository(engine)
+    engine.dispose()
+
+
+def _anzahl(repo):
+    with repo.engine.connect() as conn:
+        return conn.exec_driver_sql("SELECT COUNT(*) FROM stoerungseintrag").scalar_one()
+
+
+@pytest.mark.parametrize(
+    "falsch",
+    [
+        {"typ": Stoerungstyp.LAERM, "beschreibung": "Bohren", "auswirkung": 9},
+        {"typ": Stoerungstyp.LAERM, "beschreibung": ""},
+        {"typ": "gibt es nicht", "beschreibung": "Bohren"},
+        # table=True-Modelle validieren beim Erzeugen nicht
+        Stoerungseintrag(typ=Stoerungstyp.LAERM, beschreibung="", auswirkung=9),
+        Stoerungseintrag(typ=Stoerungstyp.LAERM, beschreibung="x" * 2001),
+    ],
+)
+def test_hinzufuegen_viele_prueft_eintraege(repo, falsch):
+    gueltig = {"typ": Stoerungstyp.LAERM, "beschreibung": "Bohren", "auswirkung": 3}
+    with pytest.raises(ValidationError):
+        repo.hinzufuegen_viele([gueltig, falsch])
+    assert _anzahl(repo) == 0
+
+    assert repo.hinzufuegen_viele([gueltig]) == 1
+    with repo.engine.connect() as conn:
+        assert conn.exec_driver_sql(
+            "SELECT typ, auswirkung, erstellt_von FROM stoerungseintrag"
+        ).all() == [("LAERM", 3, "Mieter")]
+
+
+# ----------------------------------------------------------------------
+# Keyset-Seiten und Projektionen
+# ----------------------------------------------------------------------
+START = datetime(2024, 11, 5, 20, 0)
+TYPFOLGE = [Stoerungstyp.LAERM, Stoerungstyp.HEIZUNG, Stoerungstyp.SCHIMMEL]
+
+
+@pytest.fixture
+def eintraege(repo):
+    """
+    12 Einträge, je zwei mit gleichem datum (Reihenfolge dann über id);
+    jeder dritte ohne beginn/ende, jeder vierte ohne auswirkung.
+    """
+    zeilen = []
+    for i in range(12):
+        datum = START + timedelta(hours=i // 2)
+        mit_dauer = i % 3 != 0
+        zeilen.append(
+            {
+                "datum": datum,
+                "beginn": datum if mit_dauer else None,
+                "ende": datum + timedelta(minutes=5 * i, seconds=30) if mit_dauer else None,
+                "typ": TYPFOLGE[i % 3],
+                "beschreibung": f"Eintrag {i}",
+                "auswirkung": None if i % 4 == 0 else i % 5 + 1,
+                "foto_pfad": f"{i:064x}.jpg" if i == 5 else None,
+            }
+        )
+    repo.hinzufuegen_viele(zeilen)
+    return repo
+
+
+def _alle_seiten(blaettern, limit):
+    ids, nach = [], None
+    while True:
+        seite = blaettern(nach=nach, limit=limit)
+        assert len(seite.eintraege) <= limit
+        ids.append([e.id for e in seite.eintraege])
+        if seite.weiter is None:
+            return ids
+        assert seite.weiter == Position(seite.eintraege[-1].datum, seite.eintraege[-1].id)
+        nach = seite.weiter
+
+
+@pytest.mark.parametrize("absteigend", [False, True])
+@pytest.mark.parametrize("limit", [1, 3, 4, 5, 12, 20])
+def test_keyset_seiten(eintraege, limit, absteigend):
+    erwartet = list(range(12, 0, -1)) if absteigend else list(range(1, 13))
+    for blaettern in (eintraege.seite, eintraege.liste):
+        seiten = _alle_seiten(
+            lambda nach, limit, blaettern=blaettern: blaettern(
+                nach=nach, limit=limit, absteigend=absteigend
+            ),
+            limit,
+        )
+        # Grenze zwischen zwei Einträgen mit gleichem datum: nichts doppelt, nichts fehlt
+        assert [i for seite in seiten for i in seite] == erwartet
+        # volle letzte Seite: eine leere Seite beendet das Blättern
+        assert seiten[-1] == ([] if 12 % limit == 0 else erwartet[-(12 % limit) :])
+
+
+def test_keyset_mit_filter(eintraege):
+    filter = Filter(
+        typen={Stoerungstyp.LAERM, Stoerungstyp.HEIZUNG},
+        von=START + timedelta(hours=1),
+        bis=START + timedelta(hours=5),
+    )
+    seiten = _alle_seiten(lambda nach, limit: eintraege.liste(filter, nach, limit), 2)
+    assert [i for seite in seiten for i in seite] == [4, 5, 7, 8, 10]
+    assert eintraege.anzahl(filter) == 5
+    assert [e.id for e in eintraege.alle(filter, limit=2)] == [4, 5, 7, 8, 10]
+
+
+def test_listeneintrag_wie_modell(eintraege):
+    modelle = eintraege.seite(limit=20).eintraege
+    liste = list(eintraege.alle(limit=5))
+    assert all(isinstance(e, Listeneintrag) for e in liste)
+    assert liste == [
+        Listeneintrag(m.id, m.datum, m.typ, m.auswirkung, m.beginn, m.ende, m.foto_pfad)
+        for m in modelle
+    ]
+    assert [e.dauer_in_minuten() for e in liste] == [m.dauer_in_minuten() for m in modelle]
+    assert liste[5].foto_pfad == f"{5:064x}.jpg"
+
+
+def test_spalten_wie_modell(eintraege):
+    modelle = eintraege.seite(limit=20).eintraege
+    spalten = eintraege.spalten()
+    assert spalten.dtype == EINTRAG_DTYPE
+    assert spalten["id"].tolist() == [m.id for m in modelle]
+    assert spalten["datum"].astype(datetime).tolist() == [m.datum for m in modelle]
+    assert spalten["auswirkung"].tolist() == [m.auswirkung or 0 for m in modelle]
+    assert np.isnat(spalten["beginn"]).tolist() == [m.beginn is None for m in modelle]
+
+    dauer = dauer_in_minuten(spalten["beginn"], spalten["ende"])
+    assert [None if np.isnan(d) else int(d) for d in dauer] == [
+        m.dauer_in_minuten() for m in modelle
+    ]
+    assert spalten["id"][typ_maske(spalten, Stoerungstyp.HEIZUNG)].tolist() == [
+        m.id for m in modelle if m.typ is Stoerungstyp.HEIZUNG
+    ]
+
+
+def test_spalten_leer_und_gefiltert(eintraege):
+    assert eintraege.spalten(Filter(typen={Stoerungstyp.NACHBARN})).shape == (0,)
+    teil = eintraege.spalten(Filter(von=START + timedelta(hours=5)))
+    assert teil["id"].tolist() == [11, 12]